@@ -13,6 +13,7 @@ from Services.Translator.Translator import Translator
 from Download import DownloadOptionHistory
 from Download.Downloader.Engine.ThreadPool import ThreadPool as DownloadThreadPool
 from Download.Downloader.Engine.Config import Config as EngineConfig
+from Download.Downloader.Engine.BandwidthLimiter import BandwidthLimiter
 
 from PyQt5 import QtCore
 
@@ -228,21 +229,52 @@ class Temp(Codable):
 
 class Download(Codable):
     def __init__(self):
+        self._adaptiveDownloadSpeed = False
+        self._bandwidthLimit = 0
+        self._bandwidthSchedules = []
         self.setDownloadSpeed(EngineConfig.RECOMMENDED_THREAD_LIMIT)
+        self.reloadBandwidthLimit()
 
     def __setup__(self):
         self.reloadDownloadSpeed()
+        self.reloadBandwidthLimit()
 
     def setDownloadSpeed(self, downloadSpeed):
         self._downloadSpeed = downloadSpeed
         self.reloadDownloadSpeed()
 
+    def setAdaptiveDownloadSpeedEnabled(self, enabled):
+        self._adaptiveDownloadSpeed = enabled
+        self.reloadDownloadSpeed()
+
     def reloadDownloadSpeed(self):
-        DownloadThreadPool.setMaxThreadCount(self._downloadSpeed)
+        DownloadThreadPool.setAdaptiveConcurrencyEnabled(self._adaptiveDownloadSpeed)
+        DownloadThreadPool.setMaxThreadCount(EngineConfig.MAX_THREAD_LIMIT if self._adaptiveDownloadSpeed else self._downloadSpeed)
+
+    def setBandwidthLimit(self, bandwidthLimit):
+        self._bandwidthLimit = bandwidthLimit
+        self.reloadBandwidthLimit()
+
+    def setBandwidthSchedules(self, bandwidthSchedules):
+        self._bandwidthSchedules = bandwidthSchedules
+        self.reloadBandwidthLimit()
+
+    def reloadBandwidthLimit(self):
+        BandwidthLimiter.setLimit(self._bandwidthLimit)
+        BandwidthLimiter.setSchedules(self._bandwidthSchedules)
 
     def getDownloadSpeed(self):
         return self._downloadSpeed
 
+    def getBandwidthLimit(self):
+        return self._bandwidthLimit
+
+    def getBandwidthSchedules(self):
+        return self._bandwidthSchedules
+
+    def isAdaptiveDownloadSpeedEnabled(self):
+        return self._adaptiveDownloadSpeed
+
 
 class Database:
     def __init__(self):
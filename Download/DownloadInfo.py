@@ -16,6 +16,8 @@ class DownloadInfo(Codable):
         self.accessToken = accessToken
         if self.type.isStream():
             self.stream = videoData
+            self.encodeProfile = self.optionHistory.getEncodeProfile()
+            self.additionalFormats = []
         elif self.type.isVideo():
             self.video = videoData
             self.range = [None, None]
@@ -23,6 +25,8 @@ class DownloadInfo(Codable):
             self.updateTrack = self.optionHistory.isUpdateTrackEnabled()
             self.clippingMode = False
             self.prioritize = False
+            self.encodeProfile = self.optionHistory.getEncodeProfile()
+            self.additionalFormats = []
         else:
             self.clip = videoData
             self.prioritize = False
@@ -31,6 +35,13 @@ class DownloadInfo(Codable):
         self.fileName = self.generateFileName()
         self.fileFormat = self.getAvailableFormat()
 
+    def __setup__(self):
+        if not self.type.isClip():
+            if not hasattr(self, "encodeProfile"):
+                self.encodeProfile = self.optionHistory.getEncodeProfile()
+            if not hasattr(self, "additionalFormats"):
+                self.additionalFormats = []
+
     def setAccessToken(self, accessToken):
         self.accessToken = accessToken
         self.setResolution(min(self.selectedResolutionIndex, len(self.accessToken.resolutions) - 1))
@@ -53,6 +64,8 @@ class DownloadInfo(Codable):
     def setResolution(self, index):
         self.selectedResolutionIndex = index
         self.setFileFormat(self.getAvailableFormat(self.fileFormat))
+        if not self.type.isClip():
+            self.setAdditionalFormats(self.additionalFormats)
 
     @property
     def resolution(self):
@@ -100,6 +113,13 @@ class DownloadInfo(Codable):
     def setPrioritizeEnabled(self, prioritize):
         self.prioritize = prioritize
 
+    def setEncodeProfile(self, encodeProfile):
+        self.encodeProfile = encodeProfile
+
+    def setAdditionalFormats(self, additionalFormats):
+        availableFormats = self.getAvailableAdditionalFormats()
+        self.additionalFormats = [additionalFormat for additionalFormat in additionalFormats if additionalFormat in availableFormats]
+
     def isUnmuteVideoEnabled(self):
         return self.unmuteVideo
 
@@ -112,12 +132,25 @@ class DownloadInfo(Codable):
     def isPrioritizeEnabled(self):
         return self.prioritize
 
+    def getEncodeProfile(self):
+        return self.encodeProfile
+
+    def getAdditionalFormats(self):
+        return [] if self.type.isClip() else [additionalFormat for additionalFormat in self.additionalFormats if additionalFormat != self.fileFormat]
+
+    def getAvailableAdditionalFormats(self):
+        if self.type.isClip() or self.resolution.isAudioOnly():
+            return []
+        return self.optionHistory.getAvailableAudioFormats()
+
     def saveOptionHistory(self):
         self.optionHistory.setDirectory(self.directory)
         if self.resolution.isAudioOnly():
             self.optionHistory.setAudioFormat(self.fileFormat)
         else:
             self.optionHistory.setFormat(self.fileFormat)
+        if not self.type.isClip():
+            self.optionHistory.setEncodeProfile(self.encodeProfile)
         if self.type.isVideo():
             self.optionHistory.setUnmuteVideoEnabled(self.unmuteVideo)
             self.optionHistory.setUpdateTrackEnabled(self.updateTrack)
@@ -128,5 +161,8 @@ class DownloadInfo(Codable):
     def getAbsoluteFileName(self):
         return f"{Utils.joinPath(self.directory, self.fileName)}.{self.fileFormat}"
 
+    def getAdditionalAbsoluteFileNames(self):
+        return [f"{Utils.joinPath(self.directory, self.fileName)}.{additionalFormat}" for additionalFormat in self.getAdditionalFormats()]
+
     def copy(self):
         return copy.deepcopy(self)
\ No newline at end of file
@@ -119,7 +119,7 @@ class _DownloadManager(QtCore.QObject):
             App.taskbar.setValue(progress.fileProgress)
         if not status.terminateState.isFalse():
             App.taskbar.stop()
-        elif not status.pauseState.isFalse() or status.isWaiting() or status.isUpdating() or status.isEncoding():
+        elif not status.pauseState.isFalse() or status.isWaiting() or status.isUpdating() or status.isQueued() or status.isEncoding():
             App.taskbar.pause()
 
     def handleClipProgress(self, downloader):
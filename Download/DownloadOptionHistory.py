@@ -1,6 +1,7 @@
 from Core.Config import Config
 from Services.Utils.OSUtils import OSUtils
 from Database.EncoderDecoder import Codable
+from Download.Downloader.FFmpeg.EncodeProfile import EncodeProfiles
 
 import os
 
@@ -64,14 +65,29 @@ class AudioFormatHistory:
         return self.SUPPORTED_AUDIO_FORMATS
 
 
-class StreamHistory(FileHistory, AudioFormatHistory, Codable):
+class EncodeProfileHistory:
+    def __init__(self):
+        super(EncodeProfileHistory, self).__init__()
+        self.setEncodeProfile(EncodeProfiles.DEFAULT.name)
+
+    def setEncodeProfile(self, encodeProfile):
+        self._encodeProfile = encodeProfile
+
+    def getEncodeProfile(self):
+        return self._encodeProfile
+
+    def getAvailableEncodeProfiles(self):
+        return [profile.name for profile in EncodeProfiles.getProfiles()]
+
+
+class StreamHistory(FileHistory, AudioFormatHistory, EncodeProfileHistory, Codable):
     SUPPORTED_FORMATS = [
         "ts",
         "mp4"
     ]
 
 
-class VideoHistory(FileHistory, AudioFormatHistory, Codable):
+class VideoHistory(FileHistory, AudioFormatHistory, EncodeProfileHistory, Codable):
     SUPPORTED_FORMATS = [
         "ts",
         "mp4"
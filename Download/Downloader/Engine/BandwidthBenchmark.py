@@ -0,0 +1,82 @@
+from .BandwidthLimiter import _BandwidthLimiter
+
+from Services.Utils.SystemUtils import SystemUtils
+from Services.Threading.WorkerThread import WorkerThread
+
+import time
+
+
+class BandwidthBenchmarkResult:
+    def __init__(self, limit, threadCount, byteSize, seconds, reserveCount, reserveSeconds):
+        self.limit = limit
+        self.threadCount = threadCount
+        self.byteSize = byteSize
+        self.seconds = seconds
+        self.reserveCount = reserveCount
+        self.reserveSeconds = reserveSeconds
+
+    @property
+    def rate(self):
+        return self.byteSize / (self.seconds or 1)
+
+    @property
+    def accuracy(self):
+        return self.rate / self.limit * 100
+
+    @property
+    def reserveOverhead(self):
+        return self.reserveSeconds / (self.reserveCount or 1) * 1000000
+
+    def __str__(self):
+        return f"{self.threadCount} threads @ {SystemUtils.formatByteSize(self.limit)}/s: {SystemUtils.formatByteSize(self.rate)}/s ({self.accuracy:.1f}%), {self.reserveOverhead:.1f}us per reserve"
+
+
+class BandwidthBenchmark:
+    def __init__(self, duration=5, chunkSize=64 * 1024):
+        self.duration = duration
+        self.chunkSize = chunkSize
+
+    def run(self, limits=(1024 ** 2, 8 * 1024 ** 2), threadCounts=(1, 4, 20, 32)):
+        return [self.runLimit(limit, threadCount) for limit in limits for threadCount in threadCounts]
+
+    def runLimit(self, limit, threadCount):
+        limiter = _BandwidthLimiter()
+        limiter.setLimit(limit)
+        channels = [limiter.openChannel() for index in range(threadCount)]
+        startedAt = time.monotonic()
+        threads = [WorkerThread(target=self.consume, args=(channel, startedAt + self.duration)) for channel in channels]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.wait()
+        seconds = time.monotonic() - startedAt
+        for channel in channels:
+            channel.close()
+        results = [thread.result.data for thread in threads]
+        return BandwidthBenchmarkResult(
+            limit,
+            threadCount,
+            sum(result[0] for result in results),
+            seconds,
+            sum(result[1] for result in results),
+            sum(result[2] for result in results)
+        )
+
+    def consume(self, channel, endAt):
+        byteSize = 0
+        reserveCount = 0
+        reserveSeconds = 0
+        while time.monotonic() < endAt:
+            reservedAt = time.perf_counter()
+            delay = channel.limiter.reserve(channel, self.chunkSize)
+            reserveSeconds += time.perf_counter() - reservedAt
+            reserveCount += 1
+            if delay > 0:
+                time.sleep(delay)
+            byteSize += self.chunkSize
+        return byteSize, reserveCount, reserveSeconds
+
+
+if __name__ == "__main__":
+    for result in BandwidthBenchmark().run():
+        print(result)
@@ -0,0 +1,128 @@
+from .Config import Config
+
+from Services.Threading.MutexLocker import MutexLocker
+
+import time
+
+
+class BandwidthSchedule:
+    def __init__(self, start, end, limit):
+        self.start = self.toMinutes(start)
+        self.end = self.toMinutes(end)
+        self.limit = limit
+
+    @staticmethod
+    def toMinutes(string):
+        hours, minutes = string.split(":", 1)
+        return int(hours) * 60 + int(minutes)
+
+    def contains(self, minutes):
+        if self.start <= self.end:
+            return self.start <= minutes < self.end
+        else:
+            return minutes >= self.start or minutes < self.end
+
+
+class BandwidthChannel:
+    def __init__(self, limiter, weight):
+        self.limiter = limiter
+        self.weight = weight
+        self.tokens = 0
+        self.updatedAt = None
+        self.lastActive = None
+        self.active = False
+
+    def setWeight(self, weight):
+        self.limiter.setChannelWeight(self, weight)
+
+    def consume(self, byteSize):
+        delay = self.limiter.reserve(self, byteSize)
+        if delay > 0:
+            time.sleep(delay)
+
+    def close(self):
+        self.limiter.closeChannel(self)
+
+
+class _BandwidthLimiter:
+    def __init__(self):
+        self.limit = 0
+        self.schedules = []
+        self.channels = []
+        self.totalWeight = 0
+        self.expiresAt = 0
+        self._lock = MutexLocker()
+
+    def setLimit(self, limit):
+        with self._lock:
+            self.limit = limit
+
+    def setSchedules(self, schedules):
+        with self._lock:
+            self.schedules = [BandwidthSchedule(*schedule) for schedule in schedules]
+
+    def getCurrentLimit(self):
+        localTime = time.localtime()
+        minutes = localTime.tm_hour * 60 + localTime.tm_min
+        for schedule in self.schedules:
+            if schedule.contains(minutes):
+                return schedule.limit
+        return self.limit
+
+    def openChannel(self, weight=1):
+        channel = BandwidthChannel(self, weight)
+        with self._lock:
+            self.channels.append(channel)
+        return channel
+
+    def closeChannel(self, channel):
+        with self._lock:
+            if channel in self.channels:
+                self.channels.remove(channel)
+                self.deactivateChannel(channel)
+
+    def setChannelWeight(self, channel, weight):
+        with self._lock:
+            if channel.active:
+                self.totalWeight += weight - channel.weight
+            channel.weight = weight
+
+    def activateChannel(self, channel):
+        if not channel.active and channel in self.channels:
+            channel.active = True
+            self.totalWeight += channel.weight
+
+    def deactivateChannel(self, channel):
+        if channel.active:
+            channel.active = False
+            self.totalWeight -= channel.weight
+
+    def expireChannels(self, now):
+        self.expiresAt = now + Config.BANDWIDTH_ACTIVE_CHANNEL_TIMEOUT
+        for channel in self.channels:
+            if channel.active and now - channel.lastActive >= Config.BANDWIDTH_ACTIVE_CHANNEL_TIMEOUT:
+                self.deactivateChannel(channel)
+
+    def reserve(self, channel, byteSize):
+        now = time.monotonic()
+        channel.lastActive = now
+        if not channel.active or now >= self.expiresAt:
+            with self._lock:
+                if now >= self.expiresAt:
+                    self.expireChannels(now)
+                self.activateChannel(channel)
+        limit = self.getCurrentLimit()
+        if limit <= 0:
+            channel.updatedAt = None
+            return 0
+        rate = limit * channel.weight / (self.totalWeight or channel.weight)
+        burst = rate * Config.BANDWIDTH_BURST_SECONDS
+        if channel.updatedAt == None:
+            channel.tokens = 0
+        else:
+            channel.tokens = min(burst, channel.tokens + (now - channel.updatedAt) * rate)
+        channel.updatedAt = now
+        channel.tokens -= byteSize
+        return 0 if channel.tokens >= 0 else -channel.tokens / rate
+
+BandwidthLimiter = _BandwidthLimiter()
@@ -0,0 +1,66 @@
+from .Config import Config
+
+from Services.Threading.MutexLocker import MutexLocker
+
+from PyQt5 import QtCore
+
+
+class BufferLease:
+    def __init__(self, pool):
+        self.pool = pool
+        self.buffer = None
+        self.view = None
+
+    def __enter__(self):
+        self.buffer = self.pool.acquire()
+        self.view = memoryview(self.buffer)
+        return self.view
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.view.release()
+        self.pool.release(self.buffer)
+
+
+class _BufferPool:
+    def __init__(self, bufferSize, maxBufferCount):
+        self.bufferSize = bufferSize
+        self.maxBufferCount = maxBufferCount
+        self.leasedCount = 0
+        self._buffers = []
+        self._lock = MutexLocker()
+        self._condition = QtCore.QWaitCondition()
+
+    def setMaxBufferCount(self, maxBufferCount):
+        with self._lock:
+            self.maxBufferCount = max(1, maxBufferCount)
+            del self._buffers[self.maxBufferCount:]
+            self._condition.wakeAll()
+
+    def acquire(self):
+        with self._lock:
+            while self.leasedCount >= self.maxBufferCount:
+                self._condition.wait(self._lock)
+            self.leasedCount += 1
+            if len(self._buffers) != 0:
+                return self._buffers.pop()
+        return bytearray(self.bufferSize)
+
+    def release(self, buffer):
+        with self._lock:
+            self.leasedCount -= 1
+            if len(self._buffers) + self.leasedCount < self.maxBufferCount:
+                self._buffers.append(buffer)
+            self._condition.wakeOne()
+
+    def lease(self):
+        return BufferLease(self)
+
+    def getInFlightByteSize(self):
+        with self._lock:
+            return self.leasedCount * self.bufferSize
+
+    @staticmethod
+    def getMaxBufferCount(threadCount):
+        return max(1, min(threadCount, Config.MAX_IN_FLIGHT_BUFFER_SIZE // Config.SEGMENT_BUFFER_SIZE))
+
+BufferPool = _BufferPool(Config.SEGMENT_BUFFER_SIZE, _BufferPool.getMaxBufferCount(Config.RECOMMENDED_THREAD_LIMIT))
@@ -16,6 +16,7 @@ class ClipDownloader(EngineSetup):
         self.task = FileDownloader(
             url=self.setup.downloadInfo.getUrl(),
             saveAs=self.setup.downloadInfo.getAbsoluteFileName(),
+            bandwidthChannel=self.bandwidthChannel,
             priority=self.setup.priority
         )
         self.task.signals.downloadStarted.connect(self.downloadStarted)
@@ -11,10 +11,11 @@ class FileDownloaderSignals(TaskSignals):
 
 
 class FileDownloader(PrioritizedTask):
-    def __init__(self, url, saveAs, priority=0):
+    def __init__(self, url, saveAs, bandwidthChannel=None, priority=0):
         super(FileDownloader, self).__init__(priority=priority, signals=FileDownloaderSignals)
         self.url = url
         self.saveAs = saveAs
+        self.bandwidthChannel = bandwidthChannel
         self.stop = False
 
     def task(self):
@@ -26,6 +27,8 @@ class FileDownloader(PrioritizedTask):
             self.signals.downloadStarted.emit(totalByteSize)
             with open(self.saveAs, "wb") as file:
                 for data in self.response.iter_content(1024 ** 2):
+                    if self.bandwidthChannel != None:
+                        self.bandwidthChannel.consume(len(data))
                     byteSize += len(data)
                     file.write(data)
                     self.signals.downloadProgress.emit(byteSize)
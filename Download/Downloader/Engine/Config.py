@@ -5,12 +5,60 @@ from PyQt5 import QtCore
 
 class Config:
     PLAYLIST_FILE_NAME = CoreConfig.APP_NAME
+    JOURNAL_FILE_NAME = CoreConfig.APP_NAME
+
+    RESUMABLE_TEMP_EXPIRY = 604800
+    RESUMABLE_TEMP_MAX_SIZE = 8 * 1024 ** 3
 
     UPDATE_TRACK_MAX_RETRY_COUNT = 5
     UPDATE_TRACK_DURATION = 120
+    UPDATE_TRACK_MIN_INTERVAL = 2
+    UPDATE_TRACK_BACKOFF_FACTOR = 2
     SEGMENT_DOWNLOAD_MAX_RETRY_COUNT = 3
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 10
+
+    LIVE_PLAYLIST_MAX_RETRY_COUNT = 5
+    LIVE_MAX_IDLE_TIME = 60
+    LIVE_SEGMENT_PRIORITY = 4
+    LIVE_PREFETCH_ENABLED = True
+
+    FRAGMENTED_MP4_ENABLED = True
+
+    SMART_CUT_ENABLED = True
+    SMART_CUT_FILE_PREFIX = "smartcut_"
+
+    PARALLEL_ENCODE_ENABLED = True
+    PARALLEL_ENCODE_MAX_PROCESS_COUNT = QtCore.QThread.idealThreadCount()
+    PARALLEL_ENCODE_MIN_CHUNK_DURATION = 120
+    PARALLEL_ENCODE_FILE_PREFIX = "chunk_"
+
+    PIPELINE_REORDER_BUFFER_SIZE = 100
+    PIPELINE_CHUNK_SIZE = 1024 ** 2
+    PIPELINE_WINDOW_CHECK_INTERVAL = 1
+
+    SEGMENT_SPOOL_ENABLED = True
+    SEGMENT_SPOOL_FILE_NAME = f"{CoreConfig.APP_NAME}_spool"
+    SEGMENT_SPOOL_PREALLOCATE_SIZE = 256 * 1024 ** 2
+
+    SEGMENT_BUFFER_SIZE = 256 * 1024
+    MAX_IN_FLIGHT_BUFFER_SIZE = 4 * 1024 ** 2
+
+    DISK_WRITER_THREAD_COUNT = 1
+    DISK_WRITER_MAX_WRITE_SIZE = 4 * 1024 ** 2
+    DISK_WRITER_IDLE_TIMEOUT = 5
 
     MAX_THREAD_LIMIT = 20
     RECOMMENDED_THREAD_LIMIT = min(QtCore.QThread.idealThreadCount(), MAX_THREAD_LIMIT)
 
+    ADAPTIVE_INITIAL_THREAD_COUNT = 4
+    ADAPTIVE_MIN_THREAD_COUNT = 1
+    ADAPTIVE_WINDOW_SECONDS = 5
+    ADAPTIVE_IMPROVEMENT_THRESHOLD = 0.05
+    ADAPTIVE_DECREASE_FACTOR = 0.5
+
+    BANDWIDTH_BURST_SECONDS = 0.5
+    BANDWIDTH_ACTIVE_CHANNEL_TIMEOUT = 2
+    PRIORITIZED_BANDWIDTH_WEIGHT = 2
+
     SHOW_STATS = [50, [10, 30]]
\ No newline at end of file
@@ -0,0 +1,200 @@
+from .Config import Config
+from .BufferPool import BufferPool
+
+from Core.GlobalExceptions import Exceptions
+from Services.Threading.MutexLocker import MutexLocker
+from Services.Threading.WorkerThread import WorkerThread
+
+from PyQt5 import QtCore
+
+import os
+import time
+
+
+class DiskFileTarget:
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self.file = None
+
+    def write(self, data):
+        if self.file == None:
+            self.file = open(self.filePath, "wb")
+        self.file.write(data)
+
+    def close(self):
+        if self.file == None:
+            self.file = open(self.filePath, "wb")
+        self.file.close()
+
+
+class DiskWriteStream:
+    def __init__(self, device, writerIndex, target):
+        self.device = device
+        self.writerIndex = writerIndex
+        self.target = target
+        self.error = None
+        self.closed = False
+
+    def write(self, buffer, byteSize):
+        if self.error != None:
+            BufferPool.release(buffer)
+            raise Exceptions.FileSystemError
+        self.device.put(self, (buffer, byteSize))
+
+    def close(self):
+        self.device.put(self, None)
+        self.device.waitForStream(self)
+        if self.error != None:
+            raise Exceptions.FileSystemError
+
+
+class DiskDevice:
+    def __init__(self, device, writerCount):
+        self.device = device
+        self.queues = [[] for index in range(writerCount)]
+        self.writers = [None] * writerCount
+        self.runningWriters = [False] * writerCount
+        self.nextWriterIndex = 0
+        self.queuedByteSize = 0
+        self.peakQueuedByteSize = 0
+        self.writtenByteSize = 0
+        self.writeSeconds = 0
+        self._lock = MutexLocker()
+        self._condition = QtCore.QWaitCondition()
+
+    def openStream(self, target):
+        with self._lock:
+            writerIndex = self.nextWriterIndex
+            self.nextWriterIndex = (writerIndex + 1) % len(self.queues)
+            return DiskWriteStream(self, writerIndex, target)
+
+    def put(self, stream, chunk):
+        byteSize = 0 if chunk == None else chunk[1]
+        with self._lock:
+            self.queuedByteSize += byteSize
+            self.peakQueuedByteSize = max(self.peakQueuedByteSize, self.queuedByteSize)
+            self.queues[stream.writerIndex].append((stream, chunk))
+            if not self.runningWriters[stream.writerIndex]:
+                self.startWriter(stream.writerIndex)
+            self._condition.wakeAll()
+
+    def startWriter(self, writerIndex):
+        self.runningWriters[writerIndex] = True
+        if self.writers[writerIndex] == None:
+            self.writers[writerIndex] = WorkerThread(target=self.runWriter, args=(writerIndex,))
+        else:
+            self.writers[writerIndex].wait()
+        self.writers[writerIndex].start()
+
+    def waitForStream(self, stream):
+        with self._lock:
+            while not stream.closed:
+                self._condition.wait(self._lock)
+
+    def runWriter(self, writerIndex):
+        while True:
+            with self._lock:
+                while len(self.queues[writerIndex]) == 0:
+                    if not self._condition.wait(self._lock, int(Config.DISK_WRITER_IDLE_TIMEOUT * 1000)) and len(self.queues[writerIndex]) == 0:
+                        self.runningWriters[writerIndex] = False
+                        return
+                items = self.queues[writerIndex]
+                self.queues[writerIndex] = []
+            self.writeItems(items)
+
+    def writeItems(self, items):
+        streams = {}
+        for stream, chunk in items:
+            streams.setdefault(stream, []).append(chunk)
+        for stream, chunks in streams.items():
+            closed = chunks[-1] == None
+            chunks = [chunk for chunk in chunks if chunk != None]
+            byteSize = sum(chunkSize for buffer, chunkSize in chunks)
+            startedAt = time.monotonic()
+            pendingChunks = []
+            pendingByteSize = 0
+            for chunk in chunks:
+                pendingChunks.append(chunk)
+                pendingByteSize += chunk[1]
+                if pendingByteSize >= Config.DISK_WRITER_MAX_WRITE_SIZE:
+                    self.writeChunks(stream, pendingChunks)
+                    pendingChunks = []
+                    pendingByteSize = 0
+            self.writeChunks(stream, pendingChunks)
+            if closed:
+                self.closeStream(stream)
+            with self._lock:
+                self.queuedByteSize -= byteSize
+                if stream.error == None:
+                    self.writtenByteSize += byteSize
+                    self.writeSeconds += time.monotonic() - startedAt
+                if closed:
+                    stream.closed = True
+                self._condition.wakeAll()
+
+    def writeChunks(self, stream, chunks):
+        if len(chunks) == 0:
+            return
+        views = [memoryview(buffer)[:chunkSize] for buffer, chunkSize in chunks]
+        try:
+            self.writeStream(stream, views[0] if len(views) == 1 else b"".join(views))
+        finally:
+            for view in views:
+                view.release()
+            for buffer, chunkSize in chunks:
+                BufferPool.release(buffer)
+
+    def writeStream(self, stream, data):
+        if stream.error != None or len(data) == 0:
+            return
+        try:
+            stream.target.write(data)
+        except Exception as e:
+            stream.error = e
+
+    def closeStream(self, stream):
+        try:
+            stream.target.close()
+        except Exception as e:
+            if stream.error == None:
+                stream.error = e
+
+    def getThroughput(self):
+        with self._lock:
+            return self.writtenByteSize / self.writeSeconds if self.writeSeconds > 0 else 0
+
+    def getQueueDepth(self):
+        with self._lock:
+            return self.queuedByteSize, self.peakQueuedByteSize
+
+
+class _DiskWriter:
+    def __init__(self):
+        self.devices = {}
+        self.directoryDevices = {}
+        self._lock = MutexLocker()
+
+    def getDevice(self, directory):
+        with self._lock:
+            disk = self.directoryDevices.get(directory)
+            if disk == None:
+                disk = self.getDisk(directory)
+                self.directoryDevices[directory] = disk
+            if disk not in self.devices:
+                self.devices[disk] = DiskDevice(disk, max(1, Config.DISK_WRITER_THREAD_COUNT))
+            return self.devices[disk]
+
+    @staticmethod
+    def getDisk(directory):
+        try:
+            return os.stat(directory).st_dev
+        except OSError:
+            return os.path.splitdrive(directory)[0]
+
+    def openFile(self, filePath):
+        return self.openTarget(filePath, DiskFileTarget(filePath))
+
+    def openTarget(self, filePath, target):
+        return self.getDevice(os.path.dirname(os.path.abspath(filePath))).openStream(target)
+
+DiskWriter = _DiskWriter()
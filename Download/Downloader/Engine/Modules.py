@@ -1,5 +1,6 @@
 from .Config import Config
 
+from Download.Downloader.FFmpeg.EncodeProfile import EncodeProfiles
 from Services.Utils.SystemUtils import SystemUtils
 
 
@@ -12,6 +13,16 @@ class Setup:
             self.priority = (1 if self.downloadInfo.isPrioritizeEnabled() else 0) * 2
         elif self.downloadInfo.type.isClip():
             self.priority = (1 if self.downloadInfo.isPrioritizeEnabled() else 0) * 2
+        else:
+            self.priority = Config.LIVE_SEGMENT_PRIORITY
+        if self.downloadInfo.type.isClip():
+            self.encodeProfile = None
+        else:
+            self.encodeProfile = EncodeProfiles.getProfile(self.downloadInfo.getEncodeProfile())
+        if self.downloadInfo.type.isStream() or self.downloadInfo.isPrioritizeEnabled():
+            self.bandwidthWeight = Config.PRIORITIZED_BANDWIDTH_WEIGHT
+        else:
+            self.bandwidthWeight = 1
 
 
 class State:
@@ -46,6 +57,7 @@ class Status:
     DOWNLOADING = "downloading"
     WAITING = "waiting"
     UPDATING = "updating"
+    QUEUED = "queued"
     ENCODING = "encoding"
     DONE = "done"
 
@@ -54,6 +66,7 @@ class Status:
         self.terminateState = State()
         self._status = Status.PREPARING
         self._waitingCount = 0
+        self._maxWaitingCount = Config.UPDATE_TRACK_MAX_RETRY_COUNT
         self._waitingTime = None
         self._updateFound = False
         self._skipWaiting = False
@@ -81,8 +94,11 @@ class Status:
     def getWaitingCount(self):
         return self._waitingCount
 
+    def setMaxWaitingCount(self, maxWaitingCount):
+        self._maxWaitingCount = maxWaitingCount
+
     def getMaxWaitingCount(self):
-        return Config.UPDATE_TRACK_MAX_RETRY_COUNT
+        return self._maxWaitingCount
 
     def setWaitingTime(self, waitingTime):
         self._waitingTime = waitingTime
@@ -96,6 +112,12 @@ class Status:
     def isUpdating(self):
         return self._status == Status.UPDATING
 
+    def setQueued(self):
+        self._status = Status.QUEUED
+
+    def isQueued(self):
+        return self._status == Status.QUEUED
+
     def setEncoding(self):
         self._status = Status.ENCODING
 
@@ -144,6 +166,8 @@ class Progress:
         self.totalMilliseconds = 0
         self.mutedMilliseconds = 0
         self.missingMilliseconds = 0
+        self.skippedFiles = 0
+        self.skippedMilliseconds = 0
         self.byteSize = 0
         self.totalByteSize = 0
 
@@ -175,6 +199,10 @@ class Progress:
     def missingSeconds(self):
         return self.missingMilliseconds / 1000
 
+    @property
+    def skippedSeconds(self):
+        return self.skippedMilliseconds / 1000
+
     @property
     def size(self):
         return SystemUtils.formatByteSize(self.byteSize)
@@ -0,0 +1,98 @@
+from .Config import Config
+
+from Core.GlobalExceptions import Exceptions
+from Services.NetworkRequests import Network
+
+import time
+import random
+
+from email.utils import parsedate_to_datetime
+
+
+class ErrorTypes:
+    TIMEOUT = "timeout"
+    CONNECTION = "connection"
+    FORBIDDEN = "forbidden"
+    NOT_FOUND = "not-found"
+    RATE_LIMITED = "rate-limited"
+    SERVER = "server"
+    UNKNOWN = "unknown"
+
+
+class RequestError(Exceptions.NetworkError):
+    def __init__(self, errorType, statusCode=None, retryAfter=None):
+        self.errorType = errorType
+        self.statusCode = statusCode
+        self.retryAfter = retryAfter
+
+    def isRetryable(self):
+        return self.errorType in (ErrorTypes.TIMEOUT, ErrorTypes.CONNECTION, ErrorTypes.RATE_LIMITED, ErrorTypes.SERVER, ErrorTypes.UNKNOWN)
+
+    def isCongestion(self):
+        return self.errorType in (ErrorTypes.TIMEOUT, ErrorTypes.RATE_LIMITED, ErrorTypes.SERVER)
+
+    def isDeferrable(self):
+        return self.errorType not in (ErrorTypes.NOT_FOUND, ErrorTypes.FORBIDDEN)
+
+    def __str__(self):
+        return f"Network Error ({self.errorType})" if self.statusCode == None else f"Network Error ({self.errorType}, {self.statusCode})"
+
+    @classmethod
+    def fromException(cls, exception):
+        if isinstance(exception, (Network.Exceptions.Timeout, Network.Exceptions.StreamReadTimeout)):
+            return cls(ErrorTypes.TIMEOUT)
+        elif isinstance(exception, Network.Exceptions.ConnectionError):
+            return cls(ErrorTypes.CONNECTION)
+        else:
+            return cls(ErrorTypes.UNKNOWN)
+
+    @classmethod
+    def fromResponse(cls, response):
+        statusCode = response.status_code
+        if statusCode == 403:
+            errorType = ErrorTypes.FORBIDDEN
+        elif statusCode == 404 or statusCode == 410:
+            errorType = ErrorTypes.NOT_FOUND
+        elif statusCode == 429:
+            errorType = ErrorTypes.RATE_LIMITED
+        elif statusCode >= 500:
+            errorType = ErrorTypes.SERVER
+        else:
+            errorType = ErrorTypes.UNKNOWN
+        return cls(errorType, statusCode=statusCode, retryAfter=cls.parseRetryAfter(response.headers.get("retry-after")))
+
+    @staticmethod
+    def parseRetryAfter(value):
+        if value == None:
+            return None
+        try:
+            return max(0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0, parsedate_to_datetime(value).timestamp() - time.time())
+        except:
+            return None
+
+
+class RetryPolicy:
+    def __init__(self, maxRetryCount=Config.SEGMENT_DOWNLOAD_MAX_RETRY_COUNT, baseDelay=Config.RETRY_BASE_DELAY, maxDelay=Config.RETRY_MAX_DELAY):
+        self.maxRetryCount = maxRetryCount
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+
+    def shouldRetry(self, attempt, errors):
+        return attempt + 1 < self.maxRetryCount and any(error.isRetryable() for error in errors)
+
+    def getDelay(self, attempt, errors):
+        retryAfter = max((error.retryAfter for error in errors if error.retryAfter != None), default=None)
+        if retryAfter != None:
+            return min(retryAfter, self.maxDelay)
+        return random.uniform(0, min(self.maxDelay, self.baseDelay * 2 ** attempt))
+
+    @staticmethod
+    def getPrimaryError(errors):
+        for error in errors:
+            if error.errorType != ErrorTypes.NOT_FOUND:
+                return error
+        return errors[0] if len(errors) != 0 else RequestError(ErrorTypes.UNKNOWN)
@@ -1,7 +1,13 @@
 from . import Modules
+from .BandwidthLimiter import BandwidthLimiter
+from .DiskWriter import DiskWriter
+
+from Download.Downloader.FFmpeg.FFmpeg import FFmpeg
+from Download.Downloader.FFmpeg.EncodeScheduler import EncodeScheduler
 
 from Core.Config import Config
 from Services.Utils.Utils import Utils
+from Services.Utils.SystemUtils import SystemUtils
 from Services.Threading.MutexLocker import MutexLocker
 from Services.Logging.Logger import Logger
 from Services.Logging.ObjectLogger import ObjectLogger
@@ -26,6 +32,9 @@ class EngineSetup(QtCore.QThread):
         self.status = Modules.Status()
         self.progress = Modules.Progress()
         self.actionLock = MutexLocker()
+        self.bandwidthChannel = None
+        self.encodeJob = None
+        self.extraEncodeJobs = []
         self.setupLogger()
         super().started.connect(self.emitStartedSignal)
         super().finished.connect(self.emitFinishedSignal)
@@ -48,18 +57,23 @@ class EngineSetup(QtCore.QThread):
 
     def run(self):
         self.logger.info("Download Started")
+        self.bandwidthChannel = BandwidthLimiter.openChannel(self.setup.bandwidthWeight)
         try:
             self.download()
         except Exception as e:
             self.logger.exception(e)
             self.status.raiseError(e)
+        finally:
+            self.bandwidthChannel.close()
+        self.releaseEncodeJob()
         with self.actionLock:
             if self.status.terminateState.isProcessing():
                 if not self.setup.downloadInfo.type.isStream() and self.status.getError() == None:
-                    try:
-                        Utils.removeFile(self.setup.downloadInfo.getAbsoluteFileName())
-                    except:
-                        pass
+                    for fileName in [self.setup.downloadInfo.getAbsoluteFileName(), *self.setup.downloadInfo.getAdditionalAbsoluteFileNames()]:
+                        try:
+                            Utils.removeFile(fileName)
+                        except:
+                            pass
                 self.status.terminateState.setTrue()
             self.status.setDone()
             self.syncStatus()
@@ -79,6 +93,41 @@ class EngineSetup(QtCore.QThread):
     def download(self):
         pass
 
+    def waitForEncodeJob(self):
+        with self.actionLock:
+            self.encodeJob = EncodeScheduler.createJob(self.setup.downloadInfo.getAbsoluteFileName(), priority=self.setup.priority)
+            self.status.setQueued()
+            self.syncStatus()
+        self.logger.info("Waiting for encoding slot...")
+        return self.encodeJob.wait()
+
+    def acquireExtraEncodeJobs(self, count):
+        self.extraEncodeJobs.extend(EncodeScheduler.acquireJobs(self.setup.downloadInfo.getAbsoluteFileName(), priority=self.setup.priority, count=count))
+        return len(self.extraEncodeJobs)
+
+    def cancelEncodeJob(self):
+        if self.encodeJob != None:
+            self.encodeJob.cancel()
+
+    def releaseEncodeJob(self):
+        for job in self.extraEncodeJobs:
+            job.release()
+        self.extraEncodeJobs = []
+        if self.encodeJob != None:
+            self.encodeJob.release()
+            self.encodeJob = None
+
+    def logDiskWriterStats(self, directory):
+        device = DiskWriter.getDevice(directory)
+        queuedByteSize, peakQueuedByteSize = device.getQueueDepth()
+        self.logger.info(f"[DiskWriter] Device {device.device}: {SystemUtils.formatByteSize(device.getThroughput())}/s, queue depth {SystemUtils.formatByteSize(queuedByteSize)} (peak {SystemUtils.formatByteSize(peakQueuedByteSize)})")
+
+    def getEncodingPriority(self):
+        if self.setup.downloadInfo.type.isStream() or self.setup.downloadInfo.isPrioritizeEnabled():
+            return FFmpeg.Priority.NORMAL
+        else:
+            return FFmpeg.Priority.BELOW_NORMAL
+
     def cancel(self):
         pass
 
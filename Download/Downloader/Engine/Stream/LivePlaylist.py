@@ -0,0 +1,127 @@
+from Services.Twitch.Playback.PlaylistReader import PlaylistTagReader
+
+from datetime import datetime, timedelta
+from urllib.parse import urljoin
+
+
+class Exceptions:
+    class InvalidPlaylist(Exception):
+        def __str__(self):
+            return "Invalid Playlist"
+
+
+class LiveSegment:
+    def __init__(self, sequence, url, durationMilliseconds, prefetch=False, ad=False):
+        self.sequence = sequence
+        self.url = url
+        self.durationMilliseconds = durationMilliseconds
+        self.prefetch = prefetch
+        self.ad = ad
+        self.fileName = f"{sequence}.ts"
+        self.muted = False
+
+    def confirm(self, segment):
+        self.url = segment.url
+        self.durationMilliseconds = segment.durationMilliseconds
+        self.prefetch = False
+        self.ad = segment.ad
+
+    def __str__(self):
+        return f"<LiveSegment {self.__dict__}>"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class LivePlaylist(PlaylistTagReader):
+    AD_DATE_RANGE_CLASS = "twitch-stitched-ad"
+    AD_DATE_RANGE_ID_PREFIX = "stitched-ad-"
+    AD_SEGMENT_TITLE = "Amazon"
+
+    def __init__(self, text, url):
+        super(LivePlaylist, self).__init__()
+        self.url = url
+        self.targetDuration = None
+        self.mediaSequence = 0
+        self.segments = []
+        self.prefetchSegments = []
+        self.ended = False
+        self.adRanges = []
+        self.readPlaylist(text)
+
+    def readPlaylist(self, text):
+        hasHeader = False
+        expectSegment = None
+        segmentTitle = ""
+        programDateTime = None
+        segmentDates = []
+        for line, tag in self.iterTags(text.split("\n")):
+            if tag != None:
+                if tag.name == "EXTM3U":
+                    hasHeader = True
+                elif tag.name == "EXT-X-TARGETDURATION":
+                    self.targetDuration = float(tag.data[0])
+                elif tag.name == "EXT-X-MEDIA-SEQUENCE":
+                    self.mediaSequence = int(tag.data[0])
+                elif tag.name == "EXT-X-ENDLIST":
+                    self.ended = True
+                elif tag.name == "EXTINF":
+                    expectSegment = self.getDuration(tag)
+                    segmentTitle = tag.rawData.split(",", 1)[1] if "," in tag.rawData else ""
+                elif tag.name == "EXT-X-PROGRAM-DATE-TIME":
+                    programDateTime = self.parseDateTime(tag.rawData)
+                elif tag.name == "EXT-X-DATERANGE":
+                    self.addDateRange(tag.data)
+                elif tag.name == "EXT-X-TWITCH-PREFETCH":
+                    self.prefetchSegments.append(tag.rawData.strip())
+            elif expectSegment != None and line.strip() != "":
+                self.segments.append(LiveSegment(self.mediaSequence + len(self.segments), urljoin(self.url, line.strip()), expectSegment, ad=self.AD_SEGMENT_TITLE in segmentTitle))
+                segmentDates.append(programDateTime)
+                if programDateTime != None:
+                    programDateTime += timedelta(milliseconds=expectSegment)
+                expectSegment = None
+                segmentTitle = ""
+        if not hasHeader:
+            raise Exceptions.InvalidPlaylist
+        if len(self.adRanges) != 0:
+            for segment, segmentDate in zip(self.segments, segmentDates):
+                if not segment.ad and segmentDate != None:
+                    segment.ad = any(start <= segmentDate < end for start, end in self.adRanges)
+        if len(self.segments) != 0 and self.segments[-1].ad:
+            self.prefetchSegments = []
+        durationMilliseconds = self.segments[-1].durationMilliseconds if len(self.segments) != 0 else int((self.targetDuration or 0) * 1000)
+        self.prefetchSegments = [
+            LiveSegment(self.mediaSequence + len(self.segments) + index, urljoin(self.url, url), durationMilliseconds, prefetch=True) for index, url in enumerate(self.prefetchSegments)
+        ]
+
+    def addDateRange(self, data):
+        if not isinstance(data, dict):
+            return
+        if data.get("CLASS") != self.AD_DATE_RANGE_CLASS and not data.get("ID", "").startswith(self.AD_DATE_RANGE_ID_PREFIX):
+            return
+        try:
+            start = self.parseDateTime(data["START-DATE"])
+            if "END-DATE" in data:
+                end = self.parseDateTime(data["END-DATE"])
+            else:
+                end = start + timedelta(seconds=float(data.get("DURATION") or data["PLANNED-DURATION"]))
+        except:
+            return
+        if start != None and end != None:
+            self.adRanges.append((start, end))
+
+    @staticmethod
+    def parseDateTime(string):
+        string = string.strip()
+        if string.endswith("Z"):
+            string = f"{string[:-1]}+00:00"
+        try:
+            return datetime.fromisoformat(string)
+        except:
+            return None
+
+    def getSegmentsAfter(self, sequence, prefetch=False):
+        segments = self.segments + self.prefetchSegments if prefetch else self.segments
+        if sequence == None:
+            return segments
+        return segments[max(0, sequence + 1 - self.mediaSequence):]
@@ -0,0 +1,9 @@
+from Download.Downloader.Engine.Video.SegmentDownloader import SegmentDownloader, SegmentUrl
+
+
+class LiveSegmentDownloader(SegmentDownloader):
+    def __init__(self, segment, saveAs, bandwidthChannel=None, attempt=0, priority=0):
+        super(LiveSegmentDownloader, self).__init__(url=segment.url, segment=segment, unmute=False, saveAs=saveAs, bandwidthChannel=bandwidthChannel, attempt=attempt, priority=priority)
+
+    def getFileUrls(self):
+        return [SegmentUrl(url=self.segment.url)]
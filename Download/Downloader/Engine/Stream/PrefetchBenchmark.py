@@ -0,0 +1,166 @@
+from .LivePlaylist import LivePlaylist
+from .LiveSegmentDownloader import LiveSegmentDownloader
+
+from Services.NetworkRequests import Network
+from Services.Threading.WorkerThread import WorkerThread
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import os
+import tempfile
+import time
+
+
+class StandInLiveServer:
+    def __init__(self, segmentSeconds=2, targetDuration=6, prefetchCount=2, windowSize=6, segmentSize=64 * 1024):
+        self.segmentSeconds = segmentSeconds
+        self.targetDuration = targetDuration
+        self.prefetchCount = prefetchCount
+        self.windowSize = windowSize
+        self.segmentSize = segmentSize
+        self.startedAt = None
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.createHandler())
+        self.server.daemon_threads = True
+        self.thread = WorkerThread(target=self.server.serve_forever)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/playlist.m3u8"
+
+    def start(self):
+        self.startedAt = time.monotonic()
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.thread.wait()
+        self.server.server_close()
+
+    def getPublishedAt(self, sequence):
+        return self.startedAt + (sequence + 1) * self.segmentSeconds
+
+    def getPublishedCount(self):
+        return int((time.monotonic() - self.startedAt) // self.segmentSeconds)
+
+    def getPlaylist(self):
+        publishedCount = self.getPublishedCount()
+        mediaSequence = max(0, publishedCount - self.windowSize)
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3", f"#EXT-X-TARGETDURATION:{self.targetDuration}", f"#EXT-X-MEDIA-SEQUENCE:{mediaSequence}"]
+        for sequence in range(mediaSequence, publishedCount):
+            lines.append(f"#EXTINF:{self.segmentSeconds:.3f},live")
+            lines.append(f"{sequence}.ts")
+        for sequence in range(publishedCount, publishedCount + self.prefetchCount):
+            lines.append(f"#EXT-X-TWITCH-PREFETCH:{sequence}.ts")
+        return "\n".join(lines)
+
+    def getSegment(self, sequence):
+        if sequence >= self.getPublishedCount() + self.prefetchCount:
+            return None
+        delay = self.getPublishedAt(sequence) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return b"\x47" * self.segmentSize
+
+    def createHandler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/playlist.m3u8":
+                    data = server.getPlaylist().encode()
+                elif self.path.endswith(".ts") and self.path[1:-3].isdigit():
+                    data = server.getSegment(int(self.path[1:-3]))
+                else:
+                    data = None
+                if data == None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class PrefetchBenchmarkResult:
+    def __init__(self, prefetch, latencies, failedCount):
+        self.prefetch = prefetch
+        self.latencies = latencies
+        self.failedCount = failedCount
+
+    @property
+    def meanLatency(self):
+        return sum(self.latencies) / (len(self.latencies) or 1)
+
+    @property
+    def maxLatency(self):
+        return max(self.latencies, default=0)
+
+    def __str__(self):
+        return f"Prefetch {'on' if self.prefetch else 'off'}: {len(self.latencies)} segments, mean latency {self.meanLatency * 1000:.0f}ms, max {self.maxLatency * 1000:.0f}ms, {self.failedCount} failed"
+
+
+class PrefetchBenchmark:
+    def __init__(self, duration=30, segmentSeconds=2, targetDuration=6, prefetchCount=2):
+        self.duration = duration
+        self.segmentSeconds = segmentSeconds
+        self.targetDuration = targetDuration
+        self.prefetchCount = prefetchCount
+
+    def run(self):
+        return [self.runPrefetch(False), self.runPrefetch(True)]
+
+    def runPrefetch(self, prefetch):
+        server = StandInLiveServer(segmentSeconds=self.segmentSeconds, targetDuration=self.targetDuration, prefetchCount=self.prefetchCount)
+        server.start()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                threads = self.record(server, directory, prefetch)
+                for thread in threads:
+                    thread.wait()
+        finally:
+            server.stop()
+        latencies = []
+        failedCount = 0
+        for thread in threads:
+            if thread.result.success:
+                sequence, downloadedAt = thread.result.data
+                latencies.append(max(0, downloadedAt - server.getPublishedAt(sequence)))
+            else:
+                failedCount += 1
+        return PrefetchBenchmarkResult(prefetch, latencies, failedCount)
+
+    def record(self, server, directory, prefetch):
+        threads = []
+        lastSequence = None
+        endAt = time.monotonic() + self.duration
+        while time.monotonic() < endAt:
+            playlist = LivePlaylist(Network.session.get(server.url, timeout=(10, 10)).text, server.url)
+            newSegments = playlist.getSegmentsAfter(lastSequence, prefetch=prefetch)
+            for segment in newSegments:
+                if lastSequence == None or segment.sequence > lastSequence:
+                    thread = WorkerThread(target=self.download, args=(segment, os.path.join(directory, segment.fileName)))
+                    thread.start()
+                    threads.append(thread)
+            if len(newSegments) != 0:
+                lastSequence = newSegments[-1].sequence
+            time.sleep((playlist.targetDuration or self.targetDuration) / (1 if len(newSegments) != 0 else 2))
+        return threads
+
+    def download(self, segment, saveAs):
+        task = LiveSegmentDownloader(segment=segment, saveAs=saveAs)
+        task.run()
+        if not task.result.success:
+            raise task.result.error
+        return segment.sequence, time.monotonic()
+
+
+if __name__ == "__main__":
+    for result in PrefetchBenchmark().run():
+        print(result)
@@ -1,36 +1,360 @@
+from .LivePlaylist import LivePlaylist
+from .LiveSegmentDownloader import LiveSegmentDownloader
+
 from Download.Downloader.Engine.Setup import EngineSetup
+from Download.Downloader.Engine.ThreadPool import ThreadPool
+from Download.Downloader.Engine.Config import Config
+from Download.Downloader.Engine.Video.SegmentSequencer import SegmentSequencer
 
+from Core.GlobalExceptions import Exceptions
+from Services.NetworkRequests import Network
 from Services.Utils.Utils import Utils
+from Services.Temp.TempManager import TempManager
+from Services.Task.TaskManager import TaskManager
+from Services.Threading.MutexLocker import MutexLocker
+from Services.Threading.WorkerThread import WorkerThread
 from Download.Downloader.FFmpeg.FFmpeg import FFmpeg
 
+import os
+import time
+
 
 class StreamDownloader(EngineSetup):
     def __init__(self, downloadInfo, parent=None):
         super(StreamDownloader, self).__init__(downloadInfo, parent=parent)
         self.FFmpeg = FFmpeg(parent=self)
+        self.taskManager = TaskManager(ThreadPool, parent=self)
+        self.tempDirectory = None
+        self.recordingFile = None
+        self.sequencer = None
+        self.recordingOutputReader = None
+        self.lastSequence = None
+        self.mediaSequence = 0
+        self.prefetchedSegments = {}
+        self.failedPrefetchSegments = {}
+        self.prefetchLock = MutexLocker()
+        self.retryTasks = []
+        self.retryLock = MutexLocker()
 
     def download(self):
-        with self.actionLock:
-            if self.status.terminateState.isProcessing():
-                return
-            self.FFmpeg.startEncodingProcess(
-                target=self.setup.downloadInfo.getUrl(),
-                saveAs=self.setup.downloadInfo.getAbsoluteFileName(),
-                remux=True,
-                logLevel=FFmpeg.LogLevel.WARNING,
-                priority=FFmpeg.Priority.HIGH
-            )
+        try:
+            if self.setupRecording():
+                self.record()
+                self.finishRecording()
+        except:
+            self.stopRecording()
+            if self.tempDirectory != None:
+                self.tempDirectory.cleanup()
+            raise
+        if self.status.getError() == None:
+            try:
+                self.remux()
+            except:
+                self.logger.warning(f"Unable to remux the recording. The recorded stream is kept at: {self.recordingFilePath}")
+                self.tempDirectory.keep(Config.RESUMABLE_TEMP_EXPIRY)
+                raise
+        self.tempDirectory.cleanup()
+
+    def isRemuxRequired(self):
+        return self.setup.downloadInfo.fileFormat != "ts" and not self.isFragmentedRecordingEnabled()
+
+    def isFragmentedRecordingEnabled(self):
+        return Config.FRAGMENTED_MP4_ENABLED and FFmpeg.isFragmentableFormat(self.setup.downloadInfo.fileFormat)
+
+    def setupRecording(self):
+        try:
+            self.tempDirectory = TempManager.createTempDirectory(self.setup.downloadInfo.directory)
+            self.logger.info(f"Temp Directory: {self.tempDirectory.name}")
+            if self.isRemuxRequired():
+                self.recordingFilePath = Utils.joinPath(self.tempDirectory.name, f"{Config.PLAYLIST_FILE_NAME}.ts")
+            else:
+                self.recordingFilePath = self.setup.downloadInfo.getAbsoluteFileName()
+            if not self.isFragmentedRecordingEnabled():
+                self.recordingFile = open(self.recordingFilePath, "wb", buffering=0)
+        except Exception as e:
+            self.logger.exception(e)
+            raise Exceptions.FileSystemError
+        if self.isFragmentedRecordingEnabled():
+            if not self.waitForEncodeJob():
+                return False
+            self.startFragmentedRecording()
+        self.sequencer = SegmentSequencer(self.recordingFile, bufferSize=Config.PIPELINE_REORDER_BUFFER_SIZE, chunkSize=Config.PIPELINE_CHUNK_SIZE)
+        self.sequencer.segmentWritten.connect(self.segmentWritten)
+        self.sequencer.segmentMissing.connect(self.segmentMissing)
+        self.sequencer.start()
+        self.taskManager.taskCompleteSignal.connect(self.segmentDownloadComplete)
+        self.taskManager.start()
+        return True
+
+    def startFragmentedRecording(self):
+        self.logger.info("Starting Fragmented MP4 Recording...")
+        self.FFmpeg.startEncodingProcess(
+            target=FFmpeg.PIPE_INPUT,
+            saveAs=self.recordingFilePath,
+            remux=True,
+            inputFormat="mpegts",
+            profile=self.setup.encodeProfile,
+            additionalOutputs=self.setup.downloadInfo.getAdditionalAbsoluteFileNames(),
+            fragmented=True,
+            logLevel=FFmpeg.LogLevel.WARNING,
+            priority=self.getEncodingPriority()
+        )
+        self.recordingFile = self.FFmpeg.getInputPipe()
+        self.recordingOutputReader = WorkerThread(target=self.readRecordingOutput)
+        self.recordingOutputReader.start()
+
+    def readRecordingOutput(self):
+        try:
+            for progress in self.FFmpeg.output(logger=self.logger):
+                pass
+        except Exception as e:
+            if self.status.terminateState.isFalse():
+                self.abort(e)
+
+    def getPlaylist(self):
+        try:
+            response = Network.session.get(self.setup.downloadInfo.getUrl(), timeout=(10, 10))
+            if response.status_code != 200:
+                raise
+            return LivePlaylist(response.text, self.setup.downloadInfo.getUrl())
+        except:
+            raise Exceptions.NetworkError
+
+    def record(self):
         self.status.setDownloading()
         self.syncStatus()
-        for progress in self.FFmpeg.output(logger=self.logger):
-            time = progress.get("time")
-            if time != None:
-                self.progress.milliseconds = Utils.toSeconds(*time.split(".")[0].split(":")) * 1000 + int(time.split(".")[1][:3])
-            size = progress.get("size") or progress.get("Lsize")
-            if size != None:
-                self.progress.totalByteSize = Utils.getByteSize(size)
-                self.progress.byteSize = self.progress.totalByteSize
-            self.syncProgress()
+        self.logger.info("Recording Stream...")
+        failedCount = 0
+        idleSince = time.monotonic()
+        interval = Config.UPDATE_TRACK_MIN_INTERVAL
+        while self.status.terminateState.isFalse():
+            try:
+                playlist = self.getPlaylist()
+                failedCount = 0
+            except Exceptions.NetworkError as e:
+                failedCount += 1
+                self.logger.warning(f"Unable to get live playlist. {failedCount}/{Config.LIVE_PLAYLIST_MAX_RETRY_COUNT} [{e}]")
+                if failedCount >= Config.LIVE_PLAYLIST_MAX_RETRY_COUNT:
+                    break
+                self.waitFor(interval)
+                continue
+            targetDuration = playlist.targetDuration or interval
+            self.confirmPrefetchedSegments(playlist)
+            newSegments = playlist.getSegmentsAfter(self.lastSequence, prefetch=Config.LIVE_PREFETCH_ENABLED)
+            if len(newSegments) == 0:
+                if time.monotonic() - idleSince >= Config.LIVE_MAX_IDLE_TIME:
+                    self.logger.info("Live playlist is not updated.")
+                    break
+                interval = targetDuration / 2
+            else:
+                idleSince = time.monotonic()
+                interval = targetDuration
+                self.addSegments(newSegments, targetDuration)
+            if playlist.ended:
+                self.logger.info("End of live playlist.")
+                break
+            self.waitFor(interval)
+
+    def addSegments(self, segments, targetDuration):
+        if self.lastSequence != None and segments[0].sequence > self.lastSequence + 1:
+            skippedCount = segments[0].sequence - self.lastSequence - 1
+            self.logger.warning(f"Missed {skippedCount} live segments.")
+            self.progress.missingFiles += skippedCount
+            self.progress.missingMilliseconds += int(skippedCount * targetDuration * 1000)
+        self.lastSequence = segments[-1].sequence
+        adSegments = [segment for segment in segments if segment.ad]
+        if len(adSegments) != 0:
+            self.skipAdSegments(adSegments)
+            segments = [segment for segment in segments if not segment.ad]
+            if len(segments) == 0:
+                return
+        self.sequencer.addSegments(segments)
+        for segment in segments:
+            if self.status.terminateState.isProcessing():
+                break
+            if segment.prefetch:
+                with self.prefetchLock:
+                    self.prefetchedSegments[segment.sequence] = segment
+            self.sequencer.waitForWindow(segment.fileName)
+            self.addSegmentTask(segment)
+
+    def skipAdSegments(self, segments):
+        self.logger.info(f"Skipping {len(segments)} stitched ad segments.")
+        for segment in segments:
+            self.progress.skippedFiles += 1
+            self.progress.skippedMilliseconds += segment.durationMilliseconds
+        self.syncProgress()
+
+    def addSegmentTask(self, segment, attempt=0):
+        self.taskManager.add(
+            LiveSegmentDownloader(
+                segment=segment,
+                saveAs=Utils.joinPath(self.tempDirectory.name, segment.fileName),
+                bandwidthChannel=self.bandwidthChannel,
+                attempt=attempt,
+                priority=self.setup.priority
+            )
+        )
+
+    def retryDueTasks(self):
+        now = time.monotonic()
+        with self.retryLock:
+            tasks = [task for retryAt, task in self.retryTasks if retryAt <= now]
+            self.retryTasks = [(retryAt, task) for retryAt, task in self.retryTasks if retryAt > now]
+        for task in tasks:
+            self.logger.info(f"Retrying live segment: {task.segment.sequence} [{task.result.error}]")
+            self.addSegmentTask(task.segment, attempt=task.attempt + 1)
+
+    def hasRetryTasks(self):
+        with self.retryLock:
+            return len(self.retryTasks) != 0
+
+    def discardRetryTasks(self):
+        with self.retryLock:
+            tasks = [task for retryAt, task in self.retryTasks]
+            self.retryTasks = []
+        for task in tasks:
+            self.logger.warning(f"Failed to download live segment: {task.segment.sequence} [{task.result.error}]\n{task.segment.url}")
+            self.sequencer.complete(task.segment.fileName, None)
+
+    def confirmPrefetchedSegments(self, playlist):
+        retrySegments = []
+        with self.prefetchLock:
+            self.mediaSequence = playlist.mediaSequence
+            for segment in playlist.segments:
+                prefetchedSegment = self.prefetchedSegments.get(segment.sequence)
+                if prefetchedSegment != None:
+                    prefetchedSegment.confirm(segment)
+                failedSegment = self.failedPrefetchSegments.pop(segment.sequence, None)
+                if failedSegment != None:
+                    failedSegment.confirm(segment)
+                    if segment.ad:
+                        self.sequencer.complete(failedSegment.fileName, None)
+                    else:
+                        retrySegments.append(failedSegment)
+            for sequence in [sequence for sequence in self.failedPrefetchSegments if sequence < playlist.mediaSequence]:
+                self.sequencer.complete(self.failedPrefetchSegments.pop(sequence).fileName, None)
+        for segment in retrySegments:
+            self.logger.info(f"Retrying prefetched live segment: {segment.sequence}")
+            self.addSegmentTask(segment)
+
+    def discardFailedPrefetchSegments(self):
+        with self.prefetchLock:
+            for segment in self.failedPrefetchSegments.values():
+                self.sequencer.complete(segment.fileName, None)
+            self.failedPrefetchSegments = {}
+            self.prefetchedSegments = {}
+
+    def waitFor(self, seconds):
+        waitEnd = time.monotonic() + seconds
+        while time.monotonic() < waitEnd and self.status.terminateState.isFalse():
+            self.retryDueTasks()
+            self.msleep(100)
+
+    def segmentDownloadComplete(self, task):
+        with self.prefetchLock:
+            self.prefetchedSegments.pop(task.segment.sequence, None)
+            if not task.result.success and task.segment.prefetch and task.segment.sequence >= self.mediaSequence:
+                self.failedPrefetchSegments[task.segment.sequence] = task.segment
+                return
+        if not task.result.success:
+            if task.retryDelay != None and self.status.terminateState.isFalse():
+                with self.retryLock:
+                    self.retryTasks.append((time.monotonic() + task.retryDelay, task))
+                return
+            self.logger.warning(f"Failed to download live segment: {task.segment.sequence} [{task.result.error}]\n{task.segment.url}")
+            if isinstance(task.result.error, Exceptions.FileSystemError):
+                self.abort(task.result.error)
+                return
+        if task.result.success and task.segment.ad:
+            try:
+                Utils.removeFile(task.saveAs)
+            except:
+                pass
+            self.sequencer.complete(task.segment.fileName, None)
+            return
+        self.sequencer.complete(task.segment.fileName, task.saveAs if task.result.success else None)
+
+    def segmentWritten(self, segment, byteSize):
+        self.progress.milliseconds += segment.durationMilliseconds
+        self.progress.byteSize += byteSize
+        self.progress.totalByteSize = self.progress.byteSize
+        self.syncProgress()
+
+    def segmentMissing(self, segment):
+        if segment.ad:
+            self.skipAdSegments([segment])
+            return
+        self.progress.missingFiles += 1
+        self.progress.missingMilliseconds += segment.durationMilliseconds
+        self.syncProgress()
+
+    def finishRecording(self):
+        self.taskManager.waitForDone()
+        while self.status.terminateState.isFalse() and self.hasRetryTasks():
+            self.waitFor(1)
+            self.taskManager.waitForDone()
+        self.discardRetryTasks()
+        self.logDiskWriterStats(self.tempDirectory.name)
+        self.discardFailedPrefetchSegments()
+        self.sequencer.closeInput()
+        self.sequencer.wait()
+        if self.recordingOutputReader != None:
+            self.recordingOutputReader.wait()
+        self.releaseEncodeJob()
+        if self.sequencer.error != None:
+            self.logger.exception(self.sequencer.error)
+            raise Exceptions.FileSystemError
+
+    def stopRecording(self):
+        self.taskManager.stop()
+        self.taskManager.waitForDone()
+        if self.sequencer != None:
+            self.sequencer.abort()
+            self.sequencer.wait()
+        elif self.recordingFile != None:
+            try:
+                self.recordingFile.close()
+            except:
+                pass
+        if self.FFmpeg.process != None and self.FFmpeg.isRunning():
+            self.FFmpeg.kill()
+        if self.recordingOutputReader != None:
+            self.recordingOutputReader.wait()
+        self.releaseEncodeJob()
+
+    def getRemuxOutputs(self):
+        if self.isFragmentedRecordingEnabled():
+            return []
+        additionalOutputs = self.setup.downloadInfo.getAdditionalAbsoluteFileNames()
+        if self.isRemuxRequired():
+            return [self.setup.downloadInfo.getAbsoluteFileName(), *additionalOutputs]
+        else:
+            return additionalOutputs
+
+    def remux(self):
+        outputs = self.getRemuxOutputs()
+        if len(outputs) == 0 or os.path.getsize(self.recordingFilePath) == 0:
+            return
+        self.waitForEncodeJob()
+        try:
+            with self.actionLock:
+                self.status.setEncoding()
+                self.syncStatus()
+                self.logger.info("Remuxing...")
+                self.FFmpeg.startEncodingProcess(
+                    target=self.recordingFilePath,
+                    saveAs=outputs[0],
+                    remux=True,
+                    additionalOutputs=outputs[1:],
+                    logLevel=FFmpeg.LogLevel.WARNING,
+                    profile=self.setup.encodeProfile,
+                    priority=self.getEncodingPriority()
+                )
+            for progress in self.FFmpeg.output(logger=self.logger):
+                pass
+        finally:
+            self.releaseEncodeJob()
 
     def cancel(self):
         with self.actionLock:
@@ -38,5 +362,8 @@ class StreamDownloader(EngineSetup):
                 self.logger.warning("[ACTION] Cancel")
                 self.status.terminateState.setProcessing()
                 self.syncStatus()
-                if self.FFmpeg != None:
-                    self.FFmpeg.kill()
\ No newline at end of file
+                self.taskManager.stop()
+                if self.sequencer != None:
+                    self.sequencer.release()
+                else:
+                    self.cancelEncodeJob()
@@ -1,4 +1,22 @@
-from Services.Threading.ThreadPool import ThreadPool
+from .BufferPool import BufferPool
 
+from Services.Threading.ThreadPool import ThreadPool as BaseThreadPool
 
-ThreadPool = ThreadPool()
\ No newline at end of file
+
+class DownloadThreadPool(BaseThreadPool):
+    def __init__(self, parent=None):
+        super(DownloadThreadPool, self).__init__(parent=parent)
+        self._adaptiveConcurrency = False
+
+    def setMaxThreadCount(self, maxThreadCount):
+        super().setMaxThreadCount(maxThreadCount)
+        BufferPool.setMaxBufferCount(BufferPool.getMaxBufferCount(maxThreadCount))
+
+    def setAdaptiveConcurrencyEnabled(self, enabled):
+        self._adaptiveConcurrency = enabled
+
+    def isAdaptiveConcurrencyEnabled(self):
+        return self._adaptiveConcurrency
+
+
+ThreadPool = DownloadThreadPool()
@@ -0,0 +1,71 @@
+from Download.Downloader.Engine.Config import Config
+
+from Services.Utils.SystemUtils import SystemUtils
+
+import time
+
+
+class ConcurrencyController:
+    def __init__(self, taskManager, logger):
+        self.taskManager = taskManager
+        self.logger = logger
+        self.concurrency = Config.ADAPTIVE_INITIAL_THREAD_COUNT
+        self.previousThroughput = None
+        self.changedAt = time.monotonic()
+        self.resetWindow()
+        self.logger.info(f"[Adaptive] Initial concurrency: {self.concurrency}")
+        self.taskManager.setMaxRunningCount(self.concurrency)
+
+    def resetWindow(self):
+        self.windowStartedAt = time.monotonic()
+        self.windowByteSize = 0
+        self.windowSamples = 0
+        self.windowElapsed = 0
+        self.windowFailures = 0
+        self.windowCongestion = 0
+
+    def addSample(self, task):
+        self.windowSamples += 1
+        self.windowElapsed += task.elapsed
+        if task.result.success:
+            self.windowByteSize += task.byteSize
+        else:
+            self.windowFailures += 1
+        if task.startedAt != None and task.startedAt >= self.changedAt:
+            self.windowCongestion += task.congestionCount
+        if self.windowCongestion != 0:
+            self.decrease()
+        elif time.monotonic() - self.windowStartedAt >= Config.ADAPTIVE_WINDOW_SECONDS and self.windowSamples >= self.concurrency:
+            self.evaluate()
+
+    def getWindowStats(self, throughput):
+        latency = self.windowElapsed / (self.windowSamples or 1)
+        errorRate = (self.windowFailures + self.windowCongestion) / (self.windowSamples or 1) * 100
+        return f"throughput: {SystemUtils.formatByteSize(throughput)}/s, latency: {latency:.2f}s, error rate: {errorRate:.1f}%"
+
+    def getWindowThroughput(self):
+        return self.windowByteSize / max(time.monotonic() - self.windowStartedAt, 0.001)
+
+    def decrease(self):
+        throughput = self.getWindowThroughput()
+        concurrency = max(Config.ADAPTIVE_MIN_THREAD_COUNT, int(self.concurrency * Config.ADAPTIVE_DECREASE_FACTOR))
+        if concurrency != self.concurrency:
+            self.setConcurrency(concurrency, f"timeouts or server errors detected ({self.getWindowStats(throughput)})")
+        self.previousThroughput = None
+        self.resetWindow()
+
+    def evaluate(self):
+        throughput = self.getWindowThroughput()
+        if self.previousThroughput == None or throughput > self.previousThroughput * (1 + Config.ADAPTIVE_IMPROVEMENT_THRESHOLD):
+            if self.concurrency < Config.MAX_THREAD_LIMIT:
+                self.setConcurrency(self.concurrency + 1, f"throughput improving ({self.getWindowStats(throughput)})")
+        else:
+            self.logger.debug(f"[Adaptive] Holding concurrency at {self.concurrency} ({self.getWindowStats(throughput)})")
+        self.previousThroughput = throughput
+        self.resetWindow()
+
+    def setConcurrency(self, concurrency, reason):
+        self.logger.info(f"[Adaptive] Concurrency {self.concurrency} -> {concurrency}: {reason}")
+        self.concurrency = concurrency
+        self.changedAt = time.monotonic()
+        self.taskManager.setMaxRunningCount(self.concurrency)
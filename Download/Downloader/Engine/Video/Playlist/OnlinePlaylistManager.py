@@ -7,16 +7,31 @@ from Services.NetworkRequests import Network
 class OnlinePlaylistManager(PlaylistManager):
     def __init__(self, url, filePath, strictMode=False):
         self.url = url
+        self.etag = None
+        self.lastModified = None
         super(OnlinePlaylistManager, self).__init__(self.getOnlinePlaylist(), filePath, strictMode=strictMode)
 
-    def getOnlinePlaylist(self):
+    def getOnlinePlaylist(self, conditional=False):
+        headers = {}
+        if conditional:
+            if self.etag != None:
+                headers["If-None-Match"] = self.etag
+            if self.lastModified != None:
+                headers["If-Modified-Since"] = self.lastModified
         try:
-            data = Network.session.get(self.url)
+            data = Network.session.get(self.url, headers=headers)
+            if data.status_code == 304:
+                return None
             if data.status_code != 200:
                 raise
+            self.etag = data.headers.get("etag")
+            self.lastModified = data.headers.get("last-modified")
             return data.text
         except:
             raise Exceptions.NetworkError
 
     def updatePlaylist(self):
-        super().readPlaylist(self.getOnlinePlaylist())
\ No newline at end of file
+        text = self.getOnlinePlaylist(conditional=True)
+        if text == None:
+            return []
+        return super().updatePlaylist(text)
\ No newline at end of file
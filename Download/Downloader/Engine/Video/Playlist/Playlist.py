@@ -1,5 +1,11 @@
+from .SegmentTable import Segment, SegmentTable
+
 from Services.Twitch.Playback.PlaylistReader import PlaylistTagReader
 
+from array import array
+
+import bisect
+
 
 class Exceptions:
     class InvalidPlaylist(Exception):
@@ -7,39 +13,6 @@ class Exceptions:
             return "Invalid Playlist"
 
 
-class Segment:
-    def __init__(self, fileName, totalDurationMilliseconds, startsAt, muted, trimFromStart=None, trimFromEnd=None):
-        self.fileName = fileName
-        self.totalDurationMilliseconds = totalDurationMilliseconds
-        self.durationMilliseconds = self.totalDurationMilliseconds - (trimFromStart or 0) - (trimFromEnd or 0)
-        self.startsAt = startsAt
-        self.endsAt = self.durationMilliseconds + self.startsAt
-        self.muted = muted
-        self.trimFromStart = trimFromStart
-        self.trimFromEnd = trimFromEnd
-
-    @property
-    def trimmed(self):
-        return not (self.trimFromStart == self.trimFromEnd == None)
-
-    def getUnmutedFileName(self):
-        return self.modifyFileName("{}-unmuted")
-
-    def getMutedFileName(self):
-        return self.modifyFileName("{}-muted")
-
-    def modifyFileName(self, formatString):
-        splitted = self.fileName.rsplit(".", 1)
-        splitted[0] = formatString.format(splitted[0])
-        return ".".join(splitted)
-
-    def __str__(self):
-        return f"<Segment {self.__dict__}>"
-
-    def __repr__(self):
-        return self.__str__()
-
-
 class Playlist(PlaylistTagReader):
     class Range:
         def __init__(self):
@@ -55,71 +28,139 @@ class Playlist(PlaylistTagReader):
     def __init__(self, text=None):
         super(Playlist, self).__init__()
         self.playlist = []
-        self.segments = []
-        self.totalMilliseconds = 0
+        self.segments = SegmentTable()
+        self.tagLines = array("l")
+        self.uriLines = array("l")
+        self.lineOffset = 0
+        self.targetDuration = None
         self.timeRange = self.Range()
         if text != None:
             self.readPlaylist(text)
 
+    @property
+    def totalMilliseconds(self):
+        return self.segments.getTotalMilliseconds()
+
     @property
     def totalSeconds(self):
         return self.totalMilliseconds / 1000
 
+    @property
+    def mutedMilliseconds(self):
+        return self.segments.getMutedMilliseconds()
+
     def getSegments(self):
         return self.segments
 
     def getFileList(self):
-        return [segment.fileName for segment in self.segments]
+        return self.segments.getFileList()
+
+    def getSegmentIndex(self, fileName):
+        return self.segments.indexOf(fileName)
+
+    def getSegmentLines(self, index):
+        return self.tagLines[index] - self.lineOffset, self.uriLines[index] - self.lineOffset
+
+    def readPlaylist(self, text):
+        self.readLines(text.split("\n"))
 
-    def verifyPlaylist(self, text):
+    def readLines(self, lines):
+        playlist, rows, hasRequiredTags = self.parseLines(lines)
+        if not all(hasRequiredTags.values()):
+            raise Exceptions.InvalidPlaylist
+        self.playlist = playlist
+        self.targetDuration = self.getTargetDuration(playlist)
+        self.segments = SegmentTable()
+        self.tagLines = array("l")
+        self.uriLines = array("l")
+        self.lineOffset = 0
+        self.addRows(rows)
+
+    def updatePlaylist(self, text):
+        lines = text.split("\n")
+        if len(self.segments) != 0 and self.lineOffset == 0:
+            uriLine = self.uriLines[-1]
+            if uriLine < len(lines) and self.getSegmentFileName(lines[uriLine])[0] == self.playlist[uriLine] and self.getSegmentFileName(lines[self.uriLines[0]])[0] == self.playlist[self.uriLines[0]]:
+                playlist, rows, hasRequiredTags = self.parseLines(lines[uriLine + 1:], lineIndex=uriLine + 1)
+                if hasRequiredTags["EXT-X-ENDLIST"]:
+                    headerLine = self.tagLines[0]
+                    self.playlist[:headerLine] = lines[:headerLine]
+                    targetDuration = self.getTargetDuration(self.playlist)
+                    mutedUpdated = self.updateMutedSegments(lines)
+                    del self.playlist[uriLine + 1:]
+                    self.playlist.extend(playlist)
+                    self.addRows(rows)
+                    if mutedUpdated or targetDuration != self.targetDuration:
+                        self.targetDuration = targetDuration
+                        return None
+                    return len(rows)
+        self.readLines(lines)
+        return None
+
+    def updateMutedSegments(self, lines):
+        updated = False
+        for index, uriLine in enumerate(self.uriLines):
+            line = lines[uriLine]
+            muted = 1 if line != self.playlist[uriLine] and self.getSegmentFileName(line)[1] else 0
+            if self.segments.muted[index] != muted:
+                self.segments.muted[index] = muted
+                updated = True
+        return updated
+
+    def parseLines(self, lines, lineIndex=0):
         hasRequiredTags = {
             "EXTM3U": False,
             "EXT-X-TARGETDURATION": False,
             "EXT-X-ENDLIST": False
         }
         playlist = []
-        for line in text.split("\n"):
-            tag = self.getTag(line)
+        rows = []
+        expectSegment = None
+        tagLine = None
+        for line, tag in self.iterTags(lines):
             if tag != None:
                 if tag.name in hasRequiredTags:
                     hasRequiredTags[tag.name] = True
-            playlist.append(line)
-        if not all(hasRequiredTags.values()):
-            raise Exceptions.InvalidPlaylist
-        return playlist
-
-    def readPlaylist(self, text):
-        playlist = self.verifyPlaylist(text)
-        unmutedPlaylist = []
-        segments = []
-        expectSegment = None
-        elapsedMilliseconds = 0
-        for line in playlist:
-            tag = self.getTag(line)
-            if tag != None:
-                if tag.name == "EXTINF":
+                elif tag.name == "EXTINF":
                     try:
-                        expectSegment = int(float(tag.data[0]) * 1000)
+                        expectSegment = self.getDuration(tag)
+                        tagLine = lineIndex + len(playlist)
                     except:
                         pass
             elif expectSegment != None:
-                muted = False
-                splittedUrl = line.replace("\\", "/").rsplit("/", 1)
-                splittedFileName = splittedUrl[-1].rsplit(".", 1)
-                for key in ["-muted", "-unmuted"]:
-                    if splittedFileName[0].endswith(key):
-                        muted = True
-                        splittedFileName[0] = splittedFileName[0][:-len(key)]
-                        splittedUrl[-1] = ".".join(splittedFileName)
-                        line = "/".join(splittedUrl)
-                        break
-                segments.append(Segment(line, expectSegment, elapsedMilliseconds, muted))
-                elapsedMilliseconds += expectSegment
+                line, muted = self.getSegmentFileName(line)
+                rows.append((line, expectSegment, muted, tagLine, lineIndex + len(playlist)))
                 expectSegment = None
-            unmutedPlaylist.append(line)
-        self.playlist = unmutedPlaylist
-        self.segments = segments
-        self.totalMilliseconds = elapsedMilliseconds
+            playlist.append(line)
+        return playlist, rows, hasRequiredTags
+
+    def getTargetDuration(self, lines):
+        for line, tag in self.iterTags(lines):
+            if tag != None:
+                if tag.name == "EXT-X-TARGETDURATION":
+                    try:
+                        return float(tag.data[0])
+                    except:
+                        return None
+                elif tag.name == "EXTINF":
+                    return None
+        return None
+
+    def getSegmentFileName(self, line):
+        splittedUrl = line.replace("\\", "/").rsplit("/", 1)
+        splittedFileName = splittedUrl[-1].rsplit(".", 1)
+        for key in ["-muted", "-unmuted"]:
+            if splittedFileName[0].endswith(key):
+                splittedFileName[0] = splittedFileName[0][:-len(key)]
+                splittedUrl[-1] = ".".join(splittedFileName)
+                return "/".join(splittedUrl), True
+        return line, False
+
+    def addRows(self, rows):
+        for fileName, durationMilliseconds, muted, tagLine, uriLine in rows:
+            self.segments.append(fileName, durationMilliseconds, muted)
+            self.tagLines.append(tagLine)
+            self.uriLines.append(uriLine)
 
     def setRange(self, timeFrom=None, timeTo=None):
         if timeFrom != None and timeTo != None:
@@ -128,72 +169,44 @@ class Playlist(PlaylistTagReader):
         self.timeRange.setRange(timeFrom, timeTo)
 
     def getRangedPlaylist(self):
+        rangedPlaylist = Playlist()
+        if len(self.segments) == 0:
+            rangedPlaylist.playlist = list(self.playlist)
+            return rangedPlaylist
+        segmentFrom, segmentTo, trimFromStart, trimFromEnd = self.getRangeIndexes()
+        header = self.playlist[:self.getSegmentLines(0)[0]]
+        firstLine = self.getSegmentLines(segmentFrom)[0]
+        lastLine = self.getSegmentLines(segmentTo)[1]
+        footer = self.playlist[self.getSegmentLines(len(self.segments) - 1)[1] + 1:]
+        rangedPlaylist.playlist = header + self.playlist[firstLine:lastLine + 1] + footer
+        rangedPlaylist.segments = self.segments.slice(segmentFrom, segmentTo + 1, trimFromStart=trimFromStart or None, trimFromEnd=trimFromEnd or None)
+        rangedPlaylist.tagLines = self.tagLines[segmentFrom:segmentTo + 1]
+        rangedPlaylist.uriLines = self.uriLines[segmentFrom:segmentTo + 1]
+        rangedPlaylist.lineOffset = self.lineOffset + firstLine - len(header)
+        for index in sorted({0, len(rangedPlaylist.segments) - 1}):
+            segment = rangedPlaylist.segments[index]
+            if segment.trimmed:
+                tagLine = rangedPlaylist.getSegmentLines(index)[0]
+                tag = self.getTag(rangedPlaylist.playlist[tagLine])
+                tag.data[0] = f"{segment.durationMilliseconds / 1000:.3f}"
+                rangedPlaylist.playlist[tagLine] = tag.toString()
+        return rangedPlaylist
+
+    def getRangeIndexes(self):
         millisecondsFrom = self.timeRange.timeFrom
         millisecondsTo = self.timeRange.timeTo
-        segmentFrom = None
+        segmentFrom = 0
         trimFromStart = 0
-        segmentTo = None
+        segmentTo = len(self.segments) - 1
         trimFromEnd = 0
         if millisecondsFrom != None:
-            for index, segment in reversed(list(enumerate(self.segments))):
-                if segment.startsAt <= millisecondsFrom:
-                    segmentFrom = index
-                    trimFromStart = millisecondsFrom - segment.startsAt
-                    break
+            index = bisect.bisect_right(self.segments.startTimes, millisecondsFrom) - 1
+            if index >= 0:
+                segmentFrom = index
+                trimFromStart = millisecondsFrom - self.segments.startTimes[index]
         if millisecondsTo != None:
-            for index, segment in enumerate(self.segments):
-                if segment.endsAt >= millisecondsTo:
-                    segmentTo = index
-                    trimFromEnd = segment.endsAt - millisecondsTo
-                    break
-        rangedSegments = self.segments[segmentFrom:None if segmentTo == None else segmentTo + 1]
-        newSegments = []
-        totalMilliseconds = 0
-        for index, segment in enumerate(rangedSegments):
-            if index == 0:
-                segmentTrimFromStart = trimFromStart or None
-            else:
-                segmentTrimFromStart = None
-            if index == len(rangedSegments) - 1:
-                segmentTrimFromEnd = trimFromEnd or None
-            else:
-                segmentTrimFromEnd = None
-            newSegment = Segment(segment.fileName, segment.totalDurationMilliseconds, totalMilliseconds, segment.muted, trimFromStart=segmentTrimFromStart, trimFromEnd=segmentTrimFromEnd)
-            totalMilliseconds += newSegment.durationMilliseconds
-            newSegments.append(newSegment)
-        rangedFileList = [segment.fileName for segment in newSegments]
-        originalFileList = self.getFileList()
-        newPlaylist = []
-        segmentTag = None
-        saveLines = True
-        for line in self.playlist:
-            tag = self.getTag(line)
-            if tag != None:
-                if tag.name == "EXTINF":
-                    segmentTag = tag
-                    continue
-            if segmentTag != None:
-                if len(originalFileList) != 0:
-                    if line in rangedFileList:
-                        lineSegment = newSegments[rangedFileList.index(line)]
-                        if lineSegment.trimmed:
-                            segmentTag.data[0] = f"{lineSegment.durationMilliseconds / 1000:.3f}"
-                        newPlaylist.append(segmentTag.toString())
-                        newPlaylist.append(line)
-                        if line == rangedFileList[-1] and line != originalFileList[-1]:
-                            saveLines = False
-                        else:
-                            saveLines = True
-                    elif line == originalFileList[-1]:
-                        saveLines = True
-                    else:
-                        saveLines = False
-                    segmentTag = None
-                    continue
-            if saveLines:
-                newPlaylist.append(line)
-        rangedPlaylist = Playlist()
-        rangedPlaylist.playlist = newPlaylist
-        rangedPlaylist.segments = newSegments
-        rangedPlaylist.totalMilliseconds = totalMilliseconds
-        return rangedPlaylist
\ No newline at end of file
+            index = bisect.bisect_left(self.segments.endTimes, millisecondsTo)
+            if index < len(self.segments):
+                segmentTo = index
+                trimFromEnd = self.segments.endTimes[index] - millisecondsTo
+        return segmentFrom, segmentTo, trimFromStart, trimFromEnd
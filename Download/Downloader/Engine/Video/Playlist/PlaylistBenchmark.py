@@ -0,0 +1,57 @@
+from .Playlist import Playlist
+
+import random
+import time
+
+
+class PlaylistBenchmarkResult:
+    def __init__(self, segmentCount, rangeCount, seconds):
+        self.segmentCount = segmentCount
+        self.rangeCount = rangeCount
+        self.seconds = seconds
+
+    @property
+    def milliseconds(self):
+        return self.seconds / (self.rangeCount or 1) * 1000
+
+    def __str__(self):
+        return f"{self.segmentCount} segments: {self.milliseconds:.3f}ms per range change ({self.rangeCount} ranges, {self.seconds:.2f}s)"
+
+
+class PlaylistBenchmark:
+    def __init__(self, rangeCount=1000, targetDuration=10, seed=0):
+        self.rangeCount = rangeCount
+        self.targetDuration = targetDuration
+        self.seed = seed
+
+    def generatePlaylist(self, segmentCount):
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{self.targetDuration}",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+            "#EXT-X-MEDIA-SEQUENCE:0"
+        ]
+        for index in range(segmentCount):
+            lines.append(f"#EXTINF:{self.targetDuration}.000,")
+            lines.append(f"{index}-muted.ts" if index % 50 == 0 else f"{index}.ts")
+        lines.append("#EXT-X-ENDLIST")
+        return "\n".join(lines)
+
+    def run(self, segmentCounts=(1000, 20000, 50000)):
+        return [self.runPlaylist(segmentCount) for segmentCount in segmentCounts]
+
+    def runPlaylist(self, segmentCount):
+        playlist = Playlist(self.generatePlaylist(segmentCount))
+        generator = random.Random(self.seed)
+        ranges = [sorted((generator.randrange(playlist.totalMilliseconds), generator.randrange(playlist.totalMilliseconds))) for index in range(self.rangeCount)]
+        startedAt = time.perf_counter()
+        for timeFrom, timeTo in ranges:
+            playlist.setRange(timeFrom, timeTo)
+            playlist.getRangedPlaylist()
+        return PlaylistBenchmarkResult(segmentCount, len(ranges), time.perf_counter() - startedAt)
+
+
+if __name__ == "__main__":
+    for result in PlaylistBenchmark().run():
+        print(result)
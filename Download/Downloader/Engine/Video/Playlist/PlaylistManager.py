@@ -7,6 +7,8 @@ class PlaylistManager:
     def __init__(self, text, filePath, strictMode=False):
         self.filePath = filePath
         self.strictMode = strictMode
+        self.savedLineCount = 0
+        self.savedOffset = 0
         self.openFile()
         self.original = Playlist()
         self.readPlaylist(text)
@@ -15,10 +17,29 @@ class PlaylistManager:
         self.original.readPlaylist(text)
         self.playlistUpdated()
 
+    def updatePlaylist(self, text):
+        prevSegmentCount = len(self.getSegments())
+        appendedCount = self.original.updatePlaylist(text)
+        if appendedCount == None:
+            prevFiles = set(self.getFileList())
+            self.playlistUpdated()
+            return [segment for segment in self.getSegments() if segment.fileName not in prevFiles]
+        elif appendedCount == 0:
+            return []
+        self.ranged = self.original.getRangedPlaylist()
+        if self.original.timeRange.timeTo == None and self.savedLineCount != 0:
+            self.appendToFile()
+        else:
+            self.saveAsFile()
+        return self.getSegments()[prevSegmentCount:]
+
     def setRange(self, timeFrom=None, timeTo=None):
         self.original.setRange(timeFrom, timeTo)
         self.playlistUpdated()
 
+    def getTargetDuration(self):
+        return self.original.targetDuration
+
     def isStrictMode(self):
         return self.strictMode
 
@@ -86,15 +107,56 @@ class PlaylistManager:
                 except:
                     raise Exceptions.FileSystemError
 
+    def getSegmentLineCount(self):
+        if len(self.ranged.getSegments()) == 0:
+            return 0
+        return self.ranged.getSegmentLines(len(self.ranged.getSegments()) - 1)[1] + 1
+
     def saveAsFile(self):
+        lineCount = self.getSegmentLineCount()
         try:
             self.playlistFile.seek(0)
             self.playlistFile.truncate()
-            self.playlistFile.write("\n".join(self.ranged.playlist))
-            self.playlistFile.flush()
+            self.playlistFile.write("\n".join(self.ranged.playlist[:lineCount]))
+            self.writeFooter(lineCount)
         except:
             raise Exceptions.FileSystemError
 
+    def saveRangedPlaylistAs(self, filePath, replacements=None, start=0, stop=None):
+        segmentCount = len(self.getSegments())
+        stop = segmentCount if stop == None else stop
+        firstLine = self.ranged.getSegmentLines(start)[0]
+        header = self.ranged.playlist[:self.ranged.getSegmentLines(0)[0]]
+        footer = self.ranged.playlist[self.ranged.getSegmentLines(segmentCount - 1)[1] + 1:]
+        playlist = self.ranged.playlist[firstLine:self.ranged.getSegmentLines(stop - 1)[1] + 1]
+        for index, fileName in (replacements or {}).items():
+            if start <= index < stop:
+                playlist[self.ranged.getSegmentLines(index)[1] - firstLine] = fileName
+        playlist = header + playlist + footer
+        try:
+            with open(filePath, "w") as file:
+                file.write("\n".join(playlist))
+        except:
+            raise Exceptions.FileSystemError
+
+    def appendToFile(self):
+        lineCount = self.getSegmentLineCount()
+        try:
+            self.playlistFile.seek(self.savedOffset)
+            self.playlistFile.truncate()
+            self.playlistFile.write("".join(f"\n{line}" for line in self.ranged.playlist[self.savedLineCount:lineCount]))
+            self.writeFooter(lineCount)
+        except:
+            raise Exceptions.FileSystemError
+
+    def writeFooter(self, lineCount):
+        self.savedLineCount = lineCount
+        self.savedOffset = self.playlistFile.tell()
+        footer = self.ranged.playlist[lineCount:]
+        if len(footer) != 0:
+            self.playlistFile.write("\n" + "\n".join(footer) if lineCount != 0 else "\n".join(footer))
+        self.playlistFile.flush()
+
     def __del__(self):
         try:
             self.closeFile()
@@ -0,0 +1,139 @@
+from array import array
+
+import itertools
+
+
+class Segment:
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def fileName(self):
+        return self.table.fileNames[self.table.nameOffset + self.index]
+
+    @property
+    def totalDurationMilliseconds(self):
+        return self.table.durations[self.index]
+
+    @property
+    def durationMilliseconds(self):
+        return self.totalDurationMilliseconds - (self.trimFromStart or 0) - (self.trimFromEnd or 0)
+
+    @property
+    def startsAt(self):
+        return max(0, self.table.startTimes[self.index] - self.table.timeOffset)
+
+    @property
+    def endsAt(self):
+        return self.startsAt + self.durationMilliseconds
+
+    @property
+    def muted(self):
+        return self.table.muted[self.index] == 1
+
+    @property
+    def trimFromStart(self):
+        return self.table.trimFromStart if self.index == 0 else None
+
+    @property
+    def trimFromEnd(self):
+        return self.table.trimFromEnd if self.index == len(self.table) - 1 else None
+
+    @property
+    def trimmed(self):
+        return not (self.trimFromStart == self.trimFromEnd == None)
+
+    def getUnmutedFileName(self):
+        return self.modifyFileName("{}-unmuted")
+
+    def getMutedFileName(self):
+        return self.modifyFileName("{}-muted")
+
+    def modifyFileName(self, formatString):
+        splitted = self.fileName.rsplit(".", 1)
+        splitted[0] = formatString.format(splitted[0])
+        return ".".join(splitted)
+
+    def __str__(self):
+        return f"<Segment {dict(fileName=self.fileName, totalDurationMilliseconds=self.totalDurationMilliseconds, durationMilliseconds=self.durationMilliseconds, startsAt=self.startsAt, endsAt=self.endsAt, muted=self.muted, trimFromStart=self.trimFromStart, trimFromEnd=self.trimFromEnd)}>"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class SegmentTable:
+    def __init__(self):
+        self.fileNames = []
+        self.fileIndexes = {}
+        self.nameOffset = 0
+        self.durations = array("q")
+        self.startTimes = array("q")
+        self.endTimes = array("q")
+        self.muted = array("b")
+        self.timeOffset = 0
+        self.trimFromStart = None
+        self.trimFromEnd = None
+
+    def append(self, fileName, durationMilliseconds, muted):
+        startsAt = self.endTimes[-1] if len(self.endTimes) != 0 else 0
+        self.fileIndexes.setdefault(fileName, len(self.fileNames))
+        self.fileNames.append(fileName)
+        self.durations.append(durationMilliseconds)
+        self.startTimes.append(startsAt)
+        self.endTimes.append(startsAt + durationMilliseconds)
+        self.muted.append(1 if muted else 0)
+
+    def slice(self, start, stop, trimFromStart=None, trimFromEnd=None):
+        table = SegmentTable()
+        table.fileNames = self.fileNames
+        table.fileIndexes = self.fileIndexes
+        table.nameOffset = self.nameOffset + start
+        table.durations = self.durations[start:stop]
+        table.startTimes = self.startTimes[start:stop]
+        table.endTimes = self.endTimes[start:stop]
+        table.muted = self.muted[start:stop]
+        if len(table.startTimes) != 0:
+            table.timeOffset = table.startTimes[0] + (trimFromStart or 0)
+            table.trimFromStart = trimFromStart
+            table.trimFromEnd = trimFromEnd
+        return table
+
+    def indexOf(self, fileName):
+        index = self.fileIndexes.get(fileName)
+        if index == None:
+            return None
+        index -= self.nameOffset
+        return index if 0 <= index < len(self) else None
+
+    def getFileList(self):
+        return self.fileNames[self.nameOffset:self.nameOffset + len(self)]
+
+    def getTotalMilliseconds(self):
+        return sum(self.durations) - (self.trimFromStart or 0) - (self.trimFromEnd or 0)
+
+    def getMutedMilliseconds(self):
+        mutedMilliseconds = sum(itertools.compress(self.durations, self.muted))
+        if len(self) != 0:
+            if self.muted[0]:
+                mutedMilliseconds -= self.trimFromStart or 0
+            if self.muted[-1]:
+                mutedMilliseconds -= self.trimFromEnd or 0
+        return mutedMilliseconds
+
+    def __len__(self):
+        return len(self.durations)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Segment(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return Segment(self, index)
+
+    def __iter__(self):
+        return (Segment(self, index) for index in range(len(self)))
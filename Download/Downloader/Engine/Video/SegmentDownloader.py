@@ -2,40 +2,82 @@ from Core.GlobalExceptions import Exceptions
 from Services.NetworkRequests import Network
 from Services.Utils.Utils import Utils
 from Download.Downloader.Engine.Config import Config
+from Download.Downloader.Engine.BufferPool import BufferPool
+from Download.Downloader.Engine.DiskWriter import DiskWriter
+from Download.Downloader.Engine.Video.SegmentSpool import SpoolTarget
+from Download.Downloader.Engine.RetryPolicy import RetryPolicy, RequestError, ErrorTypes
 from Services.Task.PrioritizedTask import PrioritizedTask
 
+import time
+
+
+class SegmentVariants:
+    ORIGINAL = "original"
+    UNMUTED = "unmuted"
+    MUTED = "muted"
+
 
 class SegmentUrl:
-    def __init__(self, url, muted=False):
+    def __init__(self, url, variant=SegmentVariants.ORIGINAL):
         self.url = url
-        self.muted = muted
+        self.variant = variant
+
+    @property
+    def muted(self):
+        return self.variant == SegmentVariants.MUTED
 
 
 class SegmentDownloader(PrioritizedTask):
-    def __init__(self, url, segment, unmute, saveAs, priority=0):
+    def __init__(self, url, segment, unmute, saveAs, spool=None, bandwidthChannel=None, variantPredictor=None, attempt=0, priority=0):
         super(SegmentDownloader, self).__init__(priority=priority)
         self.url = url
         self.segment = segment
         self.unmute = unmute
         self.segmentUrls = self.getFileUrls()
         self.saveAs = saveAs
+        self.spool = spool
+        self.bandwidthChannel = bandwidthChannel
+        self.variantPredictor = variantPredictor
+        self.byteSize = 0
+        self.startedAt = None
+        self.elapsed = 0
+        self.congestionCount = 0
+        self.retryPolicy = RetryPolicy()
+        self.attempt = attempt
+        self.retryDelay = None
+        self.error = None
 
     def task(self):
-        for i in range(Config.SEGMENT_DOWNLOAD_MAX_RETRY_COUNT):
+        self.startedAt = time.monotonic()
+        if self.variantPredictor != None:
+            self.segmentUrls = self.variantPredictor.predict(self.segment, self.segmentUrls, self.unmute)
+        probeCount = 0
+        try:
+            errors = []
             for segmentUrl in self.segmentUrls:
                 try:
                     self.downloadFile(segmentUrl.url)
+                    if self.variantPredictor != None:
+                        self.variantPredictor.learn(self.segment, segmentUrl.variant, probeCount)
                     return segmentUrl
                 except Exceptions.FileSystemError:
                     raise Exceptions.FileSystemError
-                except:
-                    pass
-        raise Exceptions.NetworkError
+                except RequestError as e:
+                    probeCount += 1
+                    if e.isCongestion():
+                        self.congestionCount += 1
+                    errors.append(e)
+            self.error = RetryPolicy.getPrimaryError(errors)
+            if self.retryPolicy.shouldRetry(self.attempt, errors):
+                self.retryDelay = self.retryPolicy.getDelay(self.attempt, errors)
+            raise self.error
+        finally:
+            self.elapsed = time.monotonic() - self.startedAt
 
     def getFileUrls(self):
-        original = SegmentUrl(url=Utils.joinUrl(self.url, self.segment.fileName), muted=False)
-        unmuted = SegmentUrl(url=Utils.joinUrl(self.url, self.segment.getUnmutedFileName()), muted=False)
-        muted = SegmentUrl(url=Utils.joinUrl(self.url, self.segment.getMutedFileName()), muted=True)
+        original = SegmentUrl(url=Utils.joinUrl(self.url, self.segment.fileName), variant=SegmentVariants.ORIGINAL)
+        unmuted = SegmentUrl(url=Utils.joinUrl(self.url, self.segment.getUnmutedFileName()), variant=SegmentVariants.UNMUTED)
+        muted = SegmentUrl(url=Utils.joinUrl(self.url, self.segment.getMutedFileName()), variant=SegmentVariants.MUTED)
         if self.segment.muted:
             if not self.unmute:
                 return [unmuted, muted, original]
@@ -43,13 +85,61 @@ class SegmentDownloader(PrioritizedTask):
 
     def downloadFile(self, url):
         try:
-            response = Network.session.get(url, timeout=(10, 60))
-            if response.status_code != 200:
-                raise
-        except:
-            raise Exceptions.NetworkError
+            response = Network.session.get(url, stream=True, timeout=(10, 60))
+        except Exception as e:
+            raise RequestError.fromException(e)
+        if response.status_code != 200:
+            response.close()
+            raise RequestError.fromResponse(response)
+        try:
+            self.byteSize = self.writeResponse(response)
+        finally:
+            response.close()
+        self.checkContentLength(response, self.byteSize)
+
+    def getContentLength(self, response):
+        contentLength = response.headers.get("content-length")
+        return None if contentLength == None else int(contentLength)
+
+    def checkContentLength(self, response, byteSize):
+        contentLength = self.getContentLength(response)
+        if contentLength != None and contentLength != byteSize:
+            raise RequestError(ErrorTypes.CONNECTION)
+
+    def writeResponse(self, response):
+        if self.spool == None:
+            stream = DiskWriter.openFile(self.saveAs)
+        else:
+            stream = DiskWriter.openTarget(self.spool.filePath, SpoolTarget(self.spool, self.segment.fileName, self.getContentLength(response)))
+        byteSize = 0
         try:
-            with open(self.saveAs, "wb") as file:
-                file.write(response.content)
-        except:
-            raise Exceptions.FileSystemError
\ No newline at end of file
+            while True:
+                buffer = BufferPool.acquire()
+                try:
+                    readSize = self.readResponse(response, buffer)
+                except:
+                    BufferPool.release(buffer)
+                    raise
+                if readSize == 0:
+                    BufferPool.release(buffer)
+                    break
+                stream.write(buffer, readSize)
+                byteSize += readSize
+        finally:
+            stream.close()
+        return byteSize
+
+    def readResponse(self, response, buffer):
+        readSize = 0
+        with memoryview(buffer) as view:
+            while readSize < len(buffer):
+                try:
+                    chunkSize = response.raw.readinto(view[readSize:])
+                except Exception as e:
+                    raise RequestError.fromException(e)
+                if not chunkSize:
+                    break
+                if self.bandwidthChannel != None:
+                    self.bandwidthChannel.consume(chunkSize)
+                readSize += chunkSize
+        return readSize
\ No newline at end of file
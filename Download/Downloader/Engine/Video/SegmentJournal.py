@@ -0,0 +1,99 @@
+from Core.GlobalExceptions import Exceptions
+from Services.Threading.MutexLocker import MutexLocker
+
+import os
+import json
+
+
+class JournalEntry:
+    def __init__(self, fileName, size, variant):
+        self.fileName = fileName
+        self.size = size
+        self.variant = variant
+
+    def toDict(self):
+        return {"file": self.fileName, "size": self.size, "variant": self.variant}
+
+
+class SegmentJournal:
+    VERSION = 1
+
+    def __init__(self, filePath, url, timeRange):
+        self.filePath = filePath
+        self.url = url
+        self.timeRange = list(timeRange)
+        self.entries = {}
+        self.resumed = False
+        self._lock = MutexLocker()
+        self.load()
+        self.openFile()
+
+    def getHeader(self):
+        return {"version": self.VERSION, "url": self.url, "range": self.timeRange}
+
+    def load(self):
+        try:
+            with open(self.filePath, "r", encoding="utf-8") as file:
+                if json.loads(file.readline()) != self.getHeader():
+                    return
+                self.resumed = True
+                for line in file:
+                    try:
+                        data = json.loads(line)
+                    except:
+                        break
+                    self.entries[data["file"]] = JournalEntry(data["file"], data["size"], data["variant"])
+        except:
+            self.entries = {}
+
+    def isResumed(self):
+        return self.resumed
+
+    def openFile(self):
+        try:
+            if self.resumed:
+                self.journalFile = open(self.filePath, "a", encoding="utf-8")
+            else:
+                self.journalFile = open(self.filePath, "w", encoding="utf-8")
+                self.journalFile.write(f"{json.dumps(self.getHeader())}\n")
+                self.journalFile.flush()
+        except:
+            raise Exceptions.FileSystemError
+
+    def closeFile(self):
+        if hasattr(self, "journalFile"):
+            if not self.journalFile.closed:
+                try:
+                    self.journalFile.close()
+                except:
+                    raise Exceptions.FileSystemError
+
+    def getCompletedEntry(self, fileName, filePath, spool=None):
+        entry = self.entries.get(fileName)
+        if entry == None:
+            return None
+        try:
+            if (os.path.getsize(filePath) if spool == None else spool.getByteSize(fileName)) == entry.size:
+                return entry
+        except OSError:
+            pass
+        return None
+
+    def record(self, fileName, size, variant):
+        with self._lock:
+            entry = JournalEntry(fileName, size, variant)
+            self.entries[fileName] = entry
+            try:
+                self.journalFile.write(f"{json.dumps(entry.toDict())}\n")
+                self.journalFile.flush()
+            except:
+                raise Exceptions.FileSystemError
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __del__(self):
+        try:
+            self.closeFile()
+        except:
+            pass
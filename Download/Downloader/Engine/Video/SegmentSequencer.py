@@ -0,0 +1,169 @@
+from .SegmentSpool import SpoolEntry
+
+from Services.Utils.Utils import Utils
+from Services.Threading.MutexLocker import MutexLocker
+
+from PyQt5 import QtCore
+
+import os
+import shutil
+
+
+class SegmentSequencer(QtCore.QThread):
+    segmentWritten = QtCore.pyqtSignal(object, int)
+    segmentMissing = QtCore.pyqtSignal(object)
+
+    def __init__(self, output, bufferSize, chunkSize, removeSegments=True, parent=None):
+        super(SegmentSequencer, self).__init__(parent=parent)
+        self.output = output
+        self.bufferSize = bufferSize
+        self.chunkSize = chunkSize
+        self.removeSegments = removeSegments
+        self.segments = []
+        self.indexes = {}
+        self.completed = {}
+        self.writeIndex = 0
+        self.error = None
+        self.spoolFile = None
+        self._copyMethods = [method for name, method in (("copy_file_range", self.copyFileRange), ("sendfile", self.sendFile)) if hasattr(os, name)]
+        self._inputClosed = False
+        self._released = False
+        self._aborted = False
+        self._lock = MutexLocker()
+        self._condition = QtCore.QWaitCondition()
+
+    def addSegments(self, segments):
+        with self._lock:
+            for segment in segments:
+                if segment.fileName not in self.indexes:
+                    self.indexes[segment.fileName] = len(self.segments)
+                    self.segments.append(segment)
+            self._condition.wakeAll()
+
+    def complete(self, fileName, filePath=None):
+        with self._lock:
+            index = self.indexes.get(fileName)
+            if index != None and index >= self.writeIndex:
+                self.completed[index] = filePath
+                self._condition.wakeAll()
+
+    def waitForWindow(self, fileName, timeout=None):
+        with self._lock:
+            index = self.indexes[fileName]
+            while not self._released and index >= self.writeIndex + self.bufferSize:
+                if timeout == None:
+                    self._condition.wait(self._lock)
+                elif not self._condition.wait(self._lock, int(timeout * 1000)):
+                    return False
+            return True
+
+    def getBufferedCount(self):
+        with self._lock:
+            return len(self.completed)
+
+    def release(self):
+        with self._lock:
+            self._released = True
+            self._condition.wakeAll()
+
+    def closeInput(self):
+        with self._lock:
+            self._inputClosed = True
+            self._released = True
+            self._condition.wakeAll()
+
+    def abort(self):
+        with self._lock:
+            self._aborted = True
+            self._released = True
+            self._condition.wakeAll()
+
+    def run(self):
+        try:
+            while True:
+                with self._lock:
+                    while not self._aborted and not self._inputClosed and self.writeIndex not in self.completed:
+                        self._condition.wait(self._lock)
+                    if self._aborted or self.writeIndex >= len(self.segments):
+                        break
+                    segment = self.segments[self.writeIndex]
+                    filePath = self.completed.pop(self.writeIndex, None)
+                if filePath == None:
+                    self.segmentMissing.emit(segment)
+                else:
+                    self.segmentWritten.emit(segment, self.writeSegment(filePath))
+                with self._lock:
+                    self.writeIndex += 1
+                    self._condition.wakeAll()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.release()
+            self.closeOutput()
+
+    def writeSegment(self, source):
+        if isinstance(source, SpoolEntry):
+            return self.writeSpoolEntry(source)
+        with open(source, "rb") as file:
+            byteSize = os.fstat(file.fileno()).st_size
+            copied = self.copyNative(file, byteSize)
+            if copied < byteSize:
+                file.seek(copied)
+                shutil.copyfileobj(file, self.output, self.chunkSize)
+        if self.removeSegments:
+            try:
+                Utils.removeFile(source)
+            except:
+                pass
+        return byteSize
+
+    def writeSpoolEntry(self, entry):
+        if self.spoolFile == None:
+            self.spoolFile = open(entry.filePath, "rb")
+        copied = self.copyNative(self.spoolFile, entry.size, offset=entry.offset)
+        if copied < entry.size:
+            self.spoolFile.seek(entry.offset + copied)
+            remaining = entry.size - copied
+            while remaining != 0:
+                data = self.spoolFile.read(min(remaining, self.chunkSize))
+                if len(data) == 0:
+                    break
+                self.output.write(data)
+                remaining -= len(data)
+        return entry.size
+
+    def copyNative(self, file, byteSize, offset=0):
+        self.output.flush()
+        while len(self._copyMethods) != 0:
+            copied = 0
+            try:
+                while copied < byteSize:
+                    count = self._copyMethods[0](file.fileno(), self.output.fileno(), offset + copied, byteSize - copied)
+                    if count == 0:
+                        break
+                    copied += count
+                return copied
+            except OSError:
+                if copied != 0:
+                    return copied
+                self._copyMethods.pop(0)
+        return 0
+
+    @staticmethod
+    def copyFileRange(source, target, offset, count):
+        return os.copy_file_range(source, target, count, offset)
+
+    @staticmethod
+    def sendFile(source, target, offset, count):
+        return os.sendfile(target, source, offset, count)
+
+    def closeOutput(self):
+        try:
+            self.output.close()
+        except:
+            pass
+        if self.spoolFile != None:
+            try:
+                self.spoolFile.close()
+            except:
+                pass
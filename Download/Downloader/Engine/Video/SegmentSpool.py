@@ -0,0 +1,219 @@
+from Core.GlobalExceptions import Exceptions
+from Services.Threading.MutexLocker import MutexLocker
+
+import os
+import json
+
+
+class SpoolEntry:
+    def __init__(self, filePath, fileName, offset, size):
+        self.filePath = filePath
+        self.fileName = fileName
+        self.offset = offset
+        self.size = size
+
+    def toDict(self):
+        return {"file": self.fileName, "offset": self.offset, "size": self.size}
+
+
+class SpoolTarget:
+    def __init__(self, spool, fileName, size=None):
+        self.spool = spool
+        self.fileName = fileName
+        self.size = size
+        self.offset = None
+        self.data = bytearray() if size == None else None
+        self.written = 0
+        self.overflow = False
+
+    def write(self, data):
+        if self.size == None:
+            self.data += data
+            return
+        if self.overflow or self.written + len(data) > self.size:
+            self.overflow = True
+            return
+        if self.offset == None:
+            self.offset = self.spool.allocate(self.size)
+        try:
+            self.spool.writeAt(self.offset + self.written, data)
+        except:
+            raise Exceptions.FileSystemError
+        self.written += len(data)
+
+    def close(self):
+        if self.size == None:
+            self.spool.write(self.fileName, self.data)
+        elif not self.overflow and self.written == self.size:
+            if self.offset == None:
+                self.offset = self.spool.allocate(self.size)
+            self.spool.commit(self.fileName, self.offset, self.size)
+        else:
+            self.discard()
+
+    def discard(self):
+        if self.offset != None:
+            self.spool.release(self.offset, self.size)
+            self.offset = None
+
+
+class SegmentSpool:
+    def __init__(self, filePath, indexFilePath, preallocateSize, resume=True):
+        self.filePath = filePath
+        self.indexFilePath = indexFilePath
+        self.preallocateSize = preallocateSize
+        self.entries = {}
+        self.byteSize = 0
+        self.allocatedSize = 0
+        self.freeRegions = []
+        self._lock = MutexLocker()
+        self._writeLock = MutexLocker()
+        if resume:
+            self.load()
+        self.openFile()
+
+    def load(self):
+        try:
+            fileSize = os.path.getsize(self.filePath)
+            with open(self.indexFilePath, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        data = json.loads(line)
+                    except:
+                        break
+                    if data["offset"] + data["size"] <= fileSize:
+                        self.entries[data["file"]] = SpoolEntry(self.filePath, data["file"], data["offset"], data["size"])
+            self.byteSize = max([entry.offset + entry.size for entry in self.entries.values()], default=0)
+            self.allocatedSize = fileSize
+        except:
+            self.entries = {}
+            self.byteSize = 0
+            self.allocatedSize = 0
+
+    def openFile(self):
+        try:
+            if len(self.entries) == 0:
+                self.spoolFile = open(self.filePath, "w+b", buffering=0)
+                self.indexFile = open(self.indexFilePath, "w", encoding="utf-8")
+            else:
+                self.spoolFile = open(self.filePath, "r+b", buffering=0)
+                self.indexFile = open(self.indexFilePath, "a", encoding="utf-8")
+        except:
+            raise Exceptions.FileSystemError
+
+    def closeFile(self):
+        for file in (getattr(self, "spoolFile", None), getattr(self, "indexFile", None)):
+            if file != None and not file.closed:
+                try:
+                    file.close()
+                except:
+                    raise Exceptions.FileSystemError
+
+    def write(self, fileName, data):
+        offset = self.allocate(len(data))
+        try:
+            self.writeAt(offset, data)
+        except:
+            raise Exceptions.FileSystemError
+        return self.commit(fileName, offset, len(data))
+
+    def allocate(self, byteSize):
+        with self._lock:
+            for index, (offset, size) in enumerate(self.freeRegions):
+                if size >= byteSize:
+                    if size == byteSize:
+                        del self.freeRegions[index]
+                    else:
+                        self.freeRegions[index] = (offset + byteSize, size - byteSize)
+                    return offset
+            offset = self.byteSize
+            self.byteSize += byteSize
+            try:
+                self.preallocate(self.byteSize)
+            except:
+                raise Exceptions.FileSystemError
+            return offset
+
+    def release(self, offset, byteSize):
+        with self._lock:
+            self.freeRegions.append((offset, byteSize))
+            self.freeRegions.sort()
+            while len(self.freeRegions) != 0 and sum(self.freeRegions[-1]) == self.byteSize:
+                self.byteSize = self.freeRegions.pop()[0]
+
+    def commit(self, fileName, offset, byteSize):
+        with self._lock:
+            entry = SpoolEntry(self.filePath, fileName, offset, byteSize)
+            self.entries[fileName] = entry
+            try:
+                self.indexFile.write(f"{json.dumps(entry.toDict())}\n")
+                self.indexFile.flush()
+            except:
+                raise Exceptions.FileSystemError
+        return entry
+
+    def preallocate(self, byteSize):
+        if byteSize <= self.allocatedSize:
+            return
+        allocatedSize = -(-byteSize // self.preallocateSize) * self.preallocateSize
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(self.spoolFile.fileno(), self.allocatedSize, allocatedSize - self.allocatedSize)
+                self.allocatedSize = allocatedSize
+                return
+            except OSError:
+                pass
+        with self._writeLock:
+            self.spoolFile.truncate(allocatedSize)
+        self.allocatedSize = allocatedSize
+
+    def writeAt(self, offset, data):
+        if hasattr(os, "pwrite"):
+            view = memoryview(data)
+            written = 0
+            while written < len(view):
+                written += os.pwrite(self.spoolFile.fileno(), view[written:], offset + written)
+        else:
+            with self._writeLock:
+                self.spoolFile.seek(offset)
+                self.spoolFile.write(data)
+
+    def getEntry(self, fileName):
+        with self._lock:
+            return self.entries.get(fileName)
+
+    def getByteSize(self, fileName):
+        entry = self.getEntry(fileName)
+        return None if entry == None else entry.size
+
+    def getPlaylistLines(self, fileName):
+        entry = self.getEntry(fileName)
+        if entry == None:
+            return None
+        return f"#EXT-X-BYTERANGE:{entry.size}@{entry.offset}\n{os.path.basename(self.filePath)}"
+
+    def extract(self, fileName, saveAs):
+        entry = self.getEntry(fileName)
+        if entry == None:
+            raise Exceptions.FileSystemError
+        try:
+            with open(self.filePath, "rb") as source, open(saveAs, "wb") as target:
+                source.seek(entry.offset)
+                remaining = entry.size
+                while remaining != 0:
+                    data = source.read(min(remaining, 1024 ** 2))
+                    if len(data) == 0:
+                        break
+                    target.write(data)
+                    remaining -= len(data)
+        except:
+            raise Exceptions.FileSystemError
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __del__(self):
+        try:
+            self.closeFile()
+        except:
+            pass
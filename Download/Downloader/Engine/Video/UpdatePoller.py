@@ -0,0 +1,49 @@
+from Download.Downloader.Engine.Config import Config
+
+
+class UpdatePoller:
+    def __init__(self, minInterval=Config.UPDATE_TRACK_MIN_INTERVAL, maxInterval=Config.UPDATE_TRACK_DURATION, backoffFactor=Config.UPDATE_TRACK_BACKOFF_FACTOR, maxIdleTime=Config.UPDATE_TRACK_MAX_RETRY_COUNT * Config.UPDATE_TRACK_DURATION):
+        self.minInterval = minInterval
+        self.maxInterval = maxInterval
+        self.backoffFactor = backoffFactor
+        self.maxIdleTime = maxIdleTime
+        self.targetDuration = None
+        self.interval = maxInterval
+        self.idleTime = 0
+
+    def clampInterval(self, interval):
+        return min(max(interval, self.minInterval), self.maxInterval)
+
+    def setTargetDuration(self, targetDuration):
+        self.targetDuration = targetDuration
+
+    def getBaseInterval(self):
+        return self.clampInterval(self.maxInterval if self.targetDuration == None else self.targetDuration)
+
+    def reset(self):
+        self.interval = self.getBaseInterval()
+        self.idleTime = 0
+
+    def updateFound(self, newMilliseconds):
+        self.idleTime = 0
+        self.interval = self.clampInterval(max(self.getBaseInterval(), newMilliseconds / 1000))
+
+    def updateNotFound(self):
+        self.idleTime += self.interval
+        self.interval = self.clampInterval(self.interval * self.backoffFactor)
+
+    def expire(self):
+        self.idleTime = self.maxIdleTime
+
+    def isExpired(self):
+        return self.idleTime >= self.maxIdleTime
+
+    def getRemainingPollCount(self):
+        idleTime = self.idleTime
+        interval = self.interval
+        count = 0
+        while idleTime < self.maxIdleTime:
+            idleTime += interval
+            interval = self.clampInterval(interval * self.backoffFactor)
+            count += 1
+        return count
@@ -0,0 +1,53 @@
+from Services.Threading.MutexLocker import MutexLocker
+
+import bisect
+
+
+class VariantPredictor:
+    def __init__(self, mutedFiles=None):
+        self.mutedFiles = mutedFiles or set()
+        self.observations = {
+            False: ([], []),
+            True: ([], [])
+        }
+        self.hits = 0
+        self.misses = 0
+        self.probeCount = 0
+        self._lock = MutexLocker()
+
+    def isMuted(self, segment):
+        return segment.muted or segment.fileName in self.mutedFiles
+
+    def predict(self, segment, segmentUrls, unmute=False):
+        variant = self.getNearestVariant(segment)
+        if variant == None:
+            return segmentUrls
+        return sorted(segmentUrls, key=lambda segmentUrl: (unmute and segmentUrl.muted, segmentUrl.variant != variant))
+
+    def getNearestVariant(self, segment):
+        with self._lock:
+            startTimes, variants = self.observations[self.isMuted(segment)]
+            index = bisect.bisect_left(startTimes, segment.startsAt)
+            neighbors = [i for i in (index - 1, index) if 0 <= i < len(startTimes)]
+            if len(neighbors) == 0:
+                return None
+            return variants[min(neighbors, key=lambda i: abs(startTimes[i] - segment.startsAt))]
+
+    def learn(self, segment, variant, probeCount):
+        with self._lock:
+            startTimes, variants = self.observations[self.isMuted(segment)]
+            index = bisect.bisect_left(startTimes, segment.startsAt)
+            if index < len(startTimes) and startTimes[index] == segment.startsAt:
+                variants[index] = variant
+            else:
+                startTimes.insert(index, segment.startsAt)
+                variants.insert(index, variant)
+            if probeCount == 0:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.probeCount += probeCount
+
+    def getStats(self):
+        with self._lock:
+            return self.hits, self.misses, self.probeCount
@@ -1,18 +1,32 @@
 from Download.Downloader.Engine.Video.Playlist.OnlinePlaylistManager import OnlinePlaylistManager
-from .SegmentDownloader import SegmentDownloader
+from .SegmentDownloader import SegmentDownloader, SegmentVariants
+from .SegmentJournal import SegmentJournal
+from .SegmentSequencer import SegmentSequencer
+from .SegmentSpool import SegmentSpool
+from .ConcurrencyController import ConcurrencyController
+from .VariantPredictor import VariantPredictor
+from .UpdatePoller import UpdatePoller
 
 from Download.Downloader.Engine.Setup import EngineSetup
 from Download.Downloader.Engine.ThreadPool import ThreadPool
 from Download.Downloader.Engine.Config import Config
+from Download.Downloader.Engine.RetryPolicy import RequestError
 
 from Core.GlobalExceptions import Exceptions
 from Services.Utils.Utils import Utils
 from Services.Temp.TempManager import TempManager
 from Services.Task.TaskManager import TaskManager
+from Services.Threading.MutexLocker import MutexLocker
+from Services.Threading.WorkerThread import WorkerThread
+from Services.Twitch.Gql import TwitchGqlAPI
+from Services.Twitch.Playback import TwitchPlaybackAccessTokens
 from Download.Downloader.FFmpeg.FFmpeg import FFmpeg
 
 import math
+import os
 import time
+import json
+import hashlib
 
 
 class VideoDownloader(EngineSetup):
@@ -20,24 +34,59 @@ class VideoDownloader(EngineSetup):
         super(VideoDownloader, self).__init__(downloadInfo, parent=parent)
         self.FFmpeg = FFmpeg(parent=self)
         self.taskManager = TaskManager(ThreadPool, parent=self)
+        self.pipeline = None
+        self.spool = None
+        self.concurrencyController = None
+        self.variantPredictor = None
+        self.updatePoller = UpdatePoller()
+        self.deferredTasks = []
+        self.retriedFiles = set()
+        self.deferredLock = MutexLocker()
+        self.chunkEncoders = []
+        self.chunkMilliseconds = []
+        self.chunkLock = MutexLocker()
 
     def download(self):
         try:
             self.setupSegmentDownload()
+            if self.isPipelineEnabled():
+                self.startPipeline()
             self.downloadSegments()
             self.encode()
-            self.removeTempFiles()
+            if self.status.terminateState.isProcessing():
+                self.keepTempFiles()
+            else:
+                self.removeTempFiles()
         except Exception as e:
-            self.removeTempFiles()
+            self.stopPipeline()
+            self.keepTempFiles()
             raise e
 
+    def getResumeKey(self):
+        url = self.setup.downloadInfo.getUrl().split("?", 1)[0]
+        return hashlib.sha1(json.dumps([url, self.setup.downloadInfo.getAbsoluteFileName(), self.setup.downloadInfo.range]).encode()).hexdigest()[:16]
+
     def setupSegmentDownload(self):
         try:
-            self.tempDirectory = TempManager.createTempDirectory(self.setup.downloadInfo.directory)
+            self.tempDirectory = TempManager.createTempDirectory(self.setup.downloadInfo.directory, name=self.getResumeKey())
             self.logger.info(f"Temp Directory: {self.tempDirectory.name}")
+            self.journal = SegmentJournal(
+                filePath=Utils.joinPath(self.tempDirectory.name, f"{Config.JOURNAL_FILE_NAME}.journal"),
+                url=self.setup.downloadInfo.getUrl().split("?", 1)[0],
+                timeRange=self.setup.downloadInfo.range
+            )
+            if Config.SEGMENT_SPOOL_ENABLED:
+                self.spool = SegmentSpool(
+                    filePath=Utils.joinPath(self.tempDirectory.name, f"{Config.SEGMENT_SPOOL_FILE_NAME}.ts"),
+                    indexFilePath=Utils.joinPath(self.tempDirectory.name, f"{Config.SEGMENT_SPOOL_FILE_NAME}.index"),
+                    preallocateSize=Config.SEGMENT_SPOOL_PREALLOCATE_SIZE,
+                    resume=self.journal.isResumed()
+                )
         except Exception as e:
             self.logger.exception(e)
             raise Exceptions.FileSystemError
+        if self.journal.isResumed():
+            self.logger.info(f"Resuming from journal: {len(self.journal)} segments recorded")
         self.playlistManager = OnlinePlaylistManager(
             url=self.setup.downloadInfo.getUrl(),
             filePath=Utils.joinPath(self.tempDirectory.name, f"{Config.PLAYLIST_FILE_NAME}.m3u8"),
@@ -45,6 +94,27 @@ class VideoDownloader(EngineSetup):
         )
         self.playlistManager.setRange(*self.setup.downloadInfo.range)
         self.syncPlaylistProgress()
+        self.variantPredictor = VariantPredictor(self.getMutedFiles())
+        self.updatePoller.setTargetDuration(self.playlistManager.getTargetDuration())
+        self.updatePoller.reset()
+
+    def getMutedFiles(self):
+        accessToken = self.setup.downloadInfo.accessToken
+        if not isinstance(accessToken, TwitchPlaybackAccessTokens.TwitchVideo):
+            return set()
+        try:
+            mutedSegments = TwitchGqlAPI.TwitchGqlAPI().getVideoMuteInfo(accessToken.VIDEO_ID)
+        except Exception as e:
+            self.logger.warning(f"Unable to get mute info: {e}")
+            return set()
+        mutedFiles = set()
+        for segment in self.playlistManager.original.getSegments():
+            for mutedSegment in mutedSegments:
+                if mutedSegment.startsAt < segment.endsAt and segment.startsAt < mutedSegment.endsAt:
+                    mutedFiles.add(segment.fileName)
+                    break
+        self.logger.info(f"Muted Segments: {len(mutedFiles)} from mute info")
+        return mutedFiles
 
     def syncPlaylistProgress(self):
         self.progress.totalFiles = len(self.playlistManager.getSegments())
@@ -55,42 +125,129 @@ class VideoDownloader(EngineSetup):
 
     def downloadSegments(self):
         url = self.setup.downloadInfo.getUrl().rsplit("/", 1)[0]
-        processedFiles = []
+        processedFiles = set()
+        segments = self.playlistManager.getSegments()
         with self.actionLock:
             self.taskManager.taskCompleteSignal.connect(self.segmentDownloadComplete)
             self.taskManager.ifPaused.connect(self.taskPaused)
+            if ThreadPool.isAdaptiveConcurrencyEnabled():
+                self.concurrencyController = ConcurrencyController(self.taskManager, self.logger)
             self.taskManager.start()
         while self.status.terminateState.isFalse():
             self.status.setDownloading()
             self.syncStatus()
             self.logger.info("Downloading Segments...")
-            for segment in self.playlistManager.getSegments():
+            restoredFiles = 0
+            if self.pipeline != None:
+                self.pipeline.addSegments(segments)
+            for segment in segments:
                 if segment.fileName not in processedFiles:
-                    processedFiles.append(segment.fileName)
-                    self.taskManager.add(
-                        SegmentDownloader(
-                            url=url,
-                            segment=segment,
-                            unmute=self.setup.unmuteVideo,
-                            saveAs=Utils.joinPath(self.tempDirectory.name, segment.fileName),
-                            priority=self.setup.priority + 1 if self.status.isUpdateFound() else self.setup.priority
-                        )
-                    )
+                    processedFiles.add(segment.fileName)
+                    saveAs = Utils.joinPath(self.tempDirectory.name, segment.fileName)
+                    journalEntry = self.journal.getCompletedEntry(segment.fileName, saveAs, spool=self.spool)
+                    if journalEntry == None:
+                        if self.pipeline != None:
+                            self.waitForPipelineWindow(segment.fileName)
+                        self.taskManager.add(self.createSegmentTask(url, segment, saveAs))
+                    else:
+                        restoredFiles += 1
+                        self.segmentRestored(segment, journalEntry, saveAs)
+            if restoredFiles != 0:
+                self.logger.info(f"Restored {restoredFiles} segments from journal.")
             self.taskManager.waitForDone()
+            while self.waitForDeferredTasks():
+                self.taskManager.waitForDone()
             if not (self.setup.updateTrack and self.setup.downloadInfo.range[1] == None):
                 break
             if self.status.terminateState.isProcessing() or self.status.isDownloadSkipped():
                 break
-            if not self.getUpdates():
+            segments = self.getUpdates()
+            if len(segments) == 0:
                 break
+        hits, misses, probeCount = self.variantPredictor.getStats()
+        self.logger.info(f"[Variant] Prediction hits: {hits}, misses: {misses}, failed probes: {probeCount}")
+        self.logDiskWriterStats(self.tempDirectory.name)
+
+    def createSegmentTask(self, url, segment, saveAs, attempt=0):
+        return SegmentDownloader(
+            url=url,
+            segment=segment,
+            unmute=self.setup.unmuteVideo,
+            saveAs=saveAs,
+            spool=self.spool,
+            bandwidthChannel=self.bandwidthChannel,
+            variantPredictor=self.variantPredictor,
+            attempt=attempt,
+            priority=self.setup.priority + 1 if self.status.isUpdateFound() else self.setup.priority
+        )
+
+    def waitForPipelineWindow(self, fileName):
+        while not self.pipeline.waitForWindow(fileName, timeout=Config.PIPELINE_WINDOW_CHECK_INTERVAL):
+            if self.status.terminateState.isProcessing() or self.status.isDownloadSkipped():
+                break
+            if self.taskManager.isDone():
+                self.retryDeferredTasks()
+
+    def deferTask(self, task):
+        if task.retryDelay != None:
+            retryAt = time.monotonic() + task.retryDelay
+        elif task.segment.fileName in self.retriedFiles:
+            return False
+        elif not isinstance(task.result.error, RequestError) or not task.result.error.isDeferrable():
+            return False
+        else:
+            retryAt = None
+        with self.deferredLock:
+            self.deferredTasks.append((task, retryAt))
+        if retryAt == None:
+            self.logger.warning(f"Deferred segment: {task.segment.fileName} [{task.result.error}]")
+        else:
+            self.logger.info(f"Retrying segment in {task.retryDelay:.1f}s: {task.segment.fileName} [{task.result.error}]")
+        return True
+
+    def retryDeferredTasks(self, drained=True):
+        now = time.monotonic()
+        tasks = []
+        with self.deferredLock:
+            deferredTasks = []
+            for task, retryAt in self.deferredTasks:
+                if (drained if retryAt == None else retryAt <= now):
+                    tasks.append((task, retryAt))
+                else:
+                    deferredTasks.append((task, retryAt))
+            self.deferredTasks = deferredTasks
+        if len(tasks) == 0:
+            return False
+        deferredCount = sum(1 for task, retryAt in tasks if retryAt == None)
+        if deferredCount != 0:
+            self.logger.info(f"Retrying {deferredCount} deferred segments...")
+        for task, retryAt in tasks:
+            if retryAt == None:
+                self.retriedFiles.add(task.segment.fileName)
+                self.taskManager.add(self.createSegmentTask(task.url, task.segment, task.saveAs))
+            else:
+                self.taskManager.add(self.createSegmentTask(task.url, task.segment, task.saveAs, attempt=task.attempt + 1))
+        return True
+
+    def waitForDeferredTasks(self):
+        while self.status.terminateState.isFalse() and not self.status.isDownloadSkipped():
+            if self.retryDeferredTasks():
+                return True
+            with self.deferredLock:
+                if len(self.deferredTasks) == 0:
+                    return False
+            self.msleep(100)
+        return False
 
     def getUpdates(self):
         self.status.setWaitingCount(0)
-        while self.status.getWaitingCount() < Config.UPDATE_TRACK_MAX_RETRY_COUNT:
+        self.updatePoller.setTargetDuration(self.playlistManager.getTargetDuration())
+        while not self.updatePoller.isExpired():
             self.status.setWaiting()
             self.status.setWaitingCount(self.status.getWaitingCount() + 1)
-            self.logger.info(f"Waiting for Updates... {self.status.getWaitingCount()}/{Config.UPDATE_TRACK_MAX_RETRY_COUNT}")
-            waitEnd = time.time() + Config.UPDATE_TRACK_DURATION
+            self.status.setMaxWaitingCount(self.status.getWaitingCount() + self.updatePoller.getRemainingPollCount() - 1)
+            self.logger.info(f"Waiting for Updates... {self.status.getWaitingCount()}/{self.status.getMaxWaitingCount()} ({self.updatePoller.interval:.1f}s)")
+            waitEnd = time.time() + self.updatePoller.interval
             while True:
                 prevWaiting = self.status.getWaitingTime()
                 self.status.setWaitingTime(math.ceil(waitEnd - time.time()))
@@ -100,7 +257,7 @@ class VideoDownloader(EngineSetup):
                     break
                 if self.status.isWaitingSkipped():
                     self.status.setSkipWaiting(False)
-                    self.status.setWaitingCount(Config.UPDATE_TRACK_MAX_RETRY_COUNT)
+                    self.updatePoller.expire()
                     break
                 self.msleep(200)
             self.status.setWaitingTime(None)
@@ -108,91 +265,445 @@ class VideoDownloader(EngineSetup):
             self.syncStatus()
             if self.status.terminateState.isProcessing() or self.status.isDownloadSkipped():
                 break
-            prevFiles = self.playlistManager.getFileList()
             try:
                 self.logger.info("Updating Playlist...")
-                self.playlistManager.updatePlaylist()
+                newSegments = self.playlistManager.updatePlaylist()
                 self.syncPlaylistProgress()
                 if self.status.terminateState.isProcessing() or self.status.isDownloadSkipped():
                     break
-                if prevFiles == self.playlistManager.getFileList():
+                if len(newSegments) == 0:
                     self.logger.info("Update Not Found")
                 else:
-                    self.logger.info("Update Found")
+                    self.logger.info(f"Update Found: {len(newSegments)} segments")
                     self.status.setUpdateFound()
-                    return True
+                    self.updatePoller.updateFound(sum(segment.durationMilliseconds for segment in newSegments))
+                    return newSegments
             except:
                 pass
-        return False
+            self.updatePoller.updateNotFound()
+        return []
+
+    def segmentRestored(self, segment, journalEntry, saveAs):
+        if self.setup.unmuteVideo and journalEntry.variant == SegmentVariants.MUTED:
+            self.progress.mutedFiles += 1
+            self.progress.mutedMilliseconds += segment.durationMilliseconds
+        if self.pipeline != None:
+            self.pipeline.complete(segment.fileName, self.getSegmentSource(segment.fileName, saveAs))
+        self.progress.file += 1
+        self.syncProgress()
 
     def segmentDownloadComplete(self, task):
+        if self.concurrencyController != None:
+            self.concurrencyController.addSample(task)
         if task.result.success:
+            try:
+                self.journal.record(task.segment.fileName, task.byteSize, task.result.data.variant)
+            except Exception as e:
+                self.logger.exception(e)
             if self.setup.unmuteVideo and task.result.data.muted:
                 self.logger.warning(f"Failed to unmute segment: {task.segment.fileName}")
                 self.progress.mutedFiles += 1
                 self.progress.mutedMilliseconds += task.segment.durationMilliseconds
         else:
+            if self.deferTask(task):
+                self.retryDeferredTasks(drained=False)
+                return
             urls = "\n".join(segmentUrl.url for segmentUrl in task.segmentUrls)
             self.logger.warning(f"Failed to download segment: {task.segment.fileName} [{task.result.error}]\n{urls}")
             if isinstance(task.result.error, Exceptions.FileSystemError):
                 self.abort(task.result.error)
                 return
+        if self.pipeline != None:
+            self.pipeline.complete(task.segment.fileName, self.getSegmentSource(task.segment.fileName, task.saveAs) if task.result.success else None)
         self.progress.file += 1
         self.syncProgress()
+        self.retryDeferredTasks(drained=False)
 
-    def encode(self):
+    def getSegmentSource(self, fileName, saveAs):
+        return saveAs if self.spool == None else self.spool.getEntry(fileName)
+
+    def isSegmentAvailable(self, segment):
+        if self.spool == None:
+            return os.path.isfile(Utils.joinPath(self.tempDirectory.name, segment.fileName))
+        return self.spool.getEntry(segment.fileName) != None
+
+    def getSegmentFilePath(self, segment):
+        filePath = Utils.joinPath(self.tempDirectory.name, segment.fileName)
+        if self.spool != None:
+            self.spool.extract(segment.fileName, filePath)
+        return filePath
+
+    def getSpoolReplacements(self):
+        if self.spool == None:
+            return {}
+        replacements = {}
+        for index, segment in enumerate(self.playlistManager.getSegments()):
+            lines = self.spool.getPlaylistLines(segment.fileName)
+            if lines != None:
+                replacements[index] = lines
+        return replacements
+
+    def getEncodingPlaylistPath(self):
+        if self.spool == None:
+            return self.playlistManager.filePath
+        playlistFilePath = Utils.joinPath(self.tempDirectory.name, f"{Config.SEGMENT_SPOOL_FILE_NAME}.m3u8")
+        self.playlistManager.saveRangedPlaylistAs(playlistFilePath, self.getSpoolReplacements())
+        return playlistFilePath
+
+    def isPipelineEnabled(self):
+        return not self.setup.downloadInfo.isClippingModeEnabled() and not self.isParallelEncodeAvailable()
+
+    def isNativeConcatEnabled(self):
+        return self.setup.downloadInfo.fileFormat == "ts" and len(self.setup.downloadInfo.getAdditionalFormats()) == 0
+
+    def startPipeline(self):
+        if not self.isNativeConcatEnabled() and not self.waitForEncodeJob():
+            return
         with self.actionLock:
             if self.status.terminateState.isProcessing():
+                self.releaseEncodeJob()
                 return
-            self.status.setEncoding()
-            self.syncStatus()
-            self.logger.info("Encoding...")
-            trimFrom, trimTo = self.playlistManager.getTrimRange()
-            self.FFmpeg.startEncodingProcess(
-                target=self.playlistManager.filePath,
-                saveAs=self.setup.downloadInfo.getAbsoluteFileName(),
-                trimFrom=None if trimFrom == None else trimFrom / 1000,
-                trimTo=None if trimTo == None else trimTo / 1000,
-                remux=not self.setup.downloadInfo.isClippingModeEnabled()
+            if self.isNativeConcatEnabled():
+                self.logger.info("Starting Native Concatenation Pipeline...")
+                try:
+                    output = open(self.setup.downloadInfo.getAbsoluteFileName(), "wb", buffering=0)
+                except Exception as e:
+                    self.logger.exception(e)
+                    raise Exceptions.FileSystemError
+                self.pipelineOutputReader = None
+            else:
+                self.logger.info("Starting Encoding Pipeline...")
+                self.FFmpeg.startEncodingProcess(
+                    target=FFmpeg.PIPE_INPUT,
+                    saveAs=self.setup.downloadInfo.getAbsoluteFileName(),
+                    remux=True,
+                    inputFormat="mpegts",
+                    profile=self.setup.encodeProfile,
+                    additionalOutputs=self.setup.downloadInfo.getAdditionalAbsoluteFileNames(),
+                    fragmented=Config.FRAGMENTED_MP4_ENABLED,
+                    priority=self.getEncodingPriority()
+                )
+                output = self.FFmpeg.getInputPipe()
+                self.pipelineOutputReader = WorkerThread(target=self.readPipelineOutput)
+            self.pipeline = SegmentSequencer(
+                output=output,
+                bufferSize=Config.PIPELINE_REORDER_BUFFER_SIZE,
+                chunkSize=Config.PIPELINE_CHUNK_SIZE,
+                removeSegments=False
             )
-        processingFile = None
+            self.pipeline.segmentMissing.connect(self.pipelineSegmentMissing)
+            if self.pipelineOutputReader == None:
+                self.pipeline.segmentWritten.connect(self.pipelineSegmentWritten)
+            self.pipeline.start()
+            if self.pipelineOutputReader != None:
+                self.pipelineOutputReader.start()
+
+    def readPipelineOutput(self):
+        try:
+            for progress in self.FFmpeg.output(logger=self.logger):
+                self.updateEncodingProgress(progress)
+        except Exception as e:
+            if self.status.terminateState.isFalse():
+                self.abort(e)
+
+    def pipelineSegmentWritten(self, segment, byteSize):
+        self.progress.milliseconds += segment.durationMilliseconds
+        self.progress.byteSize += byteSize
+        self.progress.totalByteSize = self.progress.byteSize
+        self.syncProgress()
+
+    def pipelineSegmentMissing(self, segment):
+        self.progress.missingFiles += 1
+        self.progress.missingMilliseconds += segment.durationMilliseconds
+        self.syncProgress()
+
+    def finishPipeline(self):
+        with self.actionLock:
+            if not self.status.terminateState.isProcessing():
+                self.status.setEncoding()
+                self.syncStatus()
+                self.logger.info("Finishing Encoding Pipeline...")
+            self.pipeline.closeInput()
+        self.pipeline.wait()
+        if self.pipelineOutputReader != None:
+            self.pipelineOutputReader.wait()
+        self.releaseEncodeJob()
+        if self.pipeline.error != None and self.status.terminateState.isFalse():
+            self.logger.exception(self.pipeline.error)
+            raise Exceptions.FileSystemError
+
+    def stopPipeline(self):
+        if self.pipeline != None:
+            self.pipeline.abort()
+            if self.FFmpeg.process != None:
+                self.FFmpeg.kill()
+            self.pipeline.wait()
+            if self.pipelineOutputReader != None:
+                self.pipelineOutputReader.wait()
+        self.releaseEncodeJob()
+
+    def encode(self):
+        if self.pipeline != None:
+            self.finishPipeline()
+            return
+        if self.status.terminateState.isProcessing() or not self.waitForEncodeJob():
+            return
+        try:
+            if self.isSmartCutAvailable():
+                self.smartCut()
+                return
+            chunks = self.getEncodeChunks()
+            if len(chunks) > 1:
+                self.encodeChunks(chunks)
+                return
+            with self.actionLock:
+                if self.status.terminateState.isProcessing():
+                    return
+                self.status.setEncoding()
+                self.syncStatus()
+                self.logger.info("Encoding...")
+                trimFrom, trimTo = self.playlistManager.getTrimRange()
+                self.FFmpeg.startEncodingProcess(
+                    target=self.getEncodingPlaylistPath(),
+                    saveAs=self.setup.downloadInfo.getAbsoluteFileName(),
+                    trimFrom=None if trimFrom == None else trimFrom / 1000,
+                    trimTo=None if trimTo == None else trimTo / 1000,
+                    remux=not self.setup.downloadInfo.isClippingModeEnabled(),
+                    profile=self.setup.encodeProfile,
+                    additionalOutputs=self.setup.downloadInfo.getAdditionalAbsoluteFileNames(),
+                    priority=self.getEncodingPriority()
+                )
+            self.readEncodingOutput()
+        finally:
+            self.releaseEncodeJob()
+
+    def readEncodingOutput(self):
         for progress in self.FFmpeg.output(logger=self.logger):
-            file = progress.get("file")
-            if file != None:
-                if processingFile != None:
-                    self.removeFile(processingFile)
-                processingFile = file
             missing = progress.get("missing")
             if missing != None:
                 self.progress.missingFiles += 1
                 self.progress.missingMilliseconds += self.playlistManager.getSegments()[missing].durationMilliseconds
-            time = progress.get("time")
-            if time != None:
-                self.progress.milliseconds = Utils.toSeconds(*time.split(".")[0].split(":")) * 1000 + int(time.split(".")[1][:3])
-            size = progress.get("size") or progress.get("Lsize")
-            if size != None:
-                self.progress.totalByteSize = Utils.getByteSize(size)
-                self.progress.byteSize = self.progress.totalByteSize
-            self.syncProgress()
-
-    def removeFile(self, fileName):
+            self.updateEncodingProgress(progress)
+
+    def isReencodeRequired(self):
+        return self.setup.downloadInfo.isClippingModeEnabled() or self.setup.downloadInfo.fileFormat == "mp3"
+
+    def getEncodeChunkCount(self):
+        return min(Config.PARALLEL_ENCODE_MAX_PROCESS_COUNT, len(self.playlistManager.getSegments()), int(self.playlistManager.totalSeconds // Config.PARALLEL_ENCODE_MIN_CHUNK_DURATION))
+
+    def isParallelEncodeAvailable(self):
+        return Config.PARALLEL_ENCODE_ENABLED and self.isReencodeRequired() and self.getEncodeChunkCount() >= 2
+
+    def getEncodeChunks(self):
+        if not self.isParallelEncodeAvailable():
+            return []
+        segments = self.playlistManager.getSegments()
+        chunkCount = 1 + self.acquireExtraEncodeJobs(self.getEncodeChunkCount() - 1)
+        if chunkCount < 2:
+            return []
+        chunkMilliseconds = self.playlistManager.totalMilliseconds / chunkCount
+        chunks = []
+        start = 0
+        milliseconds = 0
+        for index, segment in enumerate(segments):
+            milliseconds += segment.durationMilliseconds
+            if milliseconds >= chunkMilliseconds * (len(chunks) + 1) and index + 1 < len(segments):
+                chunks.append((start, index + 1))
+                start = index + 1
+        chunks.append((start, len(segments)))
+        return chunks
+
+    def encodeChunks(self, chunks):
+        segments = self.playlistManager.getSegments()
+        replacements = self.getSpoolReplacements()
+        fileFormat = self.setup.downloadInfo.fileFormat if self.setup.downloadInfo.fileFormat in ("aac", "mp3") else "ts"
+        threadCount = max(1, Config.PARALLEL_ENCODE_MAX_PROCESS_COUNT // len(chunks))
+        chunkFiles = []
+        workers = []
+        with self.actionLock:
+            if self.status.terminateState.isProcessing():
+                return
+            self.status.setEncoding()
+            self.syncStatus()
+            self.logger.info(f"Encoding in {len(chunks)} chunks...")
+            self.chunkMilliseconds = [0] * len(chunks)
+            for chunkIndex, (start, stop) in enumerate(chunks):
+                playlistFilePath = Utils.joinPath(self.tempDirectory.name, f"{Config.PARALLEL_ENCODE_FILE_PREFIX}{chunkIndex}.m3u8")
+                self.playlistManager.saveRangedPlaylistAs(playlistFilePath, replacements, start=start, stop=stop)
+                trimFrom = segments[start].trimFromStart
+                trimTo = None if segments[stop - 1].trimFromEnd == None else (trimFrom or 0) + sum(segments[index].durationMilliseconds for index in range(start, stop))
+                chunkFile = f"{Config.PARALLEL_ENCODE_FILE_PREFIX}{chunkIndex}.{fileFormat}"
+                chunkFiles.append(chunkFile)
+                encoder = FFmpeg()
+                encoder.startEncodingProcess(
+                    target=playlistFilePath,
+                    saveAs=Utils.joinPath(self.tempDirectory.name, chunkFile),
+                    trimFrom=None if trimFrom == None else trimFrom / 1000,
+                    trimTo=None if trimTo == None else trimTo / 1000,
+                    remux=False,
+                    threadCount=threadCount,
+                    profile=self.setup.encodeProfile,
+                    priority=self.getEncodingPriority()
+                )
+                self.chunkEncoders.append(encoder)
+                worker = WorkerThread(target=self.readChunkOutput, args=(chunkIndex, start, encoder))
+                worker.start()
+                workers.append(worker)
+        for worker in workers:
+            worker.wait()
+        self.chunkEncoders = []
+        if self.status.terminateState.isProcessing():
+            return
+        for worker in workers:
+            if not worker.result.success:
+                raise worker.result.error
+        listFilePath = Utils.joinPath(self.tempDirectory.name, f"{Config.PARALLEL_ENCODE_FILE_PREFIX}list.txt")
+        try:
+            with open(listFilePath, "w", encoding="utf-8") as file:
+                file.write("".join(f"file '{chunkFile}'\n" for chunkFile in chunkFiles))
+        except:
+            raise Exceptions.FileSystemError
+        with self.actionLock:
+            if self.status.terminateState.isProcessing():
+                return
+            self.logger.info("Concatenating chunks...")
+            self.FFmpeg.startConcatProcess(
+                target=listFilePath,
+                saveAs=self.setup.downloadInfo.getAbsoluteFileName(),
+                profile=self.setup.encodeProfile,
+                additionalOutputs=self.setup.downloadInfo.getAdditionalAbsoluteFileNames(),
+                sourceAudioCodec=FFmpeg.getAudioCodec(fileFormat),
+                priority=self.getEncodingPriority()
+            )
+        for progress in self.FFmpeg.output(logger=self.logger):
+            byteSize = progress.get("byteSize")
+            if byteSize != None:
+                self.progress.byteSize = byteSize
+                self.progress.totalByteSize = byteSize
+                self.syncProgress()
+
+    def readChunkOutput(self, chunkIndex, start, encoder):
         try:
-            Utils.removeFile(fileName)
+            for progress in encoder.output(logger=self.logger):
+                with self.chunkLock:
+                    missing = progress.get("missing")
+                    if missing != None:
+                        self.progress.missingFiles += 1
+                        self.progress.missingMilliseconds += self.playlistManager.getSegments()[start + missing].durationMilliseconds
+                    milliseconds = progress.get("milliseconds")
+                    if milliseconds != None:
+                        self.chunkMilliseconds[chunkIndex] = milliseconds
+                        self.progress.milliseconds = sum(self.chunkMilliseconds)
+                    self.syncProgress()
         except:
-            pass
+            for chunkEncoder in self.chunkEncoders:
+                chunkEncoder.kill()
+            raise
 
-    def removeTempFiles(self):
-        self.logger.info("Cleaning up...")
+    def getBoundarySegmentIndexes(self):
+        segments = self.playlistManager.getSegments()
+        return [index for index in sorted({0, len(segments) - 1}) if segments[index].trimmed]
+
+    def isSmartCutAvailable(self):
+        if not Config.SMART_CUT_ENABLED or not self.setup.downloadInfo.isClippingModeEnabled():
+            return False
+        if self.setup.downloadInfo.fileFormat in ("aac", "mp3") or len(self.playlistManager.getSegments()) == 0:
+            return False
+        segments = self.playlistManager.getSegments()
+        return all(self.isSegmentAvailable(segments[index]) for index in self.getBoundarySegmentIndexes())
+
+    def smartCut(self):
+        segments = self.playlistManager.getSegments()
+        replacements = self.getSpoolReplacements()
+        for index in self.getBoundarySegmentIndexes():
+            segment = segments[index]
+            fileName = f"{Config.SMART_CUT_FILE_PREFIX}{index}.ts"
+            with self.actionLock:
+                if self.status.terminateState.isProcessing():
+                    return
+                self.status.setEncoding()
+                self.syncStatus()
+                self.logger.info(f"Encoding boundary segment: {segment.fileName}")
+                self.FFmpeg.startSegmentEncodingProcess(
+                    target=self.getSegmentFilePath(segment),
+                    saveAs=Utils.joinPath(self.tempDirectory.name, fileName),
+                    trimFrom=None if segment.trimFromStart == None else segment.trimFromStart / 1000,
+                    duration=None if segment.trimFromEnd == None else segment.durationMilliseconds / 1000,
+                    profile=self.setup.encodeProfile,
+                    priority=self.getEncodingPriority()
+                )
+            for progress in self.FFmpeg.output(logger=self.logger):
+                pass
+            replacements[index] = fileName
+        playlistFilePath = Utils.joinPath(self.tempDirectory.name, f"{Config.SMART_CUT_FILE_PREFIX}{Config.PLAYLIST_FILE_NAME}.m3u8")
+        self.playlistManager.saveRangedPlaylistAs(playlistFilePath, replacements)
+        with self.actionLock:
+            if self.status.terminateState.isProcessing():
+                return
+            self.logger.info("Encoding...")
+            self.FFmpeg.startEncodingProcess(
+                target=playlistFilePath,
+                saveAs=self.setup.downloadInfo.getAbsoluteFileName(),
+                remux=True,
+                profile=self.setup.encodeProfile,
+                additionalOutputs=self.setup.downloadInfo.getAdditionalAbsoluteFileNames(),
+                priority=self.getEncodingPriority()
+            )
+        self.readEncodingOutput()
+
+    def updateEncodingProgress(self, progress):
+        milliseconds = progress.get("milliseconds")
+        if milliseconds != None:
+            self.progress.milliseconds = milliseconds
+        byteSize = progress.get("byteSize")
+        if byteSize != None:
+            self.progress.totalByteSize = byteSize
+            self.progress.byteSize = byteSize
+        self.syncProgress()
+
+    def closeTempFiles(self):
         try:
             if hasattr(self, "playlistManager"):
                 self.playlistManager.closeFile()
         except Exception as e:
             self.logger.exception(e)
+        try:
+            if hasattr(self, "journal"):
+                self.journal.closeFile()
+        except Exception as e:
+            self.logger.exception(e)
+        try:
+            if self.spool != None:
+                self.spool.closeFile()
+        except Exception as e:
+            self.logger.exception(e)
+
+    def removeTempFiles(self):
+        self.logger.info("Cleaning up...")
+        self.closeTempFiles()
         try:
             self.tempDirectory.cleanup()
         except Exception as e:
             self.logger.exception(e)
 
+    def keepTempFiles(self):
+        if not hasattr(self, "journal"):
+            self.removeTempFiles()
+            return
+        self.closeTempFiles()
+        if self.tempDirectory.getSize() > Config.RESUMABLE_TEMP_MAX_SIZE:
+            self.logger.info("Temp files are too large to keep for resume. Cleaning up...")
+            try:
+                self.tempDirectory.cleanup()
+            except Exception as e:
+                self.logger.exception(e)
+            return
+        self.logger.info("Keeping temp files for resume.")
+        try:
+            self.tempDirectory.keep(Config.RESUMABLE_TEMP_EXPIRY)
+        except Exception as e:
+            self.logger.exception(e)
+
     def cancel(self):
         with self.actionLock:
             if self.isRunning() and not self.status.isDone() and self.status.terminateState.isFalse():
@@ -200,8 +711,13 @@ class VideoDownloader(EngineSetup):
                 self.status.terminateState.setProcessing()
                 self.syncStatus()
                 self.taskManager.stop()
+                self.cancelEncodeJob()
+                if self.pipeline != None:
+                    self.pipeline.abort()
                 if self.FFmpeg.process != None:
                     self.FFmpeg.kill()
+                for encoder in self.chunkEncoders:
+                    encoder.kill()
 
     def pause(self):
         if self.status.pauseState.isFalse():
@@ -233,4 +749,6 @@ class VideoDownloader(EngineSetup):
             self.status.setDownloadSkip()
             self.syncStatus()
             with self.actionLock:
-                self.taskManager.stop()
\ No newline at end of file
+                self.taskManager.stop()
+                if self.pipeline != None:
+                    self.pipeline.release()
\ No newline at end of file
@@ -1,7 +1,17 @@
 from Core.Config import Config as CoreConfig, _P
 
+import os
+
 
 class Config:
     PATH = _P(CoreConfig.DEPENDENCIES_ROOT, "ffmpeg.exe")
 
-    KILL_TIMEOUT = 10
\ No newline at end of file
+    KILL_TIMEOUT = 10
+
+    PROGRESS_UPDATE_INTERVAL = 0.5
+
+    FRAGMENTED_MP4_FLAGS = "+frag_keyframe+empty_moov+default_base_moof"
+
+    MAX_ENCODE_JOB_COUNT = max(1, min((os.cpu_count() or 1) // 2, 4))
+    MAX_DISK_ENCODE_JOB_COUNT = 2
+    RESERVED_CPU_COUNT = 1
\ No newline at end of file
@@ -0,0 +1,69 @@
+from .FFmpeg import FFmpeg
+from .EncodeProfile import EncodeProfiles
+
+from Services.Utils.SystemUtils import SystemUtils
+
+import os
+import tempfile
+import time
+
+
+class EncodeBenchmarkResult:
+    def __init__(self, profile, frames, seconds, byteSize):
+        self.profile = profile
+        self.frames = frames
+        self.seconds = seconds
+        self.byteSize = byteSize
+
+    @property
+    def fps(self):
+        return self.frames / (self.seconds or 1)
+
+    def __str__(self):
+        return f"{self.profile.name}: {self.fps:.1f} fps, {SystemUtils.formatByteSize(self.byteSize)} ({self.seconds:.2f}s)"
+
+
+class EncodeBenchmark:
+    def __init__(self, duration=10, resolution="1920x1080", frameRate=60):
+        self.duration = duration
+        self.resolution = resolution
+        self.frameRate = frameRate
+
+    def getInputParams(self):
+        return (
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size={self.resolution}:rate={self.frameRate}",
+            "-f",
+            "lavfi",
+            "-i",
+            "sine=frequency=440:sample_rate=48000",
+            "-t",
+            str(self.duration)
+        )
+
+    def run(self, profiles=None):
+        with tempfile.TemporaryDirectory() as directory:
+            return [self.runProfile(profile, os.path.join(directory, f"{profile.name}.mp4")) for profile in profiles or EncodeProfiles.getProfiles()]
+
+    def runProfile(self, profile, saveAs):
+        encoder = FFmpeg()
+        startedAt = time.monotonic()
+        encoder.start(
+            [
+                *self.getInputParams(),
+                *encoder.getCodecParams(fileName=saveAs, remux=False, profile=profile),
+                *encoder.getThreadParams(remux=False, profile=profile),
+                saveAs
+            ],
+            logLevel=FFmpeg.LogLevel.ERROR
+        )
+        for progress in encoder.output():
+            pass
+        return EncodeBenchmarkResult(profile, self.duration * self.frameRate, time.monotonic() - startedAt, os.path.getsize(saveAs))
+
+
+if __name__ == "__main__":
+    for result in EncodeBenchmark().run():
+        print(result)
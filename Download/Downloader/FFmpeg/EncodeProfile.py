@@ -0,0 +1,48 @@
+class EncodeProfile:
+    def __init__(self, name, preset, crf, audioBitrate, tune=None, threadCount=None):
+        self.name = name
+        self.preset = preset
+        self.crf = crf
+        self.audioBitrate = audioBitrate
+        self.tune = tune
+        self.threadCount = threadCount
+
+    def getVideoCodecParams(self):
+        return (
+            "-preset",
+            self.preset,
+            "-crf",
+            str(self.crf),
+            *(() if self.tune == None else ("-tune", self.tune))
+        )
+
+    def getAudioCodecParams(self):
+        return ("-b:a", self.audioBitrate)
+
+    def getThreadParams(self):
+        return () if self.threadCount == None else ("-threads", str(self.threadCount))
+
+    def __str__(self):
+        return f"<EncodeProfile {self.__dict__}>"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class EncodeProfiles:
+    FAST = EncodeProfile("fast", preset="veryfast", crf=23, audioBitrate="128k", tune="fastdecode")
+    BALANCED = EncodeProfile("balanced", preset="fast", crf=21, audioBitrate="160k")
+    ARCHIVAL = EncodeProfile("archival", preset="slow", crf=18, audioBitrate="256k")
+
+    DEFAULT = BALANCED
+
+    @classmethod
+    def getProfiles(cls):
+        return [cls.FAST, cls.BALANCED, cls.ARCHIVAL]
+
+    @classmethod
+    def getProfile(cls, name):
+        for profile in cls.getProfiles():
+            if profile.name == name:
+                return profile
+        return cls.DEFAULT
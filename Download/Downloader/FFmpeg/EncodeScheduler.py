@@ -0,0 +1,127 @@
+from .Config import Config
+
+from Services.Threading.MutexLocker import MutexLocker
+
+from PyQt5 import QtCore
+
+import os
+
+
+class EncodeJob:
+    def __init__(self, scheduler, disk, priority, order):
+        self.scheduler = scheduler
+        self.disk = disk
+        self.priority = priority
+        self.order = order
+        self.running = False
+        self.cancelled = False
+
+    def wait(self):
+        return self.scheduler.waitForJob(self)
+
+    def cancel(self):
+        self.scheduler.cancelJob(self)
+
+    def release(self):
+        self.scheduler.releaseJob(self)
+
+    def getQueuePosition(self):
+        return self.scheduler.getQueuePosition(self)
+
+
+class _EncodeScheduler:
+    def __init__(self):
+        self.maxJobCount = Config.MAX_ENCODE_JOB_COUNT
+        self.maxDiskJobCount = Config.MAX_DISK_ENCODE_JOB_COUNT
+        self.queuedJobs = []
+        self.runningJobs = []
+        self._order = 0
+        self._lock = MutexLocker()
+        self._condition = QtCore.QWaitCondition()
+
+    def setMaxJobCount(self, maxJobCount, maxDiskJobCount=None):
+        with self._lock:
+            self.maxJobCount = max(1, maxJobCount)
+            if maxDiskJobCount != None:
+                self.maxDiskJobCount = max(1, maxDiskJobCount)
+            self._condition.wakeAll()
+
+    def createJob(self, filePath, priority=0):
+        with self._lock:
+            self._order += 1
+            job = EncodeJob(self, self.getDisk(filePath), priority, self._order)
+            self.queuedJobs.append(job)
+            return job
+
+    def acquireJobs(self, filePath, priority=0, count=1):
+        with self._lock:
+            disk = self.getDisk(filePath)
+            jobs = []
+            while len(jobs) < count and len(self.getStartableJobs()) == 0 and self.canStartJob(disk):
+                self._order += 1
+                job = EncodeJob(self, disk, priority, self._order)
+                job.running = True
+                self.runningJobs.append(job)
+                jobs.append(job)
+            return jobs
+
+    def canStartJob(self, disk):
+        return len(self.runningJobs) < self.maxJobCount and sum(1 for job in self.runningJobs if job.disk == disk) < self.maxDiskJobCount
+
+    @staticmethod
+    def getDisk(filePath):
+        directory = os.path.dirname(os.path.abspath(filePath))
+        try:
+            return os.stat(directory).st_dev
+        except OSError:
+            return os.path.splitdrive(directory)[0]
+
+    def getStartableJobs(self):
+        jobCount = len(self.runningJobs)
+        diskJobCounts = {}
+        for job in self.runningJobs:
+            diskJobCounts[job.disk] = diskJobCounts.get(job.disk, 0) + 1
+        startableJobs = []
+        for job in sorted(self.queuedJobs, key=lambda job: (-job.priority, job.order)):
+            if jobCount >= self.maxJobCount:
+                break
+            if diskJobCounts.get(job.disk, 0) >= self.maxDiskJobCount:
+                continue
+            startableJobs.append(job)
+            jobCount += 1
+            diskJobCounts[job.disk] = diskJobCounts.get(job.disk, 0) + 1
+        return startableJobs
+
+    def waitForJob(self, job):
+        with self._lock:
+            while not job.cancelled and job not in self.getStartableJobs():
+                self._condition.wait(self._lock)
+            if job in self.queuedJobs:
+                self.queuedJobs.remove(job)
+            if job.cancelled:
+                self._condition.wakeAll()
+                return False
+            job.running = True
+            self.runningJobs.append(job)
+            return True
+
+    def cancelJob(self, job):
+        with self._lock:
+            job.cancelled = True
+            self._condition.wakeAll()
+
+    def releaseJob(self, job):
+        with self._lock:
+            if job in self.queuedJobs:
+                self.queuedJobs.remove(job)
+            if job in self.runningJobs:
+                self.runningJobs.remove(job)
+            job.running = False
+            self._condition.wakeAll()
+
+    def getQueuePosition(self, job):
+        with self._lock:
+            queuedJobs = sorted(self.queuedJobs, key=lambda job: (-job.priority, job.order))
+            return queuedJobs.index(job) + 1 if job in queuedJobs else 0
+
+EncodeScheduler = _EncodeScheduler()
@@ -5,6 +5,8 @@ from Services.Threading.WorkerThread import WorkerThread
 
 from PyQt5 import QtCore
 
+import os
+import shutil
 import subprocess
 
 
@@ -22,67 +24,212 @@ class FFmpeg(QtCore.QObject):
 
 
     class Priority:
-        IDLE = subprocess.IDLE_PRIORITY_CLASS
-        BELOW_NORMAL = subprocess.BELOW_NORMAL_PRIORITY_CLASS
-        NORMAL = subprocess.NORMAL_PRIORITY_CLASS
-        ABOVE_NORMAL = subprocess.ABOVE_NORMAL_PRIORITY_CLASS
-        HIGH = subprocess.HIGH_PRIORITY_CLASS
-        REALTIME = subprocess.REALTIME_PRIORITY_CLASS
+        IDLE = "idle"
+        BELOW_NORMAL = "belowNormal"
+        NORMAL = "normal"
+        ABOVE_NORMAL = "aboveNormal"
+        HIGH = "high"
+        REALTIME = "realtime"
 
+        WINDOWS_PRIORITY_CLASSES = {
+            IDLE: "IDLE_PRIORITY_CLASS",
+            BELOW_NORMAL: "BELOW_NORMAL_PRIORITY_CLASS",
+            NORMAL: "NORMAL_PRIORITY_CLASS",
+            ABOVE_NORMAL: "ABOVE_NORMAL_PRIORITY_CLASS",
+            HIGH: "HIGH_PRIORITY_CLASS",
+            REALTIME: "REALTIME_PRIORITY_CLASS"
+        }
+        NICE_VALUES = {
+            IDLE: 19,
+            BELOW_NORMAL: 10,
+            NORMAL: 0,
+            ABOVE_NORMAL: -5,
+            HIGH: -10,
+            REALTIME: -20
+        }
+        IONICE_PARAMS = {
+            IDLE: ("-c", "3"),
+            BELOW_NORMAL: ("-c", "2", "-n", "7"),
+            ABOVE_NORMAL: ("-c", "2", "-n", "2"),
+            HIGH: ("-c", "2", "-n", "0"),
+            REALTIME: ("-c", "2", "-n", "0")
+        }
+
+        @classmethod
+        def isBackground(cls, priority):
+            return priority in (cls.IDLE, cls.BELOW_NORMAL)
+
+
+    PIPE_INPUT = "pipe:0"
+    PIPE_PROGRESS = "pipe:1"
 
     def __init__(self, parent=None):
         super(FFmpeg, self).__init__(parent=parent)
         self.process = None
+        self.pipeInput = False
 
-    def startEncodingProcess(self, target, saveAs, trimFrom=None, trimTo=None, remux=True, logLevel=LogLevel.INFO, priority=Priority.NORMAL):
+    def startEncodingProcess(self, target, saveAs, trimFrom=None, trimTo=None, remux=True, inputFormat=None, profile=None, threadCount=None, additionalOutputs=(), fragmented=False, logLevel=LogLevel.INFO, priority=Priority.NORMAL):
+        self.pipeInput = target == self.PIPE_INPUT
         self.start(
             [
                 *(() if trimFrom == None else ("-ss", str(trimFrom))),
                 *(() if trimTo == None else ("-to", str(trimTo))),
+                *(() if inputFormat == None else ("-f", inputFormat)),
+                "-i",
+                target,
+                *self.getCodecParams(fileName=saveAs, remux=remux, profile=profile),
+                *self.getThreadParams(remux=remux, profile=profile, threadCount=threadCount),
+                *self.getFormatParams(fileName=saveAs, fragmented=fragmented),
+                saveAs,
+                *self.getAdditionalOutputParams(additionalOutputs, remux=remux, profile=profile)
+            ],
+            logLevel=logLevel,
+            priority=priority
+        )
+
+    def startSegmentEncodingProcess(self, target, saveAs, trimFrom=None, duration=None, profile=None, logLevel=LogLevel.INFO, priority=Priority.NORMAL):
+        self.pipeInput = False
+        self.start(
+            [
+                *(() if trimFrom == None else ("-ss", str(trimFrom))),
+                *(() if duration == None else ("-t", str(duration))),
                 "-i",
                 target,
-                *self.getCodecParams(fileName=saveAs, remux=remux),
+                "-copyts",
+                *self.getCodecParams(fileName=saveAs, remux=False, profile=profile),
+                *self.getThreadParams(remux=False, profile=profile),
+                "-muxdelay",
+                "0",
+                "-muxpreload",
+                "0",
                 saveAs
             ],
             logLevel=logLevel,
             priority=priority
         )
 
-    def getCodecParams(self, fileName, remux):
+    def startConcatProcess(self, target, saveAs, profile=None, additionalOutputs=(), sourceAudioCodec="aac", logLevel=LogLevel.INFO, priority=Priority.NORMAL):
+        self.pipeInput = False
+        self.start(
+            [
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                target,
+                "-c",
+                "copy",
+                saveAs,
+                *self.getAdditionalOutputParams(additionalOutputs, remux=True, profile=profile, sourceAudioCodec=sourceAudioCodec)
+            ],
+            logLevel=logLevel,
+            priority=priority
+        )
+
+    def getAdditionalOutputParams(self, fileNames, remux, profile=None, sourceAudioCodec="aac"):
+        params = []
+        for fileName in fileNames:
+            if self.isAudioOnlyFormat(fileName.rsplit(".", 1)[-1]):
+                params.append("-vn")
+            params.extend(self.getCodecParams(fileName=fileName, remux=remux, profile=profile, sourceAudioCodec=sourceAudioCodec))
+            params.append(fileName)
+        return params
+
+    def getFormatParams(self, fileName, fragmented=False):
+        if fragmented and self.isFragmentableFormat(fileName.rsplit(".", 1)[-1]):
+            return ("-movflags", Config.FRAGMENTED_MP4_FLAGS, "-flush_packets", "1")
+        return ()
+
+    @staticmethod
+    def isFragmentableFormat(fileFormat):
+        return fileFormat == "mp4"
+
+    @staticmethod
+    def isAudioOnlyFormat(fileFormat):
+        return fileFormat in ["aac", "mp3"]
+
+    def getCodecParams(self, fileName, remux, profile=None, sourceAudioCodec="aac"):
         fileFormat = fileName.rsplit(".", 1)[-1]
-        isAudioOnly = fileFormat in ["aac", "mp3"]
-        audioCodec = self.getAudioCodecParams(fileFormat, remux=remux)
-        return audioCodec if isAudioOnly else (*self.getVideoCodecParams(fileFormat, remux=remux), *audioCodec)
+        isAudioOnly = self.isAudioOnlyFormat(fileFormat)
+        audioCodec = self.getAudioCodecParams(fileFormat, remux=remux, profile=profile, sourceAudioCodec=sourceAudioCodec)
+        return audioCodec if isAudioOnly else (*self.getVideoCodecParams(fileFormat, remux=remux, profile=profile), *audioCodec)
+
+    def getVideoCodecParams(self, fileFormat, remux, profile=None):
+        if remux:
+            return ("-c:v", "copy")
+        return ("-c:v", "libx264", *(() if profile == None else profile.getVideoCodecParams()))
+
+    def getAudioCodecParams(self, fileFormat, remux, profile=None, sourceAudioCodec="aac"):
+        if remux and self.getAudioCodec(fileFormat) == sourceAudioCodec:
+            return ("-c:a", "copy")
+        return ("-c:a", "libmp3lame" if fileFormat == "mp3" else "aac", *(() if profile == None else profile.getAudioCodecParams()))
 
-    def getVideoCodecParams(self, fileFormat, remux):
-        return ("-c:v", "copy") if remux else ("-c:v", "libx264")
+    @staticmethod
+    def getAudioCodec(fileFormat):
+        return "mp3" if fileFormat == "mp3" else "aac"
 
-    def getAudioCodecParams(self, fileFormat, remux):
-        return ("-c:a", "libmp3lame") if fileFormat == "mp3" else (("-c:a", "copy") if remux else ("-c:a", "aac"))
+    def getThreadParams(self, remux, profile=None, threadCount=None):
+        if threadCount != None:
+            return ("-threads", str(threadCount))
+        if remux or profile == None:
+            return ()
+        return profile.getThreadParams()
 
     def start(self, params, logLevel=LogLevel.INFO, priority=Priority.NORMAL):
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        launcher, processOptions = self.getProcessOptions(priority)
         self.process = subprocess.Popen(
             [
+                *launcher,
                 Config.PATH,
                 "-y",
                 "-hide_banner",
                 "-loglevel",
                 logLevel,
-                "-stats",
+                "-nostats",
+                "-progress",
+                self.PIPE_PROGRESS,
                 *params
             ],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
+            stderr=subprocess.PIPE,
             universal_newlines=True,
             encoding="utf-8",
-            startupinfo=startupinfo,
-            creationflags=priority
+            **processOptions
         )
         self.process.notResponding = False
 
+    def getProcessOptions(self, priority):
+        if os.name == "nt":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            return (), {"startupinfo": startupinfo, "creationflags": getattr(subprocess, self.Priority.WINDOWS_PRIORITY_CLASSES[priority])}
+        else:
+            return self.getPosixLauncher(priority), {}
+
+    def getPosixLauncher(self, priority):
+        launcher = []
+        affinity = self.getAffinity(priority)
+        if affinity != None and shutil.which("taskset") != None:
+            launcher.extend(("taskset", "-c", ",".join(map(str, affinity))))
+        if priority in self.Priority.IONICE_PARAMS and shutil.which("ionice") != None:
+            launcher.extend(("ionice", *self.Priority.IONICE_PARAMS[priority]))
+        if self.Priority.NICE_VALUES[priority] != 0 and shutil.which("nice") != None:
+            launcher.extend(("nice", "-n", str(self.Priority.NICE_VALUES[priority])))
+        return launcher
+
+    def getAffinity(self, priority):
+        if not self.Priority.isBackground(priority) or not hasattr(os, "sched_getaffinity"):
+            return None
+        cpus = sorted(os.sched_getaffinity(0))
+        if len(cpus) <= Config.RESERVED_CPU_COUNT + 1:
+            return None
+        return cpus[Config.RESERVED_CPU_COUNT:]
+
+    def getInputPipe(self):
+        return self.process.stdin.buffer
+
     def output(self, logger=None):
         return FFmpegOutputReader(self.process, logger).reader()
 
@@ -99,7 +246,14 @@ class FFmpeg(QtCore.QObject):
 
     def _killProcess(self):
         try:
-            self.process.communicate(input="q", timeout=Config.KILL_TIMEOUT)
+            if self.pipeInput:
+                try:
+                    self.process.stdin.close()
+                except:
+                    pass
+                self.process.wait(timeout=Config.KILL_TIMEOUT)
+            else:
+                self.process.communicate(input="q", timeout=Config.KILL_TIMEOUT)
         except:
             self.process.notResponding = True
             try:
@@ -1,12 +1,15 @@
 from .Exceptions import Exceptions
+from .Config import Config
 
+from Services.Threading.WorkerThread import WorkerThread
+
+import queue
 import re
+import time
 
 
 class ProgressMessages:
-    file = re.compile("\[.* @ .*\] Opening \'(.*)\' for reading")
     missing = re.compile("\[.* @ .*\] Failed to open segment (\d*) of playlist .*")
-    encoding = re.compile(".*size=.*time=.*bitrate=.*speed=.*")
 
 
 
@@ -15,41 +18,90 @@ class ExceptionMessages:
     permission = "Permission denied"
 
 
+class ProgressKeys:
+    TIME = "out_time_us"
+    SIZE = "total_size"
+    SPEED = "speed"
+    PROGRESS = "progress"
+    END = "end"
+
+
 class FFmpegOutputReader:
     def __init__(self, process, logger=None):
         self.process = process
         self.logger = logger
+        self.lastLine = ""
+        self.events = queue.SimpleQueue()
 
     def reader(self):
-        return self._read() if self.logger == None else self._readWithLogs()
-
-    def _read(self):
-        line = ""
+        logReader = WorkerThread(target=self._readLogs)
+        logReader.start()
         try:
-            for line in self.process.stdout:
-                progressData = self.getProgressData(line)
-                if progressData != None:
+            lastUpdate = None
+            pendingProgress = None
+            for progressData in self._readProgress():
+                yield from self.getEvents()
+                isEnd = progressData.pop(ProgressKeys.END, False)
+                if isEnd or lastUpdate == None or time.monotonic() - lastUpdate >= Config.PROGRESS_UPDATE_INTERVAL:
+                    lastUpdate = time.monotonic()
+                    pendingProgress = None
                     yield progressData
-        except:
-            pass
-        self.checkError(self.process.wait(), line)
+                else:
+                    pendingProgress = progressData
+            logReader.wait()
+            yield from self.getEvents()
+            if pendingProgress != None:
+                yield pendingProgress
+        finally:
+            logReader.wait()
+        returnCode = self.process.wait()
+        if self.logger != None:
+            if self.process.notResponding:
+                self.logger.info("Subprocess was unresponsive and forced to terminate.")
+            self.logger.info(f"Subprocess ended with exit code {returnCode}.")
+        self.checkError(returnCode, self.lastLine)
 
-    def _readWithLogs(self):
-        line = ""
+    def _readProgress(self):
+        progressData = {}
         try:
             for line in self.process.stdout:
-                self.logger.debug(line.strip("\n"))
-                progressData = self.getProgressData(line)
-                if progressData != None:
+                key, separator, value = line.strip().partition("=")
+                if separator == "":
+                    continue
+                if key == ProgressKeys.PROGRESS:
+                    progressData[ProgressKeys.END] = value == ProgressKeys.END
                     yield progressData
+                    progressData = {}
+                else:
+                    self.setProgressValue(progressData, key, value)
         except Exception as e:
-            self.logger.error("Unable to read output properly.")
-            self.logger.exception(e)
-        returnCode = self.process.wait()
-        if self.process.notResponding:
-            self.logger.info("Subprocess was unresponsive and forced to terminate.")
-        self.logger.info(f"Subprocess ended with exit code {returnCode}.")
-        self.checkError(returnCode, line)
+            if self.logger != None:
+                self.logger.error("Unable to read progress properly.")
+                self.logger.exception(e)
+
+    def _readLogs(self):
+        try:
+            for line in self.process.stderr:
+                line = line.rstrip("\n")
+                if line == "":
+                    continue
+                self.lastLine = line
+                if self.logger != None:
+                    self.logger.debug(line)
+                logData = self.getLogData(line)
+                if logData != None:
+                    self.events.put(logData)
+        except Exception as e:
+            if self.logger != None:
+                self.logger.error("Unable to read output properly.")
+                self.logger.exception(e)
+
+    def getEvents(self):
+        while True:
+            try:
+                yield self.events.get_nowait()
+            except queue.Empty:
+                return
 
     def checkError(self, returnCode, line):
         if returnCode == 0:
@@ -59,40 +111,27 @@ class FFmpegOutputReader:
             raise Exceptions.FileSystemError
         raise Exceptions.UnexpectedError(returnCode, line)
 
-    def getProgressData(self, line):
-        return self.getFileData(line) or self.getMissingData(line) or self.getEncodingData(line)
+    def setProgressValue(self, progressData, key, value):
+        try:
+            if key == ProgressKeys.TIME:
+                progressData["milliseconds"] = max(0, int(value) // 1000)
+            elif key == ProgressKeys.SIZE:
+                progressData["byteSize"] = int(value)
+            elif key == ProgressKeys.SPEED:
+                progressData["speed"] = float(value.rstrip("x"))
+        except ValueError:
+            pass
 
-    def getFileData(self, line):
-        checkFile = re.search(ProgressMessages.file, line)
-        if checkFile == None:
+    def getLogData(self, line):
+        if not line.startswith("["):
             return None
-        else:
-            return {"file": checkFile.group(1)}
+        return self.getMissingData(line)
 
     def getMissingData(self, line):
+        if " Failed to open segment " not in line:
+            return None
         checkMissing = re.search(ProgressMessages.missing, line)
         if checkMissing == None:
             return None
         else:
             return {"missing": int(checkMissing.group(1))}
-
-    def getEncodingData(self, line):
-        checkEncoding = re.search(ProgressMessages.encoding, line)
-        if checkEncoding == None:
-            return None
-        progressData = {}
-        previousKey = None
-        for data in map(str.strip, line.split()):
-            if "=" in data:
-                if data.endswith("="):
-                    previousKey = data.split("=", 1)[0]
-                    progressData[previousKey] = ""
-                else:
-                    key, value = data.split("=", 1)
-                    progressData[key] = value
-                    previousKey = None
-            else:
-                if previousKey != None:
-                    progressData[previousKey] = data
-                    previousKey = None
-        return progressData
\ No newline at end of file
@@ -0,0 +1,98 @@
+from .OutputReader import FFmpegOutputReader
+
+import sys
+import time
+
+
+class ReplayProcess:
+    def __init__(self, progressLines, logLines):
+        self.stdout = iter(progressLines)
+        self.stderr = iter(logLines)
+        self.notResponding = False
+
+    def wait(self):
+        return 0
+
+
+class ProgressBenchmarkResult:
+    def __init__(self, name, lineCount, progressCount, missingCount, seconds):
+        self.name = name
+        self.lineCount = lineCount
+        self.progressCount = progressCount
+        self.missingCount = missingCount
+        self.seconds = seconds
+
+    @property
+    def linesPerSecond(self):
+        return self.lineCount / (self.seconds or 1)
+
+    def __str__(self):
+        return f"{self.name}: {self.linesPerSecond / 1000:.0f}k lines/s, {self.progressCount} progress updates, {self.missingCount} missing segments ({self.seconds * 1000:.1f}ms)"
+
+
+class ProgressBenchmark:
+    def __init__(self, hours=4, segmentSeconds=10, progressInterval=0.5, speed=5):
+        self.hours = hours
+        self.segmentSeconds = segmentSeconds
+        self.progressInterval = progressInterval
+        self.speed = speed
+
+    def generateProgressLines(self):
+        totalSeconds = self.hours * 3600
+        blockCount = int(totalSeconds / self.speed / self.progressInterval) or 1
+        lines = []
+        for index in range(1, blockCount + 1):
+            outTime = totalSeconds * index // blockCount
+            lines.extend((
+                f"frame={outTime * 60}\n",
+                "fps=0.00\n",
+                "stream_0_0_q=-1.0\n",
+                "bitrate=6000.0kbits/s\n",
+                f"total_size={outTime * 750000}\n",
+                f"out_time_us={outTime * 1000000}\n",
+                f"out_time_ms={outTime * 1000000}\n",
+                f"out_time={outTime // 3600:02}:{outTime // 60 % 60:02}:{outTime % 60:02}.000000\n",
+                "dup_frames=0\n",
+                "drop_frames=0\n",
+                f"speed={self.speed}x\n",
+                f"progress={'end' if index == blockCount else 'continue'}\n"
+            ))
+        return lines
+
+    def generateLogLines(self):
+        segmentCount = self.hours * 3600 // self.segmentSeconds
+        lines = []
+        for index in range(segmentCount):
+            if index % 500 == 499:
+                lines.append(f"[hls @ 0000020c1d7a4f40] Failed to open segment {index} of playlist 0\n")
+            else:
+                lines.append(f"[hls @ 0000020c1d7a4f40] Opening '{index}.ts' for reading\n")
+            if index % 100 == 0:
+                lines.append("[mpegts @ 0000020c1d7f1a80] Packet corrupt (stream = 1, dts = 1234567890).\n")
+        return lines
+
+    def run(self, progressFile=None, logFile=None):
+        if progressFile == None:
+            return self.replay(f"Synthetic {self.hours}h encode", self.generateProgressLines(), self.generateLogLines())
+        with open(progressFile, "r", encoding="utf-8", errors="replace") as file:
+            progressLines = file.readlines()
+        logLines = []
+        if logFile != None:
+            with open(logFile, "r", encoding="utf-8", errors="replace") as file:
+                logLines = file.readlines()
+        return self.replay(progressFile, progressLines, logLines)
+
+    def replay(self, name, progressLines, logLines):
+        progressCount = 0
+        missingCount = 0
+        startedAt = time.perf_counter()
+        for progress in FFmpegOutputReader(ReplayProcess(progressLines, logLines)).reader():
+            if "missing" in progress:
+                missingCount += 1
+            else:
+                progressCount += 1
+        return ProgressBenchmarkResult(name, len(progressLines) + len(logLines), progressCount, missingCount, time.perf_counter() - startedAt)
+
+
+if __name__ == "__main__":
+    print(ProgressBenchmark().run(*sys.argv[1:3]))
@@ -28,33 +28,33 @@ class ExternalPlaylistReader(PlaylistReader.PlaylistReader):
         if len(resolutions) == 0:
             resolution = self.generateResolution({"NAME": "Unknown", "GROUP-ID": "Unknown"}, self.url)
             resolutions[resolution.groupId] = resolution
-            totalMilliSeconds = self.getTotalMilliSeconds(playlist)
+            totalMilliSeconds = self.getTotalMilliSeconds(playlist.split("\n"))
         else:
             try:
-                response = Network.session.get(list(resolutions.values())[0].url)
+                response = Network.session.get(list(resolutions.values())[0].url, stream=True)
                 if response.status_code != 200:
                     raise
+                with response:
+                    totalMilliSeconds = self.getTotalMilliSeconds(self.iterLines(response.iter_content(chunk_size=65536)))
             except:
                 raise Exceptions.PlaylistNotFound
-            totalMilliSeconds = self.getTotalMilliSeconds(response.text)
         externalPlaylist = ExternalStreamPlaylist() if totalMilliSeconds == None else ExternalVideoPlaylist(totalMilliSeconds)
         externalPlaylist.resolutions = resolutions
         return externalPlaylist
 
-    def getTotalMilliSeconds(self, playlist):
+    def getTotalMilliSeconds(self, lines):
         hasRequiredTags = {
             "EXTM3U": False,
             "EXT-X-TARGETDURATION": False,
             "EXT-X-ENDLIST": False
         }
         totalMilliSeconds = 0
-        for line in playlist.split("\n"):
-            tag = self.getTag(line)
+        for line, tag in self.iterTags(lines):
             if tag != None:
                 if tag.name in hasRequiredTags:
                     hasRequiredTags[tag.name] = True
-                if tag.name == "EXTINF":
-                    totalMilliSeconds += int(float(tag.data[0]) * 1000)
+                elif tag.name == "EXTINF":
+                    totalMilliSeconds += self.getDuration(tag)
         if not all(list(hasRequiredTags.values())[0:2]):
             raise
         return totalMilliSeconds if hasRequiredTags["EXT-X-ENDLIST"] else None
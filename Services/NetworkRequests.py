@@ -36,8 +36,11 @@ requests.Response.getData = Response.getData
 class Network:
     class Exceptions:
         RequestException = requests.exceptions.RequestException
+        ConnectionError = requests.exceptions.ConnectionError
         ConnectTimeout = requests.exceptions.ConnectTimeout
         ReadTimeout = requests.exceptions.ReadTimeout
+        Timeout = requests.exceptions.Timeout
+        StreamReadTimeout = requests.packages.urllib3.exceptions.ReadTimeoutError
 
     session = requests.Session()
     session.request = functools.partial(session.request, timeout=(10, 10))
\ No newline at end of file
@@ -40,6 +40,9 @@ class TaskManager(QtCore.QObject):
         self.threadPool = threadPool
         self.tasks = []
         self.runningTasks = []
+        self.taskOrder = {}
+        self.nextTaskOrder = 0
+        self.maxRunningCount = None
         self._actionLock = MutexLocker(MutexLocker.Recursive)
         self._pausedCondition = WaitCondition(parent=self)
         self._doneCondition = WaitCondition(parent=self)
@@ -56,13 +59,37 @@ class TaskManager(QtCore.QObject):
             stopped = self.threadPool.tryTake(task)
             if stopped:
                 self.runningTasks.remove(task)
-                self.tasks.append(task)
+                self._queueTask(task)
         return stopped
 
+    def _getTaskKey(self, task):
+        return -task.priority, self.taskOrder[task]
+
+    def _queueTask(self, task):
+        if task not in self.taskOrder:
+            self.taskOrder[task] = self.nextTaskOrder
+            self.nextTaskOrder += 1
+        key = self._getTaskKey(task)
+        index = len(self.tasks)
+        while index > 0 and self._getTaskKey(self.tasks[index - 1]) > key:
+            index -= 1
+        self.tasks.insert(index, task)
+
+    def _canStartTask(self):
+        return self.maxRunningCount == None or len(self.runningTasks) < self.maxRunningCount
+
+    def _startQueuedTasks(self):
+        with self._actionLock:
+            while len(self.tasks) != 0 and self._canStartTask():
+                self._startTask(self.tasks[0])
+
     def _taskComplete(self, task):
         with self._actionLock:
             self.runningTasks.remove(task)
+            self.taskOrder.pop(task, None)
             self.taskCompleteSignal.emit(task)
+            if self.status.isRunning():
+                self._startQueuedTasks()
             if len(self.runningTasks) == 0:
                 if self.status.isPaused():
                     self._pausedCondition.makeTrue()
@@ -93,24 +120,34 @@ class TaskManager(QtCore.QObject):
         with self._actionLock:
             task.signals.finished.connect(self._taskComplete)
             if not self.status.isStopped():
-                self.tasks.append(task)
+                self._queueTask(task)
+                self._doneCondition.makeFalse()
                 if self.status.isRunning():
-                    self._startTask(task)
+                    self._startQueuedTasks()
 
     def remove(self, task):
         with self._actionLock:
             if not self._stopTask(task):
                 self.tasks.remove(task)
+                self.taskOrder.pop(task, None)
 
     def resume(self):
         with self._actionLock:
             self.status.run()
             self._pausedCondition.makeFalse()
-            while len(self.tasks) != 0:
-                self._startTask(self.tasks[0])
+            self._startQueuedTasks()
             if len(self.runningTasks) == 0:
                 self._doneCondition.makeTrue()
 
+    def setMaxRunningCount(self, maxRunningCount):
+        with self._actionLock:
+            self.maxRunningCount = maxRunningCount
+            if self.status.isRunning():
+                self._startQueuedTasks()
+
+    def getMaxRunningCount(self):
+        return self.maxRunningCount
+
     def pause(self):
         with self._actionLock:
             self.status.pause()
@@ -131,6 +168,8 @@ class TaskManager(QtCore.QObject):
             while i < len(self.runningTasks):
                 if not self._stopTask(self.runningTasks[i]):
                     i += 1
+            for task in self.tasks:
+                self.taskOrder.pop(task, None)
             self.tasks = []
             if len(self.runningTasks) == 0:
                 self._doneCondition.makeTrue()
\ No newline at end of file
@@ -2,29 +2,71 @@ from .Config import Config
 
 from Core.App import App
 from Services.Utils.OSUtils import OSUtils
+from Services.Threading.MutexLocker import MutexLocker
 
 import os
+import time
 import ctypes
 import tempfile
 
 
 class SafeTempDirectory:
-    def __init__(self, directory, dirPrefix, keyFileDir):
-        self.directory = tempfile.TemporaryDirectory(dir=directory, prefix=dirPrefix)
-        self.name = self.directory.name
+    def __init__(self, directory, dirPrefix, keyFileDir, name=None, onRelease=None):
+        self.onRelease = onRelease
+        if name == None:
+            self.name = tempfile.mkdtemp(dir=directory, prefix=dirPrefix)
+            self.file = tempfile.NamedTemporaryFile(dir=keyFileDir, mode="w", delete=False)
+        else:
+            self.name = OSUtils.joinPath(directory, f"{dirPrefix}{name}")
+            OSUtils.createDirectory(self.name)
+            self.file = open(OSUtils.joinPath(keyFileDir, f"{dirPrefix}{name}"), "w")
         ctypes.windll.kernel32.SetFileAttributesW(self.name, 2)
-        self.file = tempfile.NamedTemporaryFile(dir=keyFileDir, mode="w", delete=False)
-        self.file.write(self.name)
+        self.writeKeyFile()
+
+    def writeKeyFile(self, expiry=None):
+        self.file.seek(0)
+        self.file.truncate()
+        self.file.write(self.name if expiry == None else f"{self.name}\n{int(time.time() + expiry)}")
         self.file.flush()
 
+    def getSize(self):
+        byteSize = 0
+        for root, dirs, files in os.walk(self.name):
+            for file in files:
+                try:
+                    byteSize += os.path.getsize(os.path.join(root, file))
+                except OSError:
+                    pass
+        return byteSize
+
+    def release(self):
+        if self.onRelease != None:
+            self.onRelease(self.name)
+            self.onRelease = None
+
+    def keep(self, expiry):
+        try:
+            self.writeKeyFile(expiry)
+            self.file.close()
+        finally:
+            self.release()
+
     def cleanup(self):
-        self.directory.cleanup()
-        self.file.close()
-        OSUtils.removeFile(self.file.name)
+        try:
+            try:
+                OSUtils.removeDirectory(self.name)
+            except FileNotFoundError:
+                pass
+            self.file.close()
+            OSUtils.removeFile(self.file.name)
+        finally:
+            self.release()
 
 
 class _TempManager:
     def __init__(self):
+        self.lockedDirectories = set()
+        self._lock = MutexLocker()
         try:
             OSUtils.createDirectory(Config.TEMP_LIST_DIRECTORY)
             self.cleanup()
@@ -47,13 +89,38 @@ class _TempManager:
     def cleanTempDirKeyFile(self, tempDirKeyFile):
         if OSUtils.isFile(tempDirKeyFile):
             with open(tempDirKeyFile) as file:
-                tempDir = file.read()
-                if OSUtils.isDirectory(tempDir):
-                    App.logger.info(f"Removing temp directory: {tempDir}")
-                    OSUtils.removeDirectory(tempDir)
+                tempDir, *expiry = file.read().split("\n")
+            if len(expiry) != 0 and OSUtils.isDirectory(tempDir) and int(expiry[0]) > time.time():
+                App.logger.info(f"Keeping resumable temp directory: {tempDir}")
+                return
+            if OSUtils.isDirectory(tempDir):
+                App.logger.info(f"Removing temp directory: {tempDir}")
+                OSUtils.removeDirectory(tempDir)
             OSUtils.removeFile(tempDirKeyFile)
 
-    def createTempDirectory(self, directory):
-        return SafeTempDirectory(directory, dirPrefix=Config.DIRECTORY_PREFIX, keyFileDir=Config.TEMP_LIST_DIRECTORY)
+    def getDirectoryKey(self, directory, name):
+        return os.path.normcase(os.path.abspath(OSUtils.joinPath(directory, f"{Config.DIRECTORY_PREFIX}{name}")))
+
+    def lockDirectory(self, path):
+        with self._lock:
+            if path in self.lockedDirectories:
+                return False
+            self.lockedDirectories.add(path)
+            return True
+
+    def unlockDirectory(self, path):
+        with self._lock:
+            self.lockedDirectories.discard(os.path.normcase(os.path.abspath(path)))
+
+    def createTempDirectory(self, directory, name=None):
+        if name != None and not self.lockDirectory(self.getDirectoryKey(directory, name)):
+            App.logger.info(f"Temp directory is in use, creating a new one: {Config.DIRECTORY_PREFIX}{name}")
+            name = None
+        try:
+            return SafeTempDirectory(directory, dirPrefix=Config.DIRECTORY_PREFIX, keyFileDir=Config.TEMP_LIST_DIRECTORY, name=name, onRelease=None if name == None else self.unlockDirectory)
+        except:
+            if name != None:
+                self.unlockDirectory(self.getDirectoryKey(directory, name))
+            raise
 
-TempManager = _TempManager()
\ No newline at end of file
+TempManager = _TempManager()
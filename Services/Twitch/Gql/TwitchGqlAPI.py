@@ -142,6 +142,18 @@ class TwitchGqlAPI:
         video = response["data"]["video"]
         return self._raiseIfNone(video, Video)
 
+    def getVideoMuteInfo(self, id, headers=None):
+        variables = {
+            "id": id
+        }
+        response = self._gqlEngine.api(getVideoMuteInfo, variables, headers=headers)
+        video = response["data"]["video"]
+        if video == None:
+            raise Exceptions.DataNotFound
+        muteInfo = video.get("muteInfo") or {}
+        nodes = (muteInfo.get("mutedSegmentConnection") or {}).get("nodes") or []
+        return [MutedSegment(node) for node in nodes]
+
     def getClip(self, slug, headers=None):
         variables = {
             "slug": slug
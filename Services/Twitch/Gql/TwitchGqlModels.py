@@ -112,6 +112,19 @@ class Video(TwitchGqlObject):
         seconds = int(self.lengthSeconds)
         return f"{seconds // 3600:02}:{seconds % 3600 // 60:02}:{seconds % 3600 % 60:02}"
 
+class MutedSegment(TwitchGqlObject):
+    def __init__(self, data):
+        self.offset = float(data.get("offset", 0))
+        self.duration = float(data.get("duration", 0))
+
+    @property
+    def startsAt(self):
+        return int(self.offset * 1000)
+
+    @property
+    def endsAt(self):
+        return int((self.offset + self.duration) * 1000)
+
 class Clip(TwitchGqlObject):
     def __init__(self, data):
         self.id = DataUtils.getId(data.get("id"))
@@ -205,6 +205,27 @@ class getVideo:
         "id"
     ]
 
+class getVideoMuteInfo:
+    query = """
+        query($id: ID!) {
+          video(id: $id) {
+            id
+            muteInfo {
+              mutedSegmentConnection {
+                nodes {
+                  offset
+                  duration
+                }
+              }
+            }
+          }
+        }
+    """
+
+    variableList = [
+        "id"
+    ]
+
 class getClip:
     query = """
         query($slug: ID!) {
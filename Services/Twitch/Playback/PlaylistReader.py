@@ -1,14 +1,26 @@
 from . import TwitchPlaybackModels
 
-import re
+import codecs
 
 from urllib.parse import urljoin
 
 
 class PlaylistTag:
-    def __init__(self, name, data):
+    def __init__(self, name, data=None, rawData=None, reader=None):
         self.name = name
-        self.data = data
+        self._data = data
+        self.rawData = rawData
+        self.reader = reader
+
+    @property
+    def data(self):
+        if self._data == None and self.rawData != None:
+            self._data = self.reader.getTagData(self.rawData)
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
 
     def toString(self):
         if isinstance(self.data, dict):
@@ -20,19 +32,33 @@ class PlaylistTag:
 
 
 class PlaylistTagReader:
-    TAG_WITH_DATA = re.compile("#(.*?):(.*)")
-    TAG_WITHOUT_DATA = re.compile("#(.*)")
-
     def getTag(self, string):
-        tag = re.match(self.TAG_WITH_DATA, string)
-        if tag == None:
-            tag = re.match(self.TAG_WITHOUT_DATA, string)
-            if tag == None:
-                return None
-            else:
-                return PlaylistTag(tag.group(1), None)
+        if not string.startswith("#"):
+            return None
+        name, separator, rawData = string[1:].partition(":")
+        if separator == "":
+            return PlaylistTag(name)
         else:
-            return PlaylistTag(tag.group(1), self.getTagData(tag.group(2)))
+            return PlaylistTag(name, rawData=rawData, reader=self)
+
+    def iterTags(self, lines):
+        for line in lines:
+            yield line, self.getTag(line)
+
+    @staticmethod
+    def iterLines(chunks):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        remainder = ""
+        for chunk in chunks:
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk)
+            lines = (remainder + chunk).split("\n")
+            remainder = lines.pop()
+            yield from lines
+        yield remainder + decoder.decode(b"", final=True)
+
+    def getDuration(self, tag):
+        return int(float(tag.rawData.split(",", 1)[0]) * 1000)
 
     def getTagData(self, line):
         if "=" in line and not self.startsWithQuotation(line):
@@ -85,8 +111,7 @@ class PlaylistReader(PlaylistTagReader):
     def getPlaylistUrl(self, playlist, host=""):
         resolutions = {}
         expect = False
-        for line in playlist.split("\n"):
-            tag = self.getTag(line)
+        for line, tag in self.iterTags(playlist.split("\n")):
             if tag != None:
                 if tag.name == "EXT-X-MEDIA":
                     expect = tag.data
@@ -0,0 +1,100 @@
+from .PlaylistReader import PlaylistTag, PlaylistTagReader
+
+import re
+import time
+
+
+class RegexPlaylistTagReader(PlaylistTagReader):
+    TAG_WITH_DATA = re.compile("#(.*?):(.*)")
+    TAG_WITHOUT_DATA = re.compile("#(.*)")
+
+    def getTag(self, string):
+        tag = re.match(self.TAG_WITH_DATA, string)
+        if tag == None:
+            tag = re.match(self.TAG_WITHOUT_DATA, string)
+            if tag == None:
+                return None
+            else:
+                return PlaylistTag(tag.group(1))
+        else:
+            return PlaylistTag(tag.group(1), data=self.getTagData(tag.group(2)))
+
+    def getDuration(self, tag):
+        return int(float(tag.data[0]) * 1000)
+
+
+class PlaylistReaderBenchmarkResult:
+    def __init__(self, name, reader, lineCount, seconds):
+        self.name = name
+        self.reader = reader
+        self.lineCount = lineCount
+        self.seconds = seconds
+
+    @property
+    def linesPerSecond(self):
+        return self.lineCount / (self.seconds or 1)
+
+    def __str__(self):
+        return f"{self.name} [{self.reader}]: {self.linesPerSecond / 1000:.0f}k lines/s ({self.seconds:.3f}s)"
+
+
+class PlaylistReaderBenchmark:
+    def __init__(self, segmentCount=20000, masterRepeatCount=2000, chunkSize=64 * 1024):
+        self.segmentCount = segmentCount
+        self.masterRepeatCount = masterRepeatCount
+        self.chunkSize = chunkSize
+
+    def generateVideoPlaylist(self):
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:10", "#EXT-X-PLAYLIST-TYPE:EVENT", "#EXT-X-MEDIA-SEQUENCE:0"]
+        for index in range(self.segmentCount):
+            lines.append("#EXTINF:10.000,")
+            lines.append(f"{index}-muted.ts" if index % 50 == 0 else f"{index}.ts")
+        lines.append("#EXT-X-ENDLIST")
+        return "\n".join(lines)
+
+    def generateMasterPlaylist(self):
+        lines = ["#EXTM3U", '#EXT-X-TWITCH-INFO:ORIGIN="s3",B="false",REGION="NA",USER-IP="127.0.0.1",SERVING-ID="0",CLUSTER="cloudfront_vod",USER-COUNTRY="US",MANIFEST-CLUSTER="cloudfront_vod"']
+        for name, resolution, bandwidth in (("1080p60", "1920x1080", 8000000), ("720p60", "1280x720", 3400000), ("720p30", "1280x720", 2400000), ("480p30", "852x480", 1400000), ("360p30", "640x360", 700000), ("160p30", "284x160", 300000)):
+            lines.append(f'#EXT-X-MEDIA:TYPE=VIDEO,GROUP-ID="{name}",NAME="{name}",AUTOSELECT=YES,DEFAULT=YES')
+            lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},CODECS="avc1.64002A,mp4a.40.2",RESOLUTION={resolution},VIDEO="{name}",FRAME-RATE=60.000')
+            lines.append(f"https://example.cloudfront.net/0/{name}/index-dvr.m3u8")
+        return "\n".join(lines)
+
+    def run(self):
+        videoPlaylist = self.generateVideoPlaylist()
+        videoData = videoPlaylist.encode()
+        videoChunks = [videoData[index:index + self.chunkSize] for index in range(0, len(videoData), self.chunkSize)]
+        masterPlaylist = self.generateMasterPlaylist()
+        results = []
+        for reader in (RegexPlaylistTagReader(), PlaylistTagReader()):
+            results.append(self.measure("VOD playlist", reader, lambda: self.readVideoPlaylist(reader, videoPlaylist.split("\n"))))
+            results.append(self.measure("VOD playlist chunks", reader, lambda: self.readVideoPlaylist(reader, reader.iterLines(videoChunks))))
+            results.append(self.measure("Master playlist", reader, lambda: sum(self.readMasterPlaylist(reader, masterPlaylist.split("\n")) for index in range(self.masterRepeatCount))))
+        return results
+
+    def measure(self, name, reader, function):
+        startedAt = time.perf_counter()
+        lineCount = function()
+        return PlaylistReaderBenchmarkResult(name, type(reader).__name__, lineCount, time.perf_counter() - startedAt)
+
+    def readVideoPlaylist(self, reader, lines):
+        lineCount = 0
+        durations = []
+        for line, tag in reader.iterTags(lines):
+            lineCount += 1
+            if tag != None and tag.name == "EXTINF":
+                durations.append(reader.getDuration(tag))
+        return lineCount
+
+    def readMasterPlaylist(self, reader, lines):
+        lineCount = 0
+        for line, tag in reader.iterTags(lines):
+            lineCount += 1
+            if tag != None and tag.name == "EXT-X-MEDIA":
+                tag.data.get("GROUP-ID")
+        return lineCount
+
+
+if __name__ == "__main__":
+    for result in PlaylistReaderBenchmark().run():
+        print(result)
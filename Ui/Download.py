@@ -157,6 +157,8 @@ class Download(QtWidgets.QWidget, UiFile.download):
             self.cancelButton.setText(T("stopping", ellipsis=True))
         elif status.isPreparing():
             self.status.setText(T("preparing", ellipsis=True))
+        elif status.isQueued():
+            self.status.setText(T("#Waiting for encoding", ellipsis=True))
         else:
             self.status.setText(T("live-downloading", ellipsis=True))
 
@@ -195,6 +197,12 @@ class Download(QtWidgets.QWidget, UiFile.download):
             self.skipWaitingButton.hide()
             self.skipDownloadButton.show()
             self.pauseButton.hide()
+        elif status.isQueued():
+            self.status.setText(T("#Waiting for encoding", ellipsis=True))
+            self.skipWaitingButton.hide()
+            self.skipDownloadButton.hide()
+            self.downloadProgressBar.setRange(0, 100)
+            self.pauseButton.hide()
         elif status.isEncoding():
             encodingString = T("encoding", ellipsis=True)
             if self.downloadInfo.type.isVideo():
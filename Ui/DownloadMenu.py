@@ -41,15 +41,40 @@ class DownloadMenu(QtWidgets.QDialog, UiFile.downloadMenu, WindowGeometryManager
             self.prioritizeCheckBox.setChecked(self.downloadInfo.isPrioritizeEnabled())
             self.prioritizeCheckBox.toggled.connect(self.downloadInfo.setPrioritizeEnabled)
             self.prioritizeInfo.clicked.connect(self.showPrioritizeInfo)
+            self.setupEncodeProfile()
+            self.additionalAudioCheckBox.toggled.connect(self.setAdditionalAudioEnabled)
+            self.reloadAdditionalAudio()
             self.reloadCropArea()
         else:
             self.cropArea.hide()
             self.unmuteVideoArea.hide()
             self.updateTrackArea.hide()
+            self.encodeProfileArea.hide()
+            self.additionalAudioCheckBox.hide()
             self.prioritizeCheckBox.setChecked(self.downloadInfo.isPrioritizeEnabled())
             self.prioritizeCheckBox.toggled.connect(self.downloadInfo.setPrioritizeEnabled)
             self.prioritizeInfo.clicked.connect(self.showPrioritizeInfo)
 
+    def setupEncodeProfile(self):
+        encodeProfiles = self.downloadInfo.optionHistory.getAvailableEncodeProfiles()
+        for encodeProfile in encodeProfiles:
+            self.encodeProfile.addItem(T(encodeProfile), encodeProfile)
+        if self.downloadInfo.getEncodeProfile() in encodeProfiles:
+            self.encodeProfile.setCurrentIndex(encodeProfiles.index(self.downloadInfo.getEncodeProfile()))
+        self.encodeProfile.currentIndexChanged.connect(self.setEncodeProfile)
+
+    def setEncodeProfile(self, index):
+        self.downloadInfo.setEncodeProfile(self.encodeProfile.itemData(index))
+
+    def setAdditionalAudioEnabled(self, enabled):
+        self.downloadInfo.setAdditionalFormats([self.downloadInfo.optionHistory.getAudioFormat()] if enabled else [])
+
+    def reloadAdditionalAudio(self):
+        self.additionalAudioCheckBox.blockSignals(True)
+        self.additionalAudioCheckBox.setEnabled(len(self.downloadInfo.getAvailableAdditionalFormats()) != 0)
+        self.additionalAudioCheckBox.setChecked(len(self.downloadInfo.additionalFormats) != 0)
+        self.additionalAudioCheckBox.blockSignals(False)
+
     def reloadFileDirectory(self):
         self.currentDirectory.setText(self.downloadInfo.getAbsoluteFileName())
         self.currentDirectory.setToolTip(self.downloadInfo.getAbsoluteFileName())
@@ -66,6 +91,8 @@ class DownloadMenu(QtWidgets.QDialog, UiFile.downloadMenu, WindowGeometryManager
     def setResolution(self, index):
         self.downloadInfo.setResolution(index)
         self.reloadFileDirectory()
+        if not self.downloadInfo.type.isClip():
+            self.reloadAdditionalAudio()
         if self.hasResolutionInFileNameTemplate():
             if self.ask("filename-change", "#The filename template contains a 'resolution' variable. Do you want to create a new filename based on the changed resolution?", defaultOk=True):
                 self.downloadInfo.setFileName(self.downloadInfo.generateFileName())
@@ -162,6 +162,8 @@ class DownloadPreview(QtWidgets.QWidget, UiFile.downloadPreview):
             self.cancelButton.setText(T("stopping", ellipsis=True))
         elif status.isPreparing():
             self.status.setText(T("preparing", ellipsis=True))
+        elif status.isQueued():
+            self.status.setText(T("#Waiting for encoding", ellipsis=True))
         else:
             self.status.setText(T("live-downloading", ellipsis=True))
 
@@ -189,6 +191,10 @@ class DownloadPreview(QtWidgets.QWidget, UiFile.downloadPreview):
         elif status.isUpdating():
             self.status.setText(T("#Checking for additional files", ellipsis=True))
             self.pauseButton.hide()
+        elif status.isQueued():
+            self.status.setText(T("#Waiting for encoding", ellipsis=True))
+            self.progressBar.setRange(0, 100)
+            self.pauseButton.hide()
         elif status.isEncoding():
             encodingString = T("encoding", ellipsis=True)
             if self.downloadInfo.type.isVideo():
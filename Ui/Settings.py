@@ -52,6 +52,9 @@ class Settings(QtWidgets.QWidget, UiFile.settings):
         self.speedSpinBox.setRange(1, EngineConfig.MAX_THREAD_LIMIT)
         self.speedSpinBox.valueChanged.connect(self.setDownloadSpeed)
         self.setDownloadSpeed(DB.download.getDownloadSpeed())
+        self.adaptiveDownloadSpeed.setChecked(DB.download.isAdaptiveDownloadSpeedEnabled())
+        self.adaptiveDownloadSpeed.toggled.connect(self.setAdaptiveDownloadSpeedEnabled)
+        self.speedSliderArea.setEnabled(not DB.download.isAdaptiveDownloadSpeedEnabled())
         self.downloadSpeedStreamInfoIcon = Utils.setSvgIcon(self.downloadSpeedStreamInfoIcon, Icons.INFO_ICON)
         self.resetButton.clicked.connect(self.resetSettings)
         self.reloadBookmarkArea()
@@ -231,6 +234,10 @@ class Settings(QtWidgets.QWidget, UiFile.settings):
         self.downloadSpeed.setValueSilent(speed)
         self.speedSpinBox.setValueSilent(speed)
 
+    def setAdaptiveDownloadSpeedEnabled(self, enabled):
+        DB.download.setAdaptiveDownloadSpeedEnabled(enabled)
+        self.speedSliderArea.setEnabled(not enabled)
+
     def resetSettings(self):
         if self.ask("warning", "#This will reset all settings.\nProceed?"):
             DB.reset()
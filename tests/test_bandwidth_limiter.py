@@ -0,0 +1,47 @@
+from Download.Downloader.Engine.BandwidthLimiter import _BandwidthLimiter
+from Download.Downloader.Engine.Config import Config
+
+import unittest
+
+
+class BandwidthLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.limiter = _BandwidthLimiter()
+        self.limiter.setLimit(1024 ** 2)
+
+    def testTotalWeightFollowsActiveChannels(self):
+        first = self.limiter.openChannel(1)
+        second = self.limiter.openChannel(2)
+        self.assertEqual(self.limiter.totalWeight, 0)
+        self.limiter.reserve(first, 1024)
+        self.limiter.reserve(second, 1024)
+        self.assertEqual(self.limiter.totalWeight, 3)
+        second.setWeight(4)
+        self.assertEqual(self.limiter.totalWeight, 5)
+        second.close()
+        self.assertEqual(self.limiter.totalWeight, 1)
+        first.close()
+        self.assertEqual(self.limiter.totalWeight, 0)
+
+    def testIdleChannelsExpire(self):
+        idle = self.limiter.openChannel(1)
+        active = self.limiter.openChannel(1)
+        self.limiter.reserve(idle, 1024)
+        self.limiter.reserve(active, 1024)
+        idle.lastActive -= Config.BANDWIDTH_ACTIVE_CHANNEL_TIMEOUT
+        self.limiter.expiresAt = 0
+        self.limiter.reserve(active, 1024)
+        self.assertFalse(idle.active)
+        self.assertEqual(self.limiter.totalWeight, 1)
+
+    def testRateIsSharedByWeight(self):
+        first = self.limiter.openChannel(1)
+        second = self.limiter.openChannel(3)
+        self.limiter.reserve(first, 0)
+        self.limiter.reserve(second, 0)
+        self.assertAlmostEqual(self.limiter.reserve(first, 1024 ** 2 // 4), 1, delta=0.05)
+        self.assertAlmostEqual(self.limiter.reserve(second, 1024 ** 2 // 4), 1 / 3, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
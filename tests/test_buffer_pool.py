@@ -0,0 +1,56 @@
+from Download.Downloader.Engine.BufferPool import _BufferPool
+
+import threading
+import unittest
+
+
+class BufferPoolTest(unittest.TestCase):
+    WAIT_TIMEOUT = 0.2
+
+    def startLease(self, pool):
+        leased = threading.Event()
+        released = threading.Event()
+        def lease():
+            with pool.lease():
+                leased.set()
+                released.wait()
+        thread = threading.Thread(target=lease)
+        thread.start()
+        return thread, leased, released
+
+    def testLeaseBlocksWhenPoolIsEmpty(self):
+        pool = _BufferPool(bufferSize=16, maxBufferCount=2)
+        leases = [self.startLease(pool) for index in range(2)]
+        for thread, leased, released in leases:
+            self.assertTrue(leased.wait(self.WAIT_TIMEOUT))
+        self.assertEqual(pool.getInFlightByteSize(), 32)
+        blockedThread, blockedLeased, blockedReleased = self.startLease(pool)
+        self.assertFalse(blockedLeased.wait(self.WAIT_TIMEOUT))
+        leases[0][2].set()
+        leases[0][0].join()
+        self.assertTrue(blockedLeased.wait(self.WAIT_TIMEOUT))
+        for thread, leased, released in leases[1:] + [(blockedThread, blockedLeased, blockedReleased)]:
+            released.set()
+            thread.join()
+        self.assertEqual(pool.getInFlightByteSize(), 0)
+
+    def testMaxBufferCountFollowsThreadCount(self):
+        self.assertEqual(_BufferPool.getMaxBufferCount(2), 2)
+        self.assertLess(_BufferPool.getMaxBufferCount(20), 20)
+
+    def testShrinkingPoolCapsNewLeases(self):
+        pool = _BufferPool(bufferSize=16, maxBufferCount=4)
+        pool.setMaxBufferCount(1)
+        thread, leased, released = self.startLease(pool)
+        self.assertTrue(leased.wait(self.WAIT_TIMEOUT))
+        blockedThread, blockedLeased, blockedReleased = self.startLease(pool)
+        self.assertFalse(blockedLeased.wait(self.WAIT_TIMEOUT))
+        released.set()
+        thread.join()
+        self.assertTrue(blockedLeased.wait(self.WAIT_TIMEOUT))
+        blockedReleased.set()
+        blockedThread.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+from Download.Downloader.Engine.BufferPool import BufferPool
+from Download.Downloader.Engine.DiskWriter import DiskWriter
+from Download.Downloader.Engine.Video.SegmentSpool import SegmentSpool, SpoolTarget
+
+import os
+import tempfile
+import unittest
+
+
+class DiskWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def writeChunks(self, stream, chunks):
+        for chunk in chunks:
+            buffer = BufferPool.acquire()
+            buffer[:len(chunk)] = chunk
+            stream.write(buffer, len(chunk))
+        stream.close()
+
+    def testPooledBuffersAreWrittenAndReleased(self):
+        chunks = [bytes([index]) * (index * 1000 + 1) for index in range(1, 40)]
+        filePath = os.path.join(self.directory.name, "0.ts")
+        self.writeChunks(DiskWriter.openFile(filePath), chunks)
+        with open(filePath, "rb") as file:
+            self.assertEqual(file.read(), b"".join(chunks))
+        self.assertEqual(BufferPool.getInFlightByteSize(), 0)
+
+    def testSpoolTargetIsCommittedThroughWriter(self):
+        spool = SegmentSpool(
+            filePath=os.path.join(self.directory.name, "spool.ts"),
+            indexFilePath=os.path.join(self.directory.name, "spool.index"),
+            preallocateSize=1024,
+            resume=False
+        )
+        try:
+            self.writeChunks(DiskWriter.openTarget(spool.filePath, SpoolTarget(spool, "0.ts", 6)), [b"abc", b"def"])
+            entry = spool.getEntry("0.ts")
+            self.assertNotEqual(entry, None)
+            self.assertEqual(entry.size, 6)
+        finally:
+            spool.closeFile()
+        self.assertEqual(BufferPool.getInFlightByteSize(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
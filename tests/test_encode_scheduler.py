@@ -0,0 +1,34 @@
+from Download.Downloader.FFmpeg.EncodeScheduler import _EncodeScheduler
+
+import os
+import tempfile
+import unittest
+
+
+class EncodeSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = _EncodeScheduler()
+        self.scheduler.setMaxJobCount(4, 2)
+        self.filePath = os.path.join(tempfile.gettempdir(), "output.mp4")
+
+    def testExtraJobsAreLimitedByDiskCapacity(self):
+        job = self.scheduler.createJob(self.filePath)
+        self.assertTrue(job.wait())
+        jobs = self.scheduler.acquireJobs(self.filePath, count=7)
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(len(self.scheduler.runningJobs), 2)
+        for extraJob in jobs:
+            extraJob.release()
+        job.release()
+        self.assertEqual(len(self.scheduler.runningJobs), 0)
+
+    def testExtraJobsDoNotTakeSlotsFromQueuedJobs(self):
+        job = self.scheduler.createJob(self.filePath)
+        self.assertTrue(job.wait())
+        queuedJob = self.scheduler.createJob(self.filePath)
+        self.assertEqual(self.scheduler.acquireJobs(self.filePath, count=3), [])
+        self.assertTrue(queuedJob.wait())
+
+
+if __name__ == "__main__":
+    unittest.main()
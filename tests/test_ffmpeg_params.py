@@ -0,0 +1,29 @@
+from Download.Downloader.FFmpeg.FFmpeg import FFmpeg
+from Download.Downloader.FFmpeg.EncodeProfile import EncodeProfiles
+
+import unittest
+
+
+class FFmpegParamsTest(unittest.TestCase):
+    def setUp(self):
+        self.ffmpeg = FFmpeg()
+
+    def testMp3SourceIsReencodedForAacOutput(self):
+        params = self.ffmpeg.getAdditionalOutputParams(["output.aac"], remux=True, profile=EncodeProfiles.BALANCED, sourceAudioCodec="mp3")
+        self.assertEqual(params, ["-vn", "-c:a", "aac", "-b:a", "160k", "output.aac"])
+
+    def testMp3SourceIsCopiedForMp3Output(self):
+        params = self.ffmpeg.getAdditionalOutputParams(["output.mp3"], remux=True, sourceAudioCodec="mp3")
+        self.assertEqual(params, ["-vn", "-c:a", "copy", "output.mp3"])
+
+    def testAacSourceIsCopiedForAacOutput(self):
+        params = self.ffmpeg.getAdditionalOutputParams(["output.aac", "output.mp4"], remux=True)
+        self.assertEqual(params, ["-vn", "-c:a", "copy", "output.aac", "-c:v", "copy", "-c:a", "copy", "output.mp4"])
+
+    def testAacSourceIsReencodedForMp3Output(self):
+        params = self.ffmpeg.getAdditionalOutputParams(["output.mp3"], remux=True)
+        self.assertEqual(params[:3], ["-vn", "-c:a", "libmp3lame"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+from Download.Downloader.Engine.Stream.LivePlaylist import LivePlaylist
+
+import unittest
+
+
+class LivePlaylistTest(unittest.TestCase):
+    URL = "https://example.com/live/playlist.m3u8"
+
+    def createPlaylist(self, mediaSequence, segments, prefetch=(), tags=()):
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:6", f"#EXT-X-MEDIA-SEQUENCE:{mediaSequence}", *tags]
+        for segment in segments:
+            if isinstance(segment, tuple):
+                lines.extend(segment)
+            else:
+                lines.append("#EXTINF:2.000,live")
+                lines.append(segment)
+        for url in prefetch:
+            lines.append(f"#EXT-X-TWITCH-PREFETCH:{url}")
+        return LivePlaylist("\n".join(lines), self.URL)
+
+    def testPrefetchSegmentsFollowListedSegments(self):
+        playlist = self.createPlaylist(10, ["10.ts", "11.ts"], prefetch=["12.ts", "https://cdn.example.com/13.ts"])
+        self.assertEqual([segment.sequence for segment in playlist.prefetchSegments], [12, 13])
+        self.assertTrue(all(segment.prefetch for segment in playlist.prefetchSegments))
+        self.assertEqual(playlist.prefetchSegments[0].url, "https://example.com/live/12.ts")
+        self.assertEqual(playlist.prefetchSegments[1].url, "https://cdn.example.com/13.ts")
+        self.assertEqual(playlist.prefetchSegments[0].durationMilliseconds, 2000)
+
+    def testPrefetchSegmentsAreOptional(self):
+        playlist = self.createPlaylist(10, ["10.ts", "11.ts"], prefetch=["12.ts"])
+        self.assertEqual([segment.sequence for segment in playlist.getSegmentsAfter(None)], [10, 11])
+        self.assertEqual([segment.sequence for segment in playlist.getSegmentsAfter(None, prefetch=True)], [10, 11, 12])
+        self.assertEqual([segment.sequence for segment in playlist.getSegmentsAfter(10, prefetch=True)], [11, 12])
+        self.assertEqual(playlist.getSegmentsAfter(12, prefetch=True), [])
+
+    def testPrefetchSegmentIsConfirmedByLaterPlaylist(self):
+        prefetchSegment = self.createPlaylist(10, ["10.ts", "11.ts"], prefetch=["12.ts", "13.ts"]).prefetchSegments[0]
+        playlist = self.createPlaylist(11, ["11.ts", ("#EXTINF:1.500,live", "12.ts?token=1")], prefetch=["13.ts"])
+        listedSegment = playlist.segments[-1]
+        self.assertEqual(listedSegment.sequence, prefetchSegment.sequence)
+        prefetchSegment.confirm(listedSegment)
+        self.assertFalse(prefetchSegment.prefetch)
+        self.assertEqual(prefetchSegment.url, "https://example.com/live/12.ts?token=1")
+        self.assertEqual(prefetchSegment.durationMilliseconds, 1500)
+        self.assertEqual(prefetchSegment.fileName, "12.ts")
+        self.assertEqual([segment.sequence for segment in playlist.getSegmentsAfter(12, prefetch=True)], [13])
+
+    def testPrefetchWithoutSegments(self):
+        playlist = self.createPlaylist(20, [], prefetch=["20.ts"])
+        self.assertEqual(playlist.prefetchSegments[0].sequence, 20)
+        self.assertEqual(playlist.prefetchSegments[0].durationMilliseconds, 6000)
+
+    def createDatedPlaylist(self, mediaSequence, count, dateRange=None, prefetch=()):
+        segments = [(f"#EXT-X-PROGRAM-DATE-TIME:2026-10-18T10:00:{(mediaSequence + index) * 2:02}.000Z", "#EXTINF:2.000,live", f"{mediaSequence + index}.ts") for index in range(count)]
+        tags = [] if dateRange == None else [f"#EXT-X-DATERANGE:{dateRange}"]
+        return self.createPlaylist(mediaSequence, segments, prefetch=prefetch, tags=tags)
+
+    def getAdSequences(self, playlist):
+        return [segment.sequence for segment in playlist.segments if segment.ad]
+
+    def testAdSegmentTitle(self):
+        playlist = self.createPlaylist(0, ["0.ts", ("#EXTINF:2.000,Amazon|123456", "1.ts"), ("#EXTINF:2.000,live", "2.ts")])
+        self.assertEqual(self.getAdSequences(playlist), [1])
+
+    def testAdDateRangeClass(self):
+        playlist = self.createDatedPlaylist(0, 5, dateRange='ID="ad-1",CLASS="twitch-stitched-ad",START-DATE="2026-10-18T10:00:02.000Z",DURATION=4.000')
+        self.assertEqual(self.getAdSequences(playlist), [1, 2])
+
+    def testAdDateRangeIdPrefix(self):
+        playlist = self.createDatedPlaylist(0, 5, dateRange='ID="stitched-ad-1234",CLASS="twitch-ad-quartile",START-DATE="2026-10-18T10:00:04.000Z",DURATION=2.000')
+        self.assertEqual(self.getAdSequences(playlist), [2])
+
+    def testAdDateRangeEndDate(self):
+        playlist = self.createDatedPlaylist(0, 5, dateRange='ID="stitched-ad-1234",START-DATE="2026-10-18T10:00:02.000Z",END-DATE="2026-10-18T10:00:08.000Z",DURATION=2.000')
+        self.assertEqual(self.getAdSequences(playlist), [1, 2, 3])
+
+    def testAdDateRangePlannedDuration(self):
+        playlist = self.createDatedPlaylist(0, 5, dateRange='ID="stitched-ad-1234",START-DATE="2026-10-18T10:00:06.000Z",PLANNED-DURATION=30.000')
+        self.assertEqual(self.getAdSequences(playlist), [3, 4])
+
+    def testOtherDateRangesAreIgnored(self):
+        playlist = self.createDatedPlaylist(0, 5, dateRange='ID="source-1234",CLASS="twitch-session",START-DATE="2026-10-18T10:00:00.000Z",DURATION=60.000')
+        self.assertEqual(self.getAdSequences(playlist), [])
+
+    def testAdDateRangeWithoutEndIsIgnored(self):
+        playlist = self.createDatedPlaylist(0, 5, dateRange='ID="stitched-ad-1234",START-DATE="2026-10-18T10:00:00.000Z"')
+        self.assertEqual(self.getAdSequences(playlist), [])
+
+    def testPrefetchIsDroppedAfterAdSegment(self):
+        playlist = self.createDatedPlaylist(0, 3, dateRange='CLASS="twitch-stitched-ad",START-DATE="2026-10-18T10:00:04.000Z",DURATION=30.000', prefetch=["3.ts"])
+        self.assertEqual(self.getAdSequences(playlist), [2])
+        self.assertEqual(playlist.prefetchSegments, [])
+
+    def testPrefetchedSegmentIsLaterMarkedAsAd(self):
+        prefetchSegment = self.createDatedPlaylist(0, 3, prefetch=["3.ts"]).prefetchSegments[0]
+        self.assertFalse(prefetchSegment.ad)
+        playlist = self.createDatedPlaylist(1, 3, dateRange='CLASS="twitch-stitched-ad",START-DATE="2026-10-18T10:00:06.000Z",DURATION=30.000')
+        self.assertEqual(self.getAdSequences(playlist), [3])
+        prefetchSegment.confirm(playlist.segments[-1])
+        self.assertTrue(prefetchSegment.ad)
+        self.assertFalse(prefetchSegment.prefetch)
+
+
+if __name__ == "__main__":
+    unittest.main()
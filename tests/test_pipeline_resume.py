@@ -0,0 +1,63 @@
+from Download.Downloader.Engine.Video.SegmentJournal import SegmentJournal
+from Download.Downloader.Engine.Video.SegmentSequencer import SegmentSequencer
+from Download.Downloader.Engine.Video.SegmentDownloader import SegmentVariants
+
+import os
+import tempfile
+import time
+import unittest
+
+
+class Segment:
+    def __init__(self, fileName):
+        self.fileName = fileName
+        self.durationMilliseconds = 10000
+
+
+class PipelineResumeTest(unittest.TestCase):
+    URL = "https://example.com/video/chunked/index-dvr.m3u8"
+    SEGMENT_COUNT = 10
+    COMPLETED_COUNT = 6
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.journalPath = os.path.join(self.directory.name, "TwitchLink.journal")
+        self.segments = [Segment(f"{index}.ts") for index in range(self.SEGMENT_COUNT)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def getSegmentPath(self, segment):
+        return os.path.join(self.directory.name, segment.fileName)
+
+    def interruptDownload(self):
+        journal = SegmentJournal(self.journalPath, self.URL, [None, None])
+        output = open(os.path.join(self.directory.name, "output.ts"), "wb", buffering=0)
+        pipeline = SegmentSequencer(output=output, bufferSize=100, chunkSize=1024, removeSegments=False)
+        pipeline.addSegments(self.segments)
+        pipeline.start()
+        for segment in self.segments[:self.COMPLETED_COUNT]:
+            data = segment.fileName.encode() * 100
+            with open(self.getSegmentPath(segment), "wb") as file:
+                file.write(data)
+            journal.record(segment.fileName, len(data), SegmentVariants.ORIGINAL)
+            pipeline.complete(segment.fileName, self.getSegmentPath(segment))
+        waitUntil = time.monotonic() + 10
+        while pipeline.writeIndex < self.COMPLETED_COUNT and time.monotonic() < waitUntil:
+            time.sleep(0.01)
+        self.assertEqual(pipeline.writeIndex, self.COMPLETED_COUNT)
+        pipeline.abort()
+        pipeline.wait()
+        journal.closeFile()
+
+    def testResumeSkipsSegmentsWrittenByPipeline(self):
+        self.interruptDownload()
+        journal = SegmentJournal(self.journalPath, self.URL, [None, None])
+        self.assertTrue(journal.isResumed())
+        restoredFiles = [segment.fileName for segment in self.segments if journal.getCompletedEntry(segment.fileName, self.getSegmentPath(segment)) != None]
+        self.assertEqual(restoredFiles, [segment.fileName for segment in self.segments[:self.COMPLETED_COUNT]])
+        journal.closeFile()
+
+
+if __name__ == "__main__":
+    unittest.main()
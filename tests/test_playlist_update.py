@@ -0,0 +1,35 @@
+from Download.Downloader.Engine.Video.Playlist.Playlist import Playlist
+
+import unittest
+
+
+class PlaylistUpdateTest(unittest.TestCase):
+    def generatePlaylist(self, segmentCount, targetDuration=10, mutedIndexes=()):
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3", f"#EXT-X-TARGETDURATION:{targetDuration}", "#EXT-X-PLAYLIST-TYPE:EVENT", "#EXT-X-MEDIA-SEQUENCE:0"]
+        for index in range(segmentCount):
+            lines.append("#EXTINF:10.000,")
+            lines.append(f"{index}-muted.ts" if index in mutedIndexes else f"{index}.ts")
+        lines.append("#EXT-X-ENDLIST")
+        return "\n".join(lines)
+
+    def testAppendedSegmentsAreCounted(self):
+        playlist = Playlist(self.generatePlaylist(4))
+        self.assertEqual(playlist.updatePlaylist(self.generatePlaylist(6)), 2)
+        self.assertEqual(playlist.getFileList(), [f"{index}.ts" for index in range(6)])
+
+    def testTargetDurationIsRefreshed(self):
+        playlist = Playlist(self.generatePlaylist(4))
+        self.assertEqual(playlist.updatePlaylist(self.generatePlaylist(6, targetDuration=6)), None)
+        self.assertEqual(playlist.targetDuration, 6)
+        self.assertEqual(len(playlist.getSegments()), 6)
+        self.assertIn("#EXT-X-TARGETDURATION:6", playlist.getRangedPlaylist().playlist)
+
+    def testMutedSegmentsAreRecomputed(self):
+        playlist = Playlist(self.generatePlaylist(4, mutedIndexes=(0,)))
+        self.assertEqual(playlist.updatePlaylist(self.generatePlaylist(6, mutedIndexes=(1, 2, 5))), None)
+        self.assertEqual([segment.muted for segment in playlist.getSegments()], [False, True, True, False, False, True])
+        self.assertEqual(playlist.mutedMilliseconds, 30000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+from Download.Downloader.Engine.Video.SegmentSpool import SegmentSpool, SpoolTarget
+
+import os
+import tempfile
+import unittest
+
+
+class SegmentSpoolTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.spool = SegmentSpool(
+            filePath=os.path.join(self.directory.name, "spool.ts"),
+            indexFilePath=os.path.join(self.directory.name, "spool.index"),
+            preallocateSize=1024,
+            resume=False
+        )
+
+    def tearDown(self):
+        self.spool.closeFile()
+        self.directory.cleanup()
+
+    def writeTarget(self, fileName, size, chunks):
+        target = SpoolTarget(self.spool, fileName, size)
+        for chunk in chunks:
+            target.write(chunk)
+        target.close()
+        return target
+
+    def testCompleteTargetIsCommitted(self):
+        self.writeTarget("0.ts", 6, [b"abc", b"def"])
+        entry = self.spool.getEntry("0.ts")
+        self.assertEqual((entry.offset, entry.size), (0, 6))
+
+    def testOverflowingTargetIsReleased(self):
+        self.writeTarget("0.ts", 4, [b"abc", b"def"])
+        self.assertEqual(self.spool.getEntry("0.ts"), None)
+        self.assertEqual(self.spool.byteSize, 0)
+        self.writeTarget("0.ts", 6, [b"abcdef"])
+        self.assertEqual(self.spool.getEntry("0.ts").offset, 0)
+
+    def testShortTargetRegionIsReused(self):
+        shortTarget = SpoolTarget(self.spool, "0.ts", 8)
+        shortTarget.write(b"abc")
+        self.writeTarget("1.ts", 4, [b"wxyz"])
+        shortTarget.close()
+        self.assertEqual(self.spool.getEntry("0.ts"), None)
+        self.writeTarget("0.ts", 6, [b"abcdef"])
+        self.assertEqual(self.spool.getEntry("0.ts").offset, 0)
+        self.writeTarget("2.ts", 2, [b"gh"])
+        self.assertEqual(self.spool.getEntry("2.ts").offset, 6)
+        self.assertEqual(self.spool.byteSize, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
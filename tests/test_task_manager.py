@@ -0,0 +1,51 @@
+from Services.Task.TaskManager import TaskManager
+from Services.Task.PrioritizedTask import PrioritizedTask
+
+import unittest
+
+
+class ThreadPool:
+    def __init__(self):
+        self.startedTasks = []
+
+    def start(self, task, priority=0):
+        self.startedTasks.append(task)
+
+    def tryTake(self, task):
+        return False
+
+
+class Task(PrioritizedTask):
+    def __init__(self, name, priority=0):
+        super(Task, self).__init__(priority=priority)
+        self.name = name
+
+
+class TaskManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.threadPool = ThreadPool()
+        self.taskManager = TaskManager(self.threadPool)
+        self.taskManager.setMaxRunningCount(0)
+        self.taskManager.start()
+
+    def getStartedNames(self):
+        return [task.name for task in self.threadPool.startedTasks]
+
+    def testHighestPriorityStartsFirst(self):
+        for name, priority in (("a", 0), ("b", 4), ("c", 0), ("d", 2), ("e", 4)):
+            self.taskManager.add(Task(name, priority))
+        self.taskManager.setMaxRunningCount(5)
+        self.assertEqual(self.getStartedNames(), ["b", "e", "d", "a", "c"])
+
+    def testQueuedTasksKeepInsertionOrder(self):
+        for name in ("a", "b", "c"):
+            self.taskManager.add(Task(name))
+        self.taskManager.setMaxRunningCount(1)
+        self.taskManager.add(Task("d", 1))
+        self.taskManager.add(Task("e"))
+        self.taskManager.setMaxRunningCount(5)
+        self.assertEqual(self.getStartedNames(), ["a", "d", "b", "c", "e"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+from Services.Temp.TempManager import TempManager
+
+import os
+import tempfile
+import unittest
+
+
+class TempManagerTest(unittest.TestCase):
+    NAME = "0123456789abcdef"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testNamedDirectoryIsLockedWhileInUse(self):
+        first = TempManager.createTempDirectory(self.directory.name, name=self.NAME)
+        second = TempManager.createTempDirectory(self.directory.name, name=self.NAME)
+        try:
+            self.assertTrue(first.name.endswith(self.NAME))
+            self.assertNotEqual(first.name, second.name)
+            self.assertTrue(os.path.isdir(second.name))
+        finally:
+            second.cleanup()
+            first.cleanup()
+        self.assertFalse(os.path.isdir(second.name))
+
+    def testNamedDirectoryIsReleasedAfterKeep(self):
+        first = TempManager.createTempDirectory(self.directory.name, name=self.NAME)
+        first.keep(60)
+        second = TempManager.createTempDirectory(self.directory.name, name=self.NAME)
+        try:
+            self.assertEqual(first.name, second.name)
+        finally:
+            second.cleanup()
+
+    def testSize(self):
+        tempDirectory = TempManager.createTempDirectory(self.directory.name)
+        try:
+            with open(os.path.join(tempDirectory.name, "0.ts"), "wb") as file:
+                file.write(b"\0" * 1000)
+            self.assertEqual(tempDirectory.getSize(), 1000)
+        finally:
+            tempDirectory.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+from Download.Downloader.Engine.Video.Playlist.SegmentTable import SegmentTable
+from Download.Downloader.Engine.Video.SegmentDownloader import SegmentDownloader, SegmentVariants
+from Download.Downloader.Engine.Video.VariantPredictor import VariantPredictor
+
+import unittest
+
+
+class VariantPredictorTest(unittest.TestCase):
+    def setUp(self):
+        self.segments = SegmentTable()
+        for index in range(4):
+            self.segments.append(f"{index}.ts", 10000, True)
+        self.predictor = VariantPredictor()
+
+    def getVariants(self, segment, unmute):
+        task = SegmentDownloader(url="https://example.com", segment=segment, unmute=unmute, saveAs=segment.fileName)
+        return [segmentUrl.variant for segmentUrl in self.predictor.predict(segment, task.segmentUrls, unmute)]
+
+    def testMutedNeighborDoesNotOverrideUnmutePreference(self):
+        self.predictor.learn(self.segments[0], SegmentVariants.MUTED, 2)
+        for segment in list(self.segments)[1:]:
+            variants = self.getVariants(segment, unmute=True)
+            self.assertEqual(variants[-1], SegmentVariants.MUTED)
+            self.assertIn(SegmentVariants.UNMUTED, variants[:-1])
+
+    def testUnmutedNeighborIsTriedFirst(self):
+        self.predictor.learn(self.segments[0], SegmentVariants.UNMUTED, 1)
+        self.assertEqual(self.getVariants(self.segments[1], unmute=True), [SegmentVariants.UNMUTED, SegmentVariants.ORIGINAL, SegmentVariants.MUTED])
+
+    def testMutedNeighborIsTriedFirstWithoutUnmute(self):
+        self.predictor.learn(self.segments[0], SegmentVariants.MUTED, 1)
+        self.assertEqual(self.getVariants(self.segments[1], unmute=False)[0], SegmentVariants.MUTED)
+
+
+if __name__ == "__main__":
+    unittest.main()